@@ -5,15 +5,16 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
-from services.views import ServiceViewSet, CompanyStatsViewSet, CompanyConfigViewSet
+from services.views import ServiceViewSet, CompanyStatsViewSet, CompanyConfigViewSet, HomepageView
 from team.views import TeamMemberViewSet
 from testimonials.views import TestimonialViewSet
 from contact.views import ContactSubmissionViewSet
 # from authentication.test_auth import auth_test_public, auth_test_protected, auth_test_admin
 from portfolio.views import PortfolioViewSet
-from lead_magnets.views import LeadMagnetSubmissionViewSet
-from case_studies.views import CaseStudyViewSet
-from resources.views import ResourceViewSet, ResourceCategoryViewSet, ResourceTypeViewSet
+from lead_magnets.views import LeadMagnetSubmissionViewSet, lead_magnet_file_download
+from case_studies.views import CaseStudyViewSet, case_study_pdf_download
+from resources.views import ResourceViewSet, ResourceCategoryViewSet, ResourceTypeViewSet, resource_file_download
+from jobs.views import JobQueueMetricsView
 from . import views
 
 # Create router and register viewsets
@@ -36,6 +37,9 @@ urlpatterns = [
     path('auth/test/protected/', views.auth_test_protected, name='auth-test-protected'),
     path('auth/test/admin/', views.auth_test_admin, name='auth-test-admin'),
     
+    # Landing page sections in one cached response
+    path('homepage/', HomepageView.as_view(), name='homepage'),
+    
     # Services with slug-based lookups
     path('services/', ServiceViewSet.as_view({'get': 'list'}), name='service-list'),
     path('services/<slug:slug>/', ServiceViewSet.as_view({'get': 'retrieve'}), name='service-detail'),
@@ -50,10 +54,18 @@ urlpatterns = [
     # Case studies with slug-based lookups
     path('case-studies/', CaseStudyViewSet.as_view({'get': 'list'}), name='case-study-list'),
     path('case-studies/<slug:slug>/', CaseStudyViewSet.as_view({'get': 'retrieve'}), name='case-study-detail'),
+    path('case-studies/<slug:slug>/pdf/', case_study_pdf_download, name='case-study-pdf'),
     
     # Resources with slug-based lookups
     path('resources/', ResourceViewSet.as_view({'get': 'list'}), name='resource-list'),
     path('resources/<slug:slug>/', ResourceViewSet.as_view({'get': 'retrieve'}), name='resource-detail'),
+    path('resources/<slug:slug>/file/', resource_file_download, name='resource-file'),
+    
+    # Lead magnet PDFs
+    path('lead-magnets/files/<slug:lead_magnet_type>/', lead_magnet_file_download, name='lead-magnet-file'),
+    
+    # Background job queue metrics (staff only)
+    path('jobs/metrics/', JobQueueMetricsView.as_view(), name='job-queue-metrics'),
     
     # Include router for other endpoints
     path('', include(router.urls)),
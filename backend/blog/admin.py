@@ -53,9 +53,10 @@ class BlogCategoryAdmin(admin.ModelAdmin):
     )
     
     def post_count(self, obj):
-        """Display count of posts in this category."""
-        return obj.posts.count()
-    post_count.short_description = 'Posts'
+        """Display count of published posts in this category."""
+        return obj.published_post_count
+    post_count.short_description = 'Published posts'
+    post_count.admin_order_field = 'published_post_count'
 
 
 @admin.register(BlogPost)
@@ -148,7 +149,7 @@ class BlogPostViewAdmin(admin.ModelAdmin):
     list_display = ['post', 'ip_address', 'viewed_at']
     list_filter = ['viewed_at', 'post']
     search_fields = ['post__title', 'ip_address']
-    readonly_fields = ['viewed_at']
+    readonly_fields = ['user_agent', 'viewed_at']
     
     fieldsets = (
         ('View Information', {
@@ -225,7 +226,7 @@ class BlogPostShareAdmin(admin.ModelAdmin):
 class BlogTagAdmin(admin.ModelAdmin):
     """Admin configuration for BlogTag model."""
     
-    list_display = ['name', 'slug', 'color', 'created_at']
+    list_display = ['name', 'slug', 'color', 'published_post_count', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'slug']
     list_editable = ['color']
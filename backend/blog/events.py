@@ -0,0 +1,35 @@
+"""
+Event buffer for blog post views.
+"""
+from django.conf import settings
+
+from core.events import EventBuffer, clean_ip
+from core.ratelimit import get_client_ip
+from core.sketches import visitor_key
+from .models import BlogPostView
+
+view_events = EventBuffer(
+    'blog_view',
+    BlogPostView,
+    target_field='post',
+    counter_field='view_count',
+    dedup_window=settings.EVENT_DEDUP_WINDOWS['blog_view'],
+    sketch_event='blog.view',
+)
+
+
+def record_view(post, request):
+    """Buffer a view of ``post`` by the requesting visitor and return the post's view count with it."""
+    referrer = request.META.get('HTTP_REFERER') or ''
+    view = BlogPostView(
+        post_id=post.pk,
+        user=request.user if request.user.is_authenticated else None,
+        ip_address=clean_ip(get_client_ip(request)),
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        referrer=referrer[:200]
+    )
+    # Counts include views still buffered in this process
+    view_count = post.view_count + view_events.pending_count(post.pk)
+    if view_events.record(view, visitor_key(view.user_id, view.ip_address, view.user_agent)):
+        view_count += 1
+    return view_count
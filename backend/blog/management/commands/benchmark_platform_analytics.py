@@ -0,0 +1,105 @@
+"""
+Management command to measure platform analytics on heavily engaged posts.
+"""
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.db.models import Count
+
+from blog.models import BlogPost, BlogPostBookmark, BlogPostLike, BlogPostShare
+from blog.services import BlogAnalyticsService
+from team.models import TeamMember
+
+
+class Command(BaseCommand):
+    help = 'Compare the joined Count() engagement ranking with per-relation subqueries; all writes are rolled back'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20, help='Published posts to create (default: 20)')
+        parser.add_argument(
+            '--interactions', type=int, default=2000,
+            help='Likes, bookmarks and shares per post, each (default: 2000)'
+        )
+        parser.add_argument('--rounds', type=int, default=3, help='Timed runs per query (default: 3)')
+        parser.add_argument(
+            '--legacy-timeout', type=int, default=30,
+            help='Seconds before the joined query is cancelled, PostgreSQL only (default: 30)'
+        )
+
+    def seed(self, posts, interactions):
+        author = TeamMember.objects.create(name='Benchmark Author', role=TeamMember.ROLE_CHOICES[0][0], bio='Benchmark')
+        created = [
+            BlogPost.objects.create(
+                title=f'Benchmark {i}', slug=f'benchmark-platform-{i}', body='Benchmark',
+                author=author, status='published'
+            )
+            for i in range(posts)
+        ]
+        for index, post in enumerate(created):
+            # Vary engagement so the ranking is meaningful
+            count = interactions * (index + 1) // posts
+            BlogPostLike.objects.bulk_create(
+                [BlogPostLike(post=post, ip_address='10.0.0.1') for _ in range(count)], batch_size=5000
+            )
+            BlogPostBookmark.objects.bulk_create(
+                [BlogPostBookmark(post=post, ip_address='10.0.0.1') for _ in range(count)], batch_size=5000
+            )
+            BlogPostShare.objects.bulk_create(
+                [BlogPostShare(post=post, ip_address='10.0.0.1', platform='twitter') for _ in range(count)],
+                batch_size=5000
+            )
+        return created
+
+    def legacy_ranking(self):
+        return [
+            (post.slug, post.total_engagement)
+            for post in BlogPost.objects.filter(status='published').annotate(
+                total_engagement=Count('likes') + Count('bookmarks') + Count('shares')
+            ).order_by('-total_engagement')[:5]
+        ]
+
+    def subquery_ranking(self):
+        return [
+            (post['slug'], post['engagement'])
+            for post in BlogAnalyticsService.compute_platform_analytics()['popular_posts']
+        ]
+
+    def measure(self, label, func, rounds, timeout=None):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    if timeout and connection.vendor == 'postgresql':
+                        with connection.cursor() as cursor:
+                            cursor.execute('SET LOCAL statement_timeout = %s', [timeout * 1000])
+                    result = func()
+            except OperationalError:
+                self.stdout.write(f'{label:<12} cancelled after {time.perf_counter() - started:.1f} s')
+                return None
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(f'{label:<12} best {min(timings) * 1000:>10.1f} ms')
+        return result
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['posts'], options['interactions'])
+            self.stdout.write(
+                f"{options['posts']} posts, up to {options['interactions']} likes, bookmarks and shares each"
+            )
+
+            legacy = self.measure('joined', self.legacy_ranking, options['rounds'], options['legacy_timeout'])
+            current = self.measure('subqueries', self.subquery_ranking, options['rounds'])
+
+            cache.delete(BlogAnalyticsService.PLATFORM_CACHE_KEY)
+            BlogAnalyticsService.get_platform_analytics()
+            self.measure('cached', BlogAnalyticsService.get_platform_analytics, options['rounds'])
+            cache.delete(BlogAnalyticsService.PLATFORM_CACHE_KEY)
+            transaction.set_rollback(True)
+
+        if legacy:
+            self.stdout.write(f'joined top post:   {legacy[0][0]} engagement={legacy[0][1]:,}')
+        self.stdout.write(f'subquery top post: {current[0][0]} engagement={current[0][1]:,}')
+        self.stdout.write(self.style.SUCCESS('Benchmark complete; all rows were rolled back.'))
@@ -0,0 +1,52 @@
+"""
+Management command to publish scheduled blog posts when they are due.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.services import BlogPublishingService
+
+
+class Command(BaseCommand):
+    help = 'Publish scheduled blog posts whose publish time has passed; --watch keeps running'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running, waking at the next scheduled publish time'
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=int,
+            default=60,
+            help='With --watch, longest wait in seconds so newly scheduled posts are noticed (default: 60)'
+        )
+
+    def publish(self):
+        posts = BlogPublishingService.publish_due()
+        for post in posts:
+            self.stdout.write(f'Published {post.slug} (scheduled for {post.published_at:%Y-%m-%d %H:%M})')
+        return posts
+
+    def handle(self, *args, **options):
+        if not options['watch']:
+            posts = self.publish()
+            self.stdout.write(self.style.SUCCESS(f'Published {len(posts)} scheduled posts.'))
+            return
+
+        self.stdout.write('Watching for scheduled posts...')
+        try:
+            while True:
+                if self.publish():
+                    # More may be due at once; go round again straight away
+                    continue
+                next_publish = BlogPublishingService.next_publish_at()
+                wait = options['max_sleep']
+                if next_publish is not None:
+                    wait = min(wait, max((next_publish - timezone.now()).total_seconds(), 1))
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Stopped.'))
@@ -0,0 +1,20 @@
+"""
+Management command to reconcile category and tag published post counts.
+"""
+from django.core.management.base import BaseCommand
+
+from blog.services import BlogTaxonomyCountService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount published posts per blog category and tag, correcting drift from writes '
+        'that bypass BlogPost.save (run nightly)'
+    )
+
+    def handle(self, *args, **options):
+        corrected = BlogTaxonomyCountService.reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled post counts: {corrected['blogcategory']} categories and "
+            f"{corrected['blogtag']} tags corrected."
+        ))
@@ -0,0 +1,101 @@
+# Generated by Django 5.0 on 2026-10-19 05:35
+
+import hashlib
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from core.partitions import partition_table, unpartition_table
+
+
+def intern_user_agents(apps, schema_editor):
+    UserAgent = apps.get_model("core", "UserAgent")
+    for model_name in ["BlogPostView"]:
+        model = apps.get_model("blog", model_name)
+        values = (
+            model.objects.exclude(user_agent="")
+            .order_by()
+            .values_list("user_agent", flat=True)
+            .distinct()
+        )
+        for value in values.iterator():
+            user_agent, _ = UserAgent.objects.get_or_create(
+                value_hash=hashlib.sha256(value.encode("utf-8")).hexdigest(),
+                defaults={"value": value},
+            )
+            model.objects.filter(user_agent=value).update(user_agent_ref=user_agent)
+    if schema_editor.connection.vendor == "postgresql":
+        # Fire deferred FK checks now so the following ALTER TABLEs are allowed
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+EVENT_TABLES = [
+    ("blog_blogpostview", "viewed_at"),
+    ("blog_blogpostshare", "shared_at"),
+]
+
+
+def partition_tables(apps, schema_editor):
+    for table, column in EVENT_TABLES:
+        partition_table(schema_editor, table, column)
+
+
+def unpartition_tables(apps, schema_editor):
+    for table, column in EVENT_TABLES:
+        unpartition_table(schema_editor, table, column)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_alter_userreadingprogress_user"),
+        ("core", "0002_user_agent_daily_event_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpostview",
+            name="user_agent_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.useragent",
+                verbose_name="user agent",
+            ),
+        ),
+        migrations.RunPython(intern_user_agents, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="blogpostview",
+            name="user_agent",
+        ),
+        migrations.RunPython(partition_tables, unpartition_tables),
+        migrations.AddIndex(
+            model_name="blogpostshare",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["shared_at"], name="blog_share_shared_at_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpostshare",
+            index=models.Index(
+                fields=["post", "-shared_at"], name="blog_share_post_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpostview",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["viewed_at"], name="blog_view_viewed_at_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpostview",
+            index=models.Index(
+                fields=["post", "-viewed_at"], name="blog_view_post_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-19 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_partition_event_tables"),
+        ("team", "0003_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-is_featured", "order", "-published_at"],
+                name="blog_post_pub_list_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-published_at"],
+                name="blog_post_pub_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["new_category", "-published_at"],
+                name="blog_post_pub_category_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0 on 2026-10-19 05:59
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_published_post_counts(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    BlogCategory = apps.get_model("blog", "BlogCategory")
+    BlogTag = apps.get_model("blog", "BlogTag")
+
+    published = BlogPost.objects.filter(status="published")
+    categories = (
+        published.exclude(new_category=None).order_by().values("new_category").annotate(count=Count("pk"))
+    )
+    for row in categories.iterator():
+        BlogCategory.objects.filter(pk=row["new_category"]).update(published_post_count=row["count"])
+
+    tags = Counter()
+    for post_tags in published.values_list("tags", flat=True).iterator():
+        tags.update({tag for tag in post_tags or [] if isinstance(tag, str)})
+    for name, count in tags.items():
+        BlogTag.objects.filter(name=name).update(published_post_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogcategory",
+            name="published_post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="blogtag",
+            name="published_post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_published_post_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-19 06:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_published_post_counts"),
+        ("team", "0003_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("status", "scheduled")),
+                fields=["published_at"],
+                name="blog_post_scheduled_idx",
+            ),
+        ),
+    ]
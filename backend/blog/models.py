@@ -2,8 +2,12 @@
 Blog models for KKEVO.
 """
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import BrinIndex
+from django.db.models.functions import Now
+
+from core.models import UserAgentMixin
 
 User = get_user_model()
 from django.utils.text import slugify
@@ -20,6 +24,8 @@ class BlogCategory(models.Model):
     description = models.TextField(blank=True)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    # Maintained by BlogTaxonomyCountService as posts change
+    published_post_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['order', 'name']
@@ -29,6 +35,28 @@ class BlogCategory(models.Model):
         return self.name
 
 
+class BlogPostQuerySet(models.QuerySet):
+    """
+    Publication-aware post queries.
+    
+    ``published()`` compares ``published_at`` with the database clock when
+    the query runs (``Now()``), so querysets built once, such as a view's
+    class-level ``queryset``, never freeze the time they were created.
+    """
+    
+    def published(self):
+        """Posts visible to readers now."""
+        return self.filter(status='published', published_at__lte=Now())
+    
+    def upcoming(self):
+        """Posts that will become visible later: scheduled, or published with a future date."""
+        return self.filter(status__in=['published', 'scheduled'], published_at__gt=Now())
+    
+    def due(self):
+        """Scheduled posts whose publish time has come."""
+        return self.filter(status='scheduled', published_at__lte=Now())
+
+
 class BlogPost(models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -97,9 +125,25 @@ class BlogPost(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = BlogPostQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-is_featured', 'order', '-published_at']
         verbose_name_plural = 'Blog Posts'
+        # Partial indexes over published posts for the public list, the
+        # newest-first feeds and per-category listings
+        indexes = [
+            models.Index(
+                fields=['-is_featured', 'order', '-published_at'], name='blog_post_pub_list_idx',
+                condition=models.Q(status='published')
+            ),
+            models.Index(fields=['-published_at'], name='blog_post_pub_recent_idx', condition=models.Q(status='published')),
+            models.Index(
+                fields=['new_category', '-published_at'], name='blog_post_pub_category_idx',
+                condition=models.Q(status='published')
+            ),
+            models.Index(fields=['published_at'], name='blog_post_scheduled_idx', condition=models.Q(status='scheduled')),
+        ]
     
     def __str__(self):
         return self.title
@@ -150,20 +194,37 @@ class BlogPost(models.Model):
             self.word_count = len(self.body.split())
             # Estimate reading time (average 200 words per minute)
             self.estimated_reading_time = max(1, round(self.word_count / 200))
-        super().save(*args, **kwargs)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not set(update_fields) & {
+            'status', 'published_at', 'new_category', 'new_category_id', 'tags'
+        }:
+            super().save(*args, **kwargs)
+            return
+        
+        # Keep category and tag published post counts in step, in the same transaction
+        from .services import BlogTaxonomyCountService
+        with transaction.atomic():
+            before = BlogTaxonomyCountService.locked_terms(self.pk) if not self._state.adding else None
+            super().save(*args, **kwargs)
+            BlogTaxonomyCountService.apply_change(before, BlogTaxonomyCountService.terms(self))
 
 
-class BlogPostView(models.Model):
+class BlogPostView(UserAgentMixin, models.Model):
     post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='views')
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='blog_views')
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.TextField(blank=True)
     referrer = models.CharField(max_length=200, blank=True)
     viewed_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
+        # Stored in monthly partitions on PostgreSQL, see core.partitions
         ordering = ['-viewed_at']
         verbose_name_plural = 'Blog Post Views'
+        indexes = [
+            BrinIndex(fields=['viewed_at'], name='blog_view_viewed_at_brin'),
+            models.Index(fields=['post', '-viewed_at'], name='blog_view_post_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.post.title} - {self.viewed_at}"
@@ -234,8 +295,13 @@ class BlogPostShare(models.Model):
     shared_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
+        # Stored in monthly partitions on PostgreSQL, see core.partitions
         ordering = ['-shared_at']
         verbose_name_plural = 'Blog Post Shares'
+        indexes = [
+            BrinIndex(fields=['shared_at'], name='blog_share_shared_at_brin'),
+            models.Index(fields=['post', '-shared_at'], name='blog_share_post_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} shared {self.post.title} on {self.platform} - {self.shared_at}"
@@ -246,6 +312,8 @@ class BlogTag(models.Model):
     slug = models.SlugField(max_length=50, unique=True)
     color = models.CharField(max_length=7, default='#6B7280')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by BlogTaxonomyCountService as posts change
+    published_post_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['name']
@@ -257,6 +325,19 @@ class BlogTag(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        from .services import BlogTaxonomyCountService
+        stored_name = None
+        if not self._state.adding:
+            stored_name = BlogTag.objects.filter(pk=self.pk).values_list('name', flat=True).first()
+        if stored_name != self.name:
+            # Posts may already carry this name (new or renamed tag)
+            self.published_post_count = BlogTaxonomyCountService.tag_count(self.name)
+        elif kwargs.get('update_fields') is None:
+            # Leave the count to the F() updates made as posts change
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'published_post_count'
+            ]
         super().save(*args, **kwargs)
 
 
@@ -311,16 +392,17 @@ class UserReadingProgress(models.Model):
         return f"{self.user.username} - {self.post.title} ({self.progress_percentage}%)"
     
     def update_progress(self, percentage, time_spent=0, position=0):
-        self.progress_percentage = min(100, max(0, percentage))
-        self.time_spent += time_spent
-        self.last_position = position
-        
-        if self.progress_percentage >= 90:  # Consider 90% as completed
-            self.is_completed = True
-            if not self.completed_at:
-                self.completed_at = timezone.now()
+        from .services import ReadingProgressService
         
-        self.save()
+        progress, = ReadingProgressService.upsert_progress([{
+            'user_id': self.user_id,
+            'post_id': self.post_id,
+            'progress_percentage': min(100, max(0, percentage)),
+            'time_spent': time_spent,
+            'last_position': position,
+        }])
+        for field in ReadingProgressService.RETURNED_FIELDS:
+            setattr(self, field, getattr(progress, field))
 
 
 class BlogPostAnalytics(models.Model):
@@ -359,35 +441,9 @@ class BlogPostAnalytics(models.Model):
     
     def calculate_metrics(self):
         """Calculate and update analytics metrics"""
-        views = self.post.views.all()
+        from .services import BlogAnalyticsBatchService
         
-        if views.exists():
-            # Calculate unique views
-            unique_ips = views.values('ip_address').distinct().count()
-            self.unique_views = unique_ips
-            
-            # Calculate bounce rate (single page visits)
-            single_page_visits = views.filter(
-                user__isnull=True
-            ).values('ip_address').annotate(
-                visit_count=models.Count('id')
-            ).filter(visit_count=1).count()
-            
-            if unique_ips > 0:
-                self.bounce_rate = (single_page_visits / unique_ips) * 100
-            
-            # Calculate average time and scroll depth from reading progress
-            progress_records = self.post.reading_progress.all()
-            if progress_records.exists():
-                self.average_time_on_page = progress_records.aggregate(
-                    avg_time=models.Avg('time_spent')
-                )['avg_time'] or 0
-                
-                self.average_scroll_depth = progress_records.aggregate(
-                    avg_depth=models.Avg('progress_percentage')
-                )['avg_depth'] or 0
-                
-                completed_count = progress_records.filter(is_completed=True).count()
-                self.completion_rate = (completed_count / progress_records.count()) * 100
-            
-            self.save()
+        if BlogAnalyticsBatchService().run([self.post_id]):
+            if self.pk is None:
+                self.pk = BlogPostAnalytics.objects.values_list('pk', flat=True).get(post_id=self.post_id)
+            self.refresh_from_db()
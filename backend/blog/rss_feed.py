@@ -1,24 +1,69 @@
 """
-RSS Feed generation for blog posts.
+RSS and Atom feeds for blog posts.
+
+Feeds cover all posts or a single category or tag. Rendered XML is cached
+under a key built from the listing cache version and the newest
+``updated_at``/``published_at`` of the posts in the feed, so an edit,
+publication or removal produces a new key and readers never see a stale
+feed. Each poll costs one aggregate query; unchanged feeds answer
+``If-None-Match``/``If-Modified-Since`` with 304 and others are served from
+the cache without rendering.
 """
+import hashlib
+
+from django.conf import settings
 from django.contrib.syndication.views import Feed
-from django.utils import timezone
+from django.core.cache import cache
+from django.db.models import Count, Max
 from django.http import HttpResponse
-from .models import BlogPost
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+
+from .models import BlogCategory, BlogPost, BlogTag
+from .services import listing_cache_version
+
+FEED_ITEMS = 20
+
+
+def feed_posts(obj=None):
+    """Published posts in a feed's scope: everything, a BlogCategory or a BlogTag."""
+    posts = BlogPost.objects.published()
+    if isinstance(obj, BlogCategory):
+        posts = posts.filter(new_category=obj)
+    elif isinstance(obj, BlogTag):
+        posts = posts.filter(tags__contains=[obj.name])
+    return posts
 
 
 class BlogPostFeed(Feed):
     """RSS feed for blog posts."""
-    title = "KKEVO Blog"
-    link = "/blog/"
-    description = "Latest blog posts from KKEVO"
     
-    def items(self):
-        """Get published blog posts."""
-        return BlogPost.objects.filter(
-            status='published',
-            published_at__lte=timezone.now()
-        ).order_by('-published_at')[:20]
+    def get_object(self, request, kind=None, slug=None):
+        """Resolve the category or tag a scoped feed is for."""
+        if kind == 'category':
+            return get_object_or_404(BlogCategory, slug=slug, is_active=True)
+        if kind == 'tag':
+            return get_object_or_404(BlogTag, slug=slug)
+        return None
+    
+    def title(self, obj):
+        return f"KKEVO Blog: {obj.name}" if obj else "KKEVO Blog"
+    
+    def link(self, obj):
+        if isinstance(obj, BlogCategory):
+            return f"/blog/category/{obj.slug}/"
+        if isinstance(obj, BlogTag):
+            return f"/blog/?tags={obj.name}"
+        return "/blog/"
+    
+    def description(self, obj):
+        return f"Latest blog posts from KKEVO about {obj.name}" if obj else "Latest blog posts from KKEVO"
+    
+    def items(self, obj=None):
+        """Get published blog posts, with their authors and categories in the same query."""
+        return feed_posts(obj).select_related('author', 'new_category').order_by('-published_at')[:FEED_ITEMS]
     
     def item_title(self, item):
         """Get item title."""
@@ -36,6 +81,10 @@ class BlogPostFeed(Feed):
         """Get item publication date."""
         return item.published_at
     
+    def item_updateddate(self, item):
+        """Get item modification date."""
+        return item.updated_at
+    
     def item_author_name(self, item):
         """Get item author name."""
         return item.author.name if item.author else "KKEVO Team"
@@ -49,3 +98,48 @@ class BlogPostFeed(Feed):
             categories.extend(item.tags)
         return categories
 
+
+class BlogPostAtomFeed(BlogPostFeed):
+    """Atom feed for blog posts."""
+    feed_type = Atom1Feed
+    
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class CachedFeedView:
+    """Serve a feed from the cache, with ETag and Last-Modified revalidation."""
+    
+    def __init__(self, feed):
+        self.feed = feed
+    
+    def __call__(self, request, kind=None, slug=None):
+        obj = self.feed.get_object(request, kind=kind, slug=slug)
+        freshness = feed_posts(obj).aggregate(
+            updated=Max('updated_at'), published=Max('published_at'), count=Count('pk')
+        )
+        # The listing version is the time of its last bump, so unpublishing
+        # or deleting a post also moves Last-Modified forward
+        version = listing_cache_version()
+        changed = [value.timestamp() for value in (freshness['updated'], freshness['published']) if value]
+        last_modified = int(max(changed + [version / 1e9]))
+    
+        key = ':'.join(str(part) for part in (
+            'blog:feed', self.feed.feed_type.__name__, kind or 'all', slug or '',
+            version, max(changed, default=0), freshness['count']
+        ))
+        etag = f'"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+    
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = cache.get(key)
+            if cached is None:
+                rendered = self.feed(request, kind=kind, slug=slug)
+                cached = (rendered.content, rendered['Content-Type'])
+                cache.set(key, cached, settings.FEED_CACHE_TTL)
+            response = HttpResponse(cached[0], content_type=cached[1])
+    
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=settings.FEED_CACHE_MAX_AGE)
+        return response
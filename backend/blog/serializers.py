@@ -20,9 +20,11 @@ from .models import (
 
 
 class BlogCategorySerializer(serializers.ModelSerializer):
+    post_count = serializers.IntegerField(source='published_post_count', read_only=True)
+    
     class Meta:
         model = BlogCategory
-        fields = ['id', 'name', 'slug', 'description', 'color', 'order', 'is_active']
+        fields = ['id', 'name', 'slug', 'description', 'color', 'order', 'is_active', 'post_count']
 
 
 class BlogPostListSerializer(serializers.ModelSerializer):
@@ -60,6 +62,8 @@ class BlogPostListSerializer(serializers.ModelSerializer):
     
     # Author object for frontend compatibility
     author = serializers.SerializerMethodField()
+    # Liked/bookmarked-by-me flags, when the view supplies them for the whole page
+    user_interactions = serializers.SerializerMethodField()
     
     class Meta:
         model = BlogPost
@@ -67,9 +71,16 @@ class BlogPostListSerializer(serializers.ModelSerializer):
             'id', 'title', 'slug', 'excerpt', 'body', 'category', 'category_name', 'tags', 'author',
             'featured_image', 'published_at', 'is_featured', 'order',
             'view_count', 'like_count', 'bookmark_count', 'share_count', 'comment_count',
-            'estimated_reading_time', 'word_count', 'created_at', 'updated_at'
+            'estimated_reading_time', 'word_count', 'created_at', 'updated_at', 'user_interactions'
         ]
     
+    def get_user_interactions(self, obj):
+        """Return this post's entry of the ``interaction_state`` context, if any"""
+        interaction_state = self.context.get('interaction_state')
+        if interaction_state is None:
+            return None
+        return interaction_state.get(str(obj.pk))
+    
     def get_author(self, obj):
         """Return author object for frontend compatibility"""
         if obj.author:
@@ -176,7 +187,17 @@ class BlogPostUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
+class BlogPostSummarySerializer(serializers.ModelSerializer):
+    """Compact post card for dashboards; reads only the listed columns."""
+    
+    class Meta:
+        model = BlogPost
+        fields = ['id', 'title', 'slug', 'excerpt', 'featured_image', 'published_at', 'estimated_reading_time']
+
+
 class BlogPostViewSerializer(serializers.ModelSerializer):
+    user_agent = serializers.CharField(required=False, allow_blank=True)
+    
     class Meta:
         model = BlogPostView
         fields = ['id', 'post', 'user', 'ip_address', 'user_agent', 'referrer', 'viewed_at']
@@ -205,9 +226,11 @@ class BlogPostShareSerializer(serializers.ModelSerializer):
 
 
 class BlogTagSerializer(serializers.ModelSerializer):
+    post_count = serializers.IntegerField(source='published_post_count', read_only=True)
+    
     class Meta:
         model = BlogTag
-        fields = ['id', 'name', 'slug', 'color', 'created_at']
+        fields = ['id', 'name', 'slug', 'color', 'post_count', 'created_at']
 
 
 class BlogPostCommentSerializer(serializers.ModelSerializer):
@@ -238,16 +261,22 @@ class BlogPostCommentSerializer(serializers.ModelSerializer):
     
     def get_reply_count(self, obj):
         """Get count of approved replies"""
+        if hasattr(obj, 'approved_replies'):
+            return len(obj.approved_replies)
         return obj.replies.filter(is_approved=True).count()
     
     def get_is_reply(self, obj):
         """Check if this comment is a reply"""
-        return obj.parent is not None
+        return obj.parent_id is not None
     
     def get_replies(self, obj):
         """Get approved replies for this comment"""
-        if obj.parent is None:  # Only show replies for top-level comments
-            replies = obj.replies.filter(is_approved=True).order_by('created_at')
+        if obj.parent_id is None:  # Only show replies for top-level comments
+            if hasattr(obj, 'approved_replies'):
+                # Prefetched, see UserDashboardService.get_activity
+                replies = obj.approved_replies
+            else:
+                replies = obj.replies.filter(is_approved=True).order_by('created_at')
             return BlogPostCommentSerializer(replies, many=True, context=self.context).data
         return []
 
@@ -262,6 +291,14 @@ class UserReadingProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'completed_at', 'last_read_at']
 
 
+class ReadingProgressUpdateSerializer(serializers.Serializer):
+    """One reading progress ping; ``time_spent`` is seconds since the previous ping."""
+    post = serializers.CharField(max_length=36)
+    progress_percentage = serializers.IntegerField(min_value=0, max_value=100)
+    time_spent = serializers.IntegerField(min_value=0, default=0)
+    last_position = serializers.IntegerField(min_value=0, default=0)
+
+
 class BlogPostAnalyticsSerializer(serializers.ModelSerializer):
     class Meta:
         model = BlogPostAnalytics
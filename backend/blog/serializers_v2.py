@@ -21,7 +21,7 @@ User = get_user_model()
 
 class BlogCategorySerializer(serializers.ModelSerializer):
     """Serializer for blog categories."""
-    post_count = serializers.SerializerMethodField()
+    post_count = serializers.IntegerField(source='published_post_count', read_only=True)
     
     class Meta:
         model = BlogCategory
@@ -31,10 +31,6 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'slug', 'post_count']
     
-    def get_post_count(self, obj):
-        """Get count of published posts in this category."""
-        return obj.posts.filter(status='published').count()
-    
     def validate_name(self, value):
         """Validate category name."""
         if len(value.strip()) < 2:
@@ -52,20 +48,13 @@ class BlogCategorySerializer(serializers.ModelSerializer):
 
 class BlogTagSerializer(serializers.ModelSerializer):
     """Serializer for blog tags."""
-    post_count = serializers.SerializerMethodField()
+    post_count = serializers.IntegerField(source='published_post_count', read_only=True)
     
     class Meta:
         model = BlogTag
         fields = ['id', 'name', 'slug', 'color', 'post_count', 'created_at']
         read_only_fields = ['id', 'slug', 'post_count', 'created_at']
     
-    def get_post_count(self, obj):
-        """Get count of posts using this tag."""
-        return BlogPost.objects.filter(
-            status='published',
-            tags__contains=[obj.name]
-        ).count()
-    
     def validate_name(self, value):
         """Validate tag name."""
         if len(value.strip()) < 2:
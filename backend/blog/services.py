@@ -2,31 +2,91 @@
 Business logic services for blog operations.
 This layer separates business logic from views and models.
 """
-from typing import Optional, Dict, Any, List
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Optional, Dict, Any, List, Iterable
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db import connection, transaction
+from django.conf import settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models import Q, F, Count, Avg, Sum
+from django.db.models import Q, F, Count, Avg, Sum, Max, Case, When, IntegerField, OuterRef, Subquery, Value, Prefetch
+from django.db.models.functions import Coalesce
 from django.core.cache import cache
 
 from .models import (
     BlogPost, BlogPostLike, BlogPostBookmark, BlogPostShare, 
-    BlogPostComment, UserReadingProgress, BlogPostView
+    BlogPostComment, UserReadingProgress, BlogPostView, BlogPostAnalytics,
+    BlogCategory, BlogTag
+)
+from core.cache import bump_cache_version, cache_version
+from core.sketches import unique_visitors
+from .serializers import (
+    BlogPostBookmarkSerializer, BlogPostCommentSerializer, BlogPostLikeSerializer,
+    BlogPostSummarySerializer, UserReadingProgressSerializer
 )
 from .exceptions import BlogServiceError, DuplicateActionError, BlogValidationError
 
 
+def user_cache_version(user_id) -> int:
+    """
+    Return the current version of a user's cached blog data.
+    
+    Per-user payloads are cached under keys that include this version, so
+    bumping it retires all of them at once. A payload built from data read
+    before a bump is stored under the old version and never served.
+    """
+    return cache_version(f'blog:user-cache-version:{user_id}')
+
+
+def bump_user_cache_version(user_id) -> None:
+    """Retire every cached payload of a user."""
+    if user_id is not None:
+        bump_cache_version(f'blog:user-cache-version:{user_id}')
+
+
+LISTING_CACHE_VERSION_KEY = 'blog:listing-cache-version'
+
+
+def listing_cache_version() -> int:
+    """
+    Return the current version of cached post listings.
+    
+    Featured, popular and related post lists are cached under keys that
+    include it; publishing, unpublishing or rescheduling a post bumps it.
+    """
+    return cache_version(LISTING_CACHE_VERSION_KEY)
+
+
+def bump_listing_cache_version() -> None:
+    """Retire every cached post listing."""
+    bump_cache_version(LISTING_CACHE_VERSION_KEY)
+
+
+def publish_aware_timeout(timeout: int) -> int:
+    """
+    Shorten a listing cache timeout so it expires when the next post goes live.
+    
+    Covers posts published with a future date as well as scheduled ones,
+    so a cached listing never hides a post past its publish time.
+    """
+    next_publish = BlogPost.objects.upcoming().order_by('published_at').values_list('published_at', flat=True).first()
+    if next_publish is None:
+        return timeout
+    return max(1, min(timeout, math.ceil((next_publish - timezone.now()).total_seconds())))
+
+
 class BlogPostService:
     """Service for blog post operations."""
     
     @staticmethod
     def get_published_posts(filters: Optional[Dict[str, Any]] = None) -> List[BlogPost]:
         """Get published blog posts with optional filters."""
-        queryset = BlogPost.objects.filter(
-            status='published',
-            published_at__lte=timezone.now()
-        ).select_related('author', 'new_category').prefetch_related('tags')
+        queryset = BlogPost.objects.published().select_related('author', 'new_category').prefetch_related('tags')
         
         if filters:
             if filters.get('category_slug'):
@@ -52,17 +112,15 @@ class BlogPostService:
     @staticmethod
     def get_featured_posts(limit: int = 5) -> List[BlogPost]:
         """Get featured blog posts."""
-        cache_key = f"featured_posts_{limit}"
+        cache_key = f"featured_posts_{listing_cache_version()}_{limit}"
         cached_posts = cache.get(cache_key)
         
         if cached_posts is None:
-            posts = BlogPost.objects.filter(
-                status='published',
-                is_featured=True,
-                published_at__lte=timezone.now()
+            posts = BlogPost.objects.published().filter(
+                is_featured=True
             ).select_related('author', 'new_category').order_by('-published_at')[:limit]
             
-            cache.set(cache_key, list(posts), 300)  # Cache for 5 minutes
+            cache.set(cache_key, list(posts), publish_aware_timeout(300))  # Up to 5 minutes
             return posts
         
         return cached_posts
@@ -70,16 +128,15 @@ class BlogPostService:
     @staticmethod
     def get_popular_posts(limit: int = 5) -> List[BlogPost]:
         """Get popular blog posts based on view count."""
-        cache_key = f"popular_posts_{limit}"
+        cache_key = f"popular_posts_{listing_cache_version()}_{limit}"
         cached_posts = cache.get(cache_key)
         
         if cached_posts is None:
-            posts = BlogPost.objects.filter(
-                status='published',
-                published_at__lte=timezone.now()
-            ).select_related('author', 'new_category').order_by('-view_count', '-published_at')[:limit]
+            posts = BlogPost.objects.published().select_related(
+                'author', 'new_category'
+            ).order_by('-view_count', '-published_at')[:limit]
             
-            cache.set(cache_key, list(posts), 600)  # Cache for 10 minutes
+            cache.set(cache_key, list(posts), publish_aware_timeout(600))  # Up to 10 minutes
             return posts
         
         return cached_posts
@@ -93,7 +150,7 @@ class BlogPostService:
         3. Posts with matching tags (medium priority)
         4. Recent popular posts (fallback)
         """
-        cache_key = f"related_posts_{post.id}_{limit}"
+        cache_key = f"related_posts_{listing_cache_version()}_{post.id}_{limit}"
         cached_posts = cache.get(cache_key)
         
         if cached_posts is None:
@@ -105,9 +162,7 @@ class BlogPostService:
                 for tag in post.tags:
                     tag_queries |= Q(tags__contains=[tag])
                 
-                priority1 = BlogPost.objects.filter(
-                    status='published',
-                    published_at__lte=timezone.now(),
+                priority1 = BlogPost.objects.published().filter(
                     new_category=post.new_category
                 ).filter(tag_queries).exclude(id=post.id).select_related('author', 'new_category')
                 
@@ -120,9 +175,7 @@ class BlogPostService:
             
             # Priority 2: Same category
             if len(related_posts) < limit and post.new_category:
-                priority2 = BlogPost.objects.filter(
-                    status='published',
-                    published_at__lte=timezone.now(),
+                priority2 = BlogPost.objects.published().filter(
                     new_category=post.new_category
                 ).exclude(id=post.id).exclude(id__in=[p.id for p in related_posts]).select_related('author', 'new_category')
                 priority2 = priority2.order_by('-view_count', '-published_at')[:limit - len(related_posts)]
@@ -134,19 +187,13 @@ class BlogPostService:
                 for tag in post.tags:
                     tag_queries |= Q(tags__contains=[tag])
                 
-                priority3 = BlogPost.objects.filter(
-                    status='published',
-                    published_at__lte=timezone.now()
-                ).filter(tag_queries).exclude(id=post.id).exclude(id__in=[p.id for p in related_posts]).select_related('author', 'new_category')
+                priority3 = BlogPost.objects.published().filter(tag_queries).exclude(id=post.id).exclude(id__in=[p.id for p in related_posts]).select_related('author', 'new_category')
                 priority3 = priority3.order_by('-view_count', '-published_at')[:limit - len(related_posts)]
                 related_posts.extend(list(priority3))
             
             # Priority 4: Recent popular posts (fallback)
             if len(related_posts) < limit:
-                priority4 = BlogPost.objects.filter(
-                    status='published',
-                    published_at__lte=timezone.now()
-                ).exclude(id=post.id).exclude(id__in=[p.id for p in related_posts]).select_related('author', 'new_category')
+                priority4 = BlogPost.objects.published().exclude(id=post.id).exclude(id__in=[p.id for p in related_posts]).select_related('author', 'new_category')
                 priority4 = priority4.order_by('-view_count', '-like_count', '-published_at')[:limit - len(related_posts)]
                 related_posts.extend(list(priority4))
             
@@ -160,12 +207,143 @@ class BlogPostService:
                 if len(unique_posts) >= limit:
                     break
             
-            cache.set(cache_key, unique_posts, 900)  # Cache for 15 minutes
+            cache.set(cache_key, unique_posts, publish_aware_timeout(900))  # Up to 15 minutes
             return unique_posts
         
         return cached_posts
 
 
+class BlogPublishingService:
+    """Publish scheduled posts when their time comes."""
+    
+    @staticmethod
+    def publish_due(limit: int = 100) -> List[BlogPost]:
+        """
+        Flip due ``scheduled`` posts to ``published``; returns the posts published.
+        
+        Posts are saved one by one so category and tag counts follow, and
+        rows locked by a concurrent run are skipped rather than published
+        twice. Listing caches are retired once the change is committed.
+        """
+        with transaction.atomic():
+            posts = list(
+                BlogPost.objects.due().select_for_update(skip_locked=True).order_by('published_at')[:limit]
+            )
+            for post in posts:
+                post.status = 'published'
+                post.save(update_fields=['status', 'updated_at'])
+            if posts:
+                transaction.on_commit(bump_listing_cache_version)
+        return posts
+    
+    @staticmethod
+    def next_publish_at():
+        """Return when the next scheduled post is due, or None."""
+        return BlogPost.objects.filter(status='scheduled').order_by('published_at').values_list(
+            'published_at', flat=True
+        ).first()
+
+
+class BlogTaxonomyCountService:
+    """
+    Maintain ``published_post_count`` on BlogCategory and BlogTag.
+    
+    A post counts once readers can see it, as in ``BlogPost.objects.published()``:
+    published, with a ``published_at`` that has passed. ``BlogPost.save``
+    locks the stored row, saves, and applies the difference between the
+    post's old and new counted category and tags with ``F()`` updates, all
+    in one transaction; deleting a post removes its share (see
+    ``blog.signals``). Writes that skip ``save`` (``QuerySet.update``, raw
+    SQL), and published posts whose future ``published_at`` has since
+    passed, are caught up by ``reconcile``, run nightly by the
+    ``reconcile_blog_post_counts`` command.
+    """
+    
+    @staticmethod
+    def terms(post) -> Optional[tuple]:
+        """Return ``(category_id, tag names)`` counted for ``post``, or None when readers cannot see it."""
+        return BlogTaxonomyCountService._terms(post.status, post.published_at, post.new_category_id, post.tags)
+    
+    @staticmethod
+    def _terms(status, published_at, category_id, tags) -> Optional[tuple]:
+        if status != 'published' or published_at is None or published_at > timezone.now():
+            return None
+        return category_id, BlogTaxonomyCountService._tags(tags)
+    
+    @staticmethod
+    def _tags(tags) -> frozenset:
+        return frozenset(tag for tag in (tags or []) if isinstance(tag, str))
+    
+    @staticmethod
+    def locked_terms(post_id) -> Optional[tuple]:
+        """Lock the stored post until the transaction ends and return its counted terms."""
+        stored = BlogPost.objects.select_for_update().filter(pk=post_id).values_list(
+            'status', 'published_at', 'new_category_id', 'tags'
+        ).first()
+        return BlogTaxonomyCountService._terms(*stored) if stored else None
+    
+    @staticmethod
+    def tag_count(name: str) -> int:
+        """Count the posts readers can see that carry the tag ``name``."""
+        return BlogPost.objects.published().filter(tags__contains=[name]).count()
+    
+    @staticmethod
+    def apply_change(before: Optional[tuple], after: Optional[tuple]) -> None:
+        """Move one post's contribution from terms ``before`` to ``after``."""
+        old_category, old_tags = before or (None, frozenset())
+        new_category, new_tags = after or (None, frozenset())
+        
+        if old_category != new_category:
+            if old_category is not None:
+                BlogCategory.objects.filter(pk=old_category, published_post_count__gt=0).update(
+                    published_post_count=F('published_post_count') - 1
+                )
+            if new_category is not None:
+                BlogCategory.objects.filter(pk=new_category).update(published_post_count=F('published_post_count') + 1)
+        
+        removed, added = old_tags - new_tags, new_tags - old_tags
+        if removed:
+            BlogTag.objects.filter(name__in=removed, published_post_count__gt=0).update(
+                published_post_count=F('published_post_count') - 1
+            )
+        if added:
+            BlogTag.objects.filter(name__in=added).update(published_post_count=F('published_post_count') + 1)
+    
+    @staticmethod
+    def reconcile() -> Dict[str, int]:
+        """Recount every category and tag from the posts; returns how many rows were corrected."""
+        with transaction.atomic():
+            # Lock the counters first: a post saved meanwhile either committed
+            # before the recount below or applies its delta after it
+            rows = {
+                BlogCategory: list(BlogCategory.objects.select_for_update().order_by('pk')),
+                BlogTag: list(BlogTag.objects.select_for_update().order_by('pk')),
+            }
+            published = BlogPost.objects.published()
+            category_counts = dict(
+                published.exclude(new_category=None).order_by().values_list('new_category').annotate(count=Count('pk'))
+            )
+            tag_counts = defaultdict(int)
+            for tags in published.values_list('tags', flat=True).iterator():
+                for tag in BlogTaxonomyCountService._tags(tags):
+                    tag_counts[tag] += 1
+            
+            corrected = {}
+            for model, key, counts in (
+                (BlogCategory, 'pk', category_counts),
+                (BlogTag, 'name', tag_counts),
+            ):
+                stale = []
+                for row in rows[model]:
+                    count = counts.get(getattr(row, key), 0)
+                    if row.published_post_count != count:
+                        row.published_post_count = count
+                        stale.append(row)
+                model.objects.bulk_update(stale, ['published_post_count'], batch_size=500)
+                corrected[model._meta.model_name] = len(stale)
+        return corrected
+
+
 class BlogInteractionService:
     """Service for blog post interactions (like, bookmark, share)."""
     
@@ -301,22 +479,172 @@ class BlogInteractionService:
     @staticmethod
     def get_user_interactions(user: User) -> Dict[str, Any]:
         """Get user's blog interactions."""
-        liked_posts = BlogPostLike.objects.filter(user=user).values_list('post', flat=True)
-        bookmarked_posts = BlogPostBookmark.objects.filter(user=user).values_list('post', flat=True)
+        interactions = BlogInteractionService.get_interaction_sets(user)
+        if interactions is None:
+            interactions = {
+                'liked': BlogPostLike.objects.filter(user=user).values_list('post', flat=True),
+                'bookmarked': BlogPostBookmark.objects.filter(user=user).values_list('post', flat=True),
+            }
+        liked_posts = list(interactions['liked'])
+        bookmarked_posts = list(interactions['bookmarked'])
         
         return {
-            'liked_posts': list(liked_posts),
-            'bookmarked_posts': list(bookmarked_posts),
+            'liked_posts': liked_posts,
+            'bookmarked_posts': bookmarked_posts,
             'liked_count': len(liked_posts),
             'bookmarked_count': len(bookmarked_posts)
         }
+    
+    # Users with more likes or bookmarks than this are not cached as sets
+    INTERACTION_SET_LIMIT = 2000
+    
+    @staticmethod
+    def get_interaction_sets(user: User) -> Optional[Dict[str, frozenset]]:
+        """
+        Return ``{'liked': ids, 'bookmarked': ids}`` for a user from cache.
+        
+        The sets are loaded with two queries on a miss and kept for
+        ``INTERACTION_STATE_CACHE_TTL`` seconds, or until the user's next
+        like or bookmark (see ``blog.signals``). Returns None for users over
+        ``INTERACTION_SET_LIMIT``, whose state is looked up per page.
+        """
+        key = f'blog:interactions:{user.pk}:{user_cache_version(user.pk)}'
+        interactions = cache.get(key)
+        if interactions is None:
+            limit = BlogInteractionService.INTERACTION_SET_LIMIT
+            liked = list(BlogPostLike.objects.filter(user=user).values_list('post_id', flat=True)[:limit + 1])
+            bookmarked = list(
+                BlogPostBookmark.objects.filter(user=user).values_list('post_id', flat=True)[:limit + 1]
+            )
+            if len(liked) > limit or len(bookmarked) > limit:
+                interactions = False
+            else:
+                interactions = {'liked': frozenset(liked), 'bookmarked': frozenset(bookmarked)}
+            cache.set(key, interactions, timeout=settings.INTERACTION_STATE_CACHE_TTL)
+        return interactions or None
+    
+    @staticmethod
+    def get_interaction_state(user: User, post_ids: Iterable[str]) -> Dict[str, Dict[str, bool]]:
+        """
+        Return ``{post_id: {'is_liked': ..., 'is_bookmarked': ...}}`` for a page of posts.
+        
+        Answered from the cached interaction sets, or for heavy users with
+        two ``post_id IN (...)`` queries on the (post, user) unique indexes.
+        """
+        post_ids = [str(post_id) for post_id in post_ids]
+        if not user or not user.is_authenticated:
+            return {post_id: {'is_liked': False, 'is_bookmarked': False} for post_id in post_ids}
+        
+        interactions = BlogInteractionService.get_interaction_sets(user)
+        if interactions is None:
+            interactions = {
+                'liked': set(BlogPostLike.objects.filter(
+                    user=user, post_id__in=post_ids
+                ).values_list('post_id', flat=True)),
+                'bookmarked': set(BlogPostBookmark.objects.filter(
+                    user=user, post_id__in=post_ids
+                ).values_list('post_id', flat=True)),
+            }
+        return {
+            post_id: {
+                'is_liked': post_id in interactions['liked'],
+                'is_bookmarked': post_id in interactions['bookmarked'],
+            }
+            for post_id in post_ids
+        }
+    
 
 
 class ReadingProgressService:
     """Service for reading progress operations."""
     
+    # Progress at or above this percentage marks a post as read
+    COMPLETION_THRESHOLD = 90
+    
+    RETURNED_FIELDS = [
+        'id', 'user_id', 'post_id', 'progress_percentage', 'time_spent', 'last_position',
+        'is_completed', 'completed_at', 'last_read_at', 'created_at'
+    ]
+    
+    @staticmethod
+    def upsert_progress(updates: Iterable[Dict[str, Any]]) -> List[UserReadingProgress]:
+        """
+        Apply many progress pings with one ``INSERT ... ON CONFLICT DO UPDATE``.
+        
+        Each update holds ``user_id``, ``post_id``, ``progress_percentage`` and
+        optionally ``time_spent`` (seconds since the previous ping) and
+        ``last_position``. Time spent accumulates, the percentage only ever
+        grows and completion is sticky, so pings may arrive late or out of
+        order. Pings for the same user and post are folded together first,
+        as one statement cannot update a row twice. Returns the stored rows.
+        """
+        merged = {}
+        for update in updates:
+            percentage = update['progress_percentage']
+            if not (0 <= percentage <= 100):
+                raise BlogValidationError("Progress percentage must be between 0 and 100")
+            key = (update['user_id'], str(update['post_id']))
+            current = merged.get(key)
+            if current is None:
+                merged[key] = {
+                    'progress_percentage': percentage,
+                    'time_spent': update.get('time_spent', 0),
+                    'last_position': update.get('last_position', 0),
+                }
+            else:
+                current['progress_percentage'] = max(current['progress_percentage'], percentage)
+                current['time_spent'] += update.get('time_spent', 0)
+                current['last_position'] = update.get('last_position', 0)
+        if not merged:
+            return []
+        
+        now = timezone.now()
+        rows = []
+        params = []
+        # Rows in key order, so concurrent batches lock shared rows in the same
+        # order and cannot deadlock
+        for (user_id, post_id), values in sorted(merged.items()):
+            completed = values['progress_percentage'] >= ReadingProgressService.COMPLETION_THRESHOLD
+            rows.append('(%s, %s, %s, %s, %s, %s, %s, %s, %s)')
+            params.extend([
+                user_id, post_id, values['progress_percentage'], values['time_spent'],
+                values['last_position'], completed, now if completed else None, now, now
+            ])
+        
+        table = connection.ops.quote_name(UserReadingProgress._meta.db_table)
+        returned = ReadingProgressService.RETURNED_FIELDS
+        sql = f"""
+            INSERT INTO {table} AS progress (
+                user_id, post_id, progress_percentage, time_spent, last_position,
+                is_completed, completed_at, last_read_at, created_at
+            )
+            VALUES {', '.join(rows)}
+            ON CONFLICT (user_id, post_id) DO UPDATE SET
+                progress_percentage = GREATEST(progress.progress_percentage, EXCLUDED.progress_percentage),
+                time_spent = progress.time_spent + EXCLUDED.time_spent,
+                last_position = EXCLUDED.last_position,
+                is_completed = progress.is_completed OR EXCLUDED.is_completed,
+                completed_at = COALESCE(progress.completed_at, EXCLUDED.completed_at),
+                last_read_at = EXCLUDED.last_read_at
+            RETURNING {', '.join(returned)}
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            progress = [
+                UserReadingProgress(**dict(zip(returned, row)))
+                for row in cursor.fetchall()
+            ]
+        # Raw SQL sends no signals, so refresh the dashboards here
+        user_ids = {user_id for user_id, _ in merged}
+        
+        def invalidate_user_caches():
+            for user_id in user_ids:
+                bump_user_cache_version(user_id)
+        
+        transaction.on_commit(invalidate_user_caches)
+        return progress
+    
     @staticmethod
-    @transaction.atomic
     def update_progress(
         user: User, 
         post: BlogPost, 
@@ -326,39 +654,25 @@ class ReadingProgressService:
     ) -> Dict[str, Any]:
         """Update user's reading progress."""
         try:
-            if not (0 <= progress_percentage <= 100):
-                raise BlogValidationError("Progress percentage must be between 0 and 100")
-            
-            progress, created = UserReadingProgress.objects.get_or_create(
-                user=user,
-                post=post,
-                defaults={
-                    'progress_percentage': progress_percentage,
-                    'time_spent': time_spent,
-                    'last_position': last_position,
-                    'is_completed': progress_percentage >= 90
-                }
-            )
-            
-            if not created:
-                progress.progress_percentage = progress_percentage
-                progress.time_spent += time_spent
-                progress.last_position = last_position
-                progress.is_completed = progress_percentage >= 90
-                
-                if progress.is_completed and not progress.completed_at:
-                    progress.completed_at = timezone.now()
-                
-                progress.save()
+            progress, = ReadingProgressService.upsert_progress([{
+                'user_id': user.pk,
+                'post_id': post.pk,
+                'progress_percentage': progress_percentage,
+                'time_spent': time_spent,
+                'last_position': last_position,
+            }])
             
             return {
                 'success': True,
                 'message': 'Reading progress updated successfully',
                 'progress_percentage': progress.progress_percentage,
                 'is_completed': progress.is_completed,
-                'time_spent': progress.time_spent
+                'time_spent': progress.time_spent,
+                'debounce_seconds': settings.READING_PROGRESS_DEBOUNCE_SECONDS
             }
             
+        except BlogValidationError:
+            raise
         except Exception as e:
             raise BlogServiceError(f"Failed to update reading progress: {str(e)}")
     
@@ -413,6 +727,7 @@ class BlogAnalyticsService:
         )['avg_progress'] or 0
         
         return {
+            'unique_visitors': BlogAnalyticsService.unique_visitors([post.pk]),
             'likes': likes_count,
             'bookmarks': bookmarks_count,
             'shares': shares_count,
@@ -423,35 +738,325 @@ class BlogAnalyticsService:
             'average_progress': round(avg_progress, 2)
         }
     
+    PLATFORM_CACHE_KEY = 'blog:platform-analytics'
+    
     @staticmethod
-    def get_platform_analytics() -> Dict[str, Any]:
-        """Get platform-wide analytics."""
-        total_posts = BlogPost.objects.filter(status='published').count()
-        total_likes = BlogPostLike.objects.count()
-        total_bookmarks = BlogPostBookmark.objects.count()
-        total_shares = BlogPostShare.objects.count()
-        total_comments = BlogPostComment.objects.filter(is_approved=True).count()
+    def count_subquery(model, field: str = 'post', **filters) -> Coalesce:
+        """
+        Correlated ``COUNT(*)`` of ``model`` rows whose ``field`` is the outer row.
         
-        # Most popular posts
-        popular_posts = BlogPost.objects.filter(
-            status='published'
+        Each relation is counted in its own subquery; counting several
+        reverse relations with ``Count()`` in one query joins them all and
+        multiplies the rows (likes x bookmarks x shares per post).
+        """
+        counts = model.objects.filter(**{field: OuterRef('pk')}, **filters).order_by().values(field)
+        return Coalesce(
+            Subquery(counts.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+            Value(0)
+        )
+    
+    @staticmethod
+    def compute_platform_analytics(limit: int = 5) -> Dict[str, Any]:
+        """Compute platform-wide analytics straight from the database."""
+        count_subquery = BlogAnalyticsService.count_subquery
+        popular_posts = BlogPost.objects.filter(status='published').annotate(
+            likes_total=count_subquery(BlogPostLike),
+            bookmarks_total=count_subquery(BlogPostBookmark),
+            shares_total=count_subquery(BlogPostShare),
         ).annotate(
-            total_engagement=Count('likes') + Count('bookmarks') + Count('shares')
-        ).order_by('-total_engagement')[:5]
+            total_engagement=F('likes_total') + F('bookmarks_total') + F('shares_total')
+        ).order_by('-total_engagement', '-published_at').only('id', 'title', 'slug')[:limit]
         
         return {
-            'total_posts': total_posts,
-            'total_likes': total_likes,
-            'total_bookmarks': total_bookmarks,
-            'total_shares': total_shares,
-            'total_comments': total_comments,
+            'total_posts': BlogPost.objects.filter(status='published').count(),
+            'total_likes': BlogPostLike.objects.count(),
+            'total_bookmarks': BlogPostBookmark.objects.count(),
+            'total_shares': BlogPostShare.objects.count(),
+            'total_comments': BlogPostComment.objects.filter(is_approved=True).count(),
+            'unique_visitors_30d': BlogAnalyticsService.unique_visitors(
+                start=timezone.localdate() - timedelta(days=29)
+            ),
             'popular_posts': [
                 {
                     'id': post.id,
                     'title': post.title,
                     'slug': post.slug,
-                    'engagement': post.total_engagement
+                    'engagement': post.total_engagement,
+                    'likes': post.likes_total,
+                    'bookmarks': post.bookmarks_total,
+                    'shares': post.shares_total,
                 }
                 for post in popular_posts
-            ]
+            ],
+            'generated_at': timezone.now().isoformat(),
+        }
+    
+    @staticmethod
+    def get_platform_analytics(use_cache: bool = True) -> Dict[str, Any]:
+        """Get platform-wide analytics, cached for ``PLATFORM_ANALYTICS_CACHE_TTL`` seconds."""
+        if not use_cache:
+            return BlogAnalyticsService.compute_platform_analytics()
+        return cache.get_or_set(
+            BlogAnalyticsService.PLATFORM_CACHE_KEY,
+            BlogAnalyticsService.compute_platform_analytics,
+            timeout=settings.PLATFORM_ANALYTICS_CACHE_TTL
+        )
+    
+    @staticmethod
+    def unique_visitors(post_ids: Optional[Iterable[str]] = None, start=None, end=None) -> int:
+        """
+        Estimate distinct visitors of the given posts (all posts by default)
+        between two dates, inclusive, from the daily HyperLogLog sketches.
+        """
+        return unique_visitors('blog.view', post_ids, start, end)
+    
+    @staticmethod
+    def invalidate_platform_analytics() -> None:
+        """Drop the cached platform analytics so the next request recomputes them."""
+        cache.delete(BlogAnalyticsService.PLATFORM_CACHE_KEY)
+
+
+class BlogAnalyticsBatchService:
+    """
+    Recompute BlogPostAnalytics for many posts with a handful of GROUP BY queries.
+    
+    Each stage aggregates one event table for every selected post at once and
+    the results are written back with ``bulk_update``. Metrics match
+    ``BlogPostAnalytics.calculate_metrics``: posts without views are left
+    untouched and reading metrics only change for posts with progress records.
+    
+    ``recompute_blog_analytics`` records the start time of each run in the
+    cache as the watermark of the next ``--incremental`` run; if the key is
+    missing, everything is recomputed.
+    """
+    
+    WATERMARK_KEY = 'blog:analytics-batch:last-run'
+    
+    METRIC_FIELDS = [
+        'unique_views', 'bounce_rate', 'average_time_on_page', 'average_scroll_depth',
+        'completion_rate', 'social_shares', 'updated_at'
+    ]
+    
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self.timings: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    
+    @staticmethod
+    def last_run_at():
+        """Start time of the last batch run, used as the incremental watermark."""
+        return cache.get(BlogAnalyticsBatchService.WATERMARK_KEY)
+    
+    @staticmethod
+    def set_last_run_at(started_at) -> None:
+        """Record the start of a batch run that covered every changed post."""
+        cache.set(BlogAnalyticsBatchService.WATERMARK_KEY, started_at, None)
+    
+    @staticmethod
+    def changed_post_ids(since) -> List[str]:
+        """Posts with views or reading progress recorded at or after ``since``."""
+        viewed = BlogPostView.objects.filter(viewed_at__gte=since).values_list('post_id', flat=True)
+        read = UserReadingProgress.objects.filter(last_read_at__gte=since).values_list('post_id', flat=True)
+        return sorted(set(viewed.distinct().order_by()) | set(read.distinct().order_by()))
+    
+    def _view_stats(self, post_filter: Q) -> Dict[str, Dict[str, int]]:
+        views = BlogPostView.objects.filter(post_filter).order_by()
+        rows = views.values('post_id').annotate(
+            distinct_ips=Count('ip_address', distinct=True),
+            # values('ip_address').distinct() in calculate_metrics counts NULL as one visitor
+            has_null_ip=Max(Case(When(ip_address__isnull=True, then=1), default=0, output_field=IntegerField())),
+        )
+        return {
+            row['post_id']: {'unique_ips': row['distinct_ips'] + row['has_null_ip']}
+            for row in rows
         }
+    
+    def _bounces(self, post_filter: Q) -> Dict[str, int]:
+        # Anonymous visitors with exactly one view, counted per post
+        single_visits = BlogPostView.objects.filter(post_filter, user__isnull=True).order_by().values(
+            'post_id', 'ip_address'
+        ).annotate(visit_count=Count('id')).filter(visit_count=1)
+        sql, params = single_visits.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT post_id, COUNT(*) FROM ({sql}) single_visits GROUP BY post_id', params)
+            return dict(cursor.fetchall())
+    
+    def _reading_stats(self, post_filter: Q) -> Dict[str, Dict[str, Any]]:
+        rows = UserReadingProgress.objects.filter(post_filter).order_by().values('post_id').annotate(
+            readers=Count('id'),
+            completed=Count('id', filter=Q(is_completed=True)),
+            avg_time=Avg('time_spent'),
+            avg_depth=Avg('progress_percentage'),
+        )
+        return {row['post_id']: row for row in rows}
+    
+    def _shares(self, post_filter: Q) -> Dict[str, Dict[str, int]]:
+        shares = defaultdict(dict)
+        rows = BlogPostShare.objects.filter(post_filter).order_by().values_list('post_id', 'platform').annotate(
+            count=Count('id')
+        )
+        for post_id, platform, count in rows:
+            shares[post_id][platform] = count
+        return shares
+    
+    def run(self, post_ids: Optional[Iterable[str]] = None, started_at=None) -> int:
+        """
+        Recompute analytics for ``post_ids`` (all posts if None). Returns posts updated.
+        
+        ``started_at`` is when the posts were selected, if that was before
+        this call; analytics rows are stamped with it.
+        """
+        self.timings = {}
+        started_at = started_at or timezone.now()
+        post_filter = Q() if post_ids is None else Q(post_id__in=list(post_ids))
+        
+        with self.stage('views'):
+            view_stats = self._view_stats(post_filter)
+        if not view_stats:
+            return 0
+        with self.stage('bounces'):
+            bounces = self._bounces(post_filter)
+        with self.stage('reading_progress'):
+            reading = self._reading_stats(post_filter)
+        with self.stage('shares'):
+            shares = self._shares(post_filter)
+        
+        with self.stage('load'):
+            analytics = {
+                item.post_id: item
+                for item in BlogPostAnalytics.objects.filter(post_id__in=list(view_stats))
+            }
+            missing = [BlogPostAnalytics(post_id=post_id) for post_id in view_stats if post_id not in analytics]
+            for item in BlogPostAnalytics.objects.bulk_create(missing, batch_size=self.batch_size):
+                analytics[item.post_id] = item
+        
+        with self.stage('compute'):
+            for post_id, stats in view_stats.items():
+                item = analytics[post_id]
+                unique_ips = stats['unique_ips']
+                item.unique_views = unique_ips
+                if unique_ips > 0:
+                    item.bounce_rate = (bounces.get(post_id, 0) / unique_ips) * 100
+                progress = reading.get(post_id)
+                if progress:
+                    item.average_time_on_page = progress['avg_time'] or 0
+                    item.average_scroll_depth = progress['avg_depth'] or 0
+                    item.completion_rate = (progress['completed'] / progress['readers']) * 100
+                item.social_shares = shares.get(post_id, {})
+                item.updated_at = started_at
+        
+        with self.stage('write'):
+            BlogPostAnalytics.objects.bulk_update(
+                analytics.values(), self.METRIC_FIELDS, batch_size=self.batch_size
+            )
+        return len(analytics)
+
+
+class UserDashboardService:
+    """
+    Per-user dashboard and activity payloads.
+    
+    Payloads are cached for ``DASHBOARD_CACHE_TTL`` seconds under the
+    user's cache version, which is bumped whenever the user likes,
+    bookmarks, comments or reads (see ``blog.signals`` and
+    ``ReadingProgressService``), so a user never sees their own stale activity.
+    """
+    
+    PROGRESS_PAGE_SIZE = 10
+    MAX_PROGRESS_PAGE_SIZE = 50
+    RECENTLY_READ = 5
+    RECENT_ACTIVITY = 10
+    
+    @staticmethod
+    def _cached(user_id, name: str, build) -> Any:
+        return cache.get_or_set(
+            f'blog:dashboard:{user_id}:{user_cache_version(user_id)}:{name}', build,
+            timeout=settings.DASHBOARD_CACHE_TTL
+        )
+    
+    @staticmethod
+    def get_counts(user: User) -> Dict[str, int]:
+        """Return the user's interaction counts with a single query."""
+        count_subquery = BlogAnalyticsService.count_subquery
+        return get_user_model().objects.filter(pk=user.pk).values(
+            liked_posts_count=count_subquery(BlogPostLike, 'user'),
+            bookmarked_posts_count=count_subquery(BlogPostBookmark, 'user'),
+            comments_count=count_subquery(BlogPostComment, 'user'),
+            reading_progress_count=count_subquery(UserReadingProgress, 'user'),
+            completed_posts_count=count_subquery(UserReadingProgress, 'user', is_completed=True),
+        ).get()
+    
+    @staticmethod
+    def _progress_page(user: User, offset: int, limit: int, published_only: bool = False) -> List[UserReadingProgress]:
+        post_fields = [f'post__{field}' for field in BlogPostSummarySerializer.Meta.fields]
+        progress = UserReadingProgress.objects.filter(user=user)
+        if published_only:
+            progress = progress.filter(post__in=BlogPost.objects.published())
+        return list(
+            progress.select_related('post')
+            .only(*UserReadingProgressSerializer.Meta.fields, 'user_id', 'post_id', *post_fields)
+            .order_by('-last_read_at')[offset:offset + limit]
+        )
+    
+    @staticmethod
+    def get_dashboard(user: User, page: int = 1, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Return counts, one page of reading progress and the most recently read posts."""
+        page = max(1, page)
+        page_size = min(
+            page_size or UserDashboardService.PROGRESS_PAGE_SIZE, UserDashboardService.MAX_PROGRESS_PAGE_SIZE
+        )
+        
+        def build():
+            counts = UserDashboardService.get_counts(user)
+            progress = UserDashboardService._progress_page(user, (page - 1) * page_size, page_size)
+            # Only posts readers can open, so drafts and unpublished posts drop out
+            recent = UserDashboardService._progress_page(
+                user, 0, UserDashboardService.RECENTLY_READ, published_only=True
+            )
+            return {
+                **counts,
+                'reading_progress': UserReadingProgressSerializer(progress, many=True).data,
+                'reading_progress_page': {
+                    'page': page,
+                    'page_size': page_size,
+                    'count': counts['reading_progress_count'],
+                    'has_next': page * page_size < counts['reading_progress_count'],
+                },
+                'recently_read': BlogPostSummarySerializer([item.post for item in recent], many=True).data,
+            }
+        
+        # The listing version moves when a post is published or unpublished
+        return UserDashboardService._cached(
+            user.pk, f'dashboard:{listing_cache_version()}:{page}:{page_size}', build
+        )
+    
+    @staticmethod
+    def get_activity(user: User) -> Dict[str, Any]:
+        """Return the user's latest comments, likes and bookmarks."""
+        limit = UserDashboardService.RECENT_ACTIVITY
+        
+        def build():
+            approved = BlogPostComment.objects.filter(is_approved=True).select_related('user').order_by('created_at')
+            comments = BlogPostComment.objects.filter(user=user).select_related('user').prefetch_related(
+                Prefetch(
+                    'replies',
+                    queryset=approved.prefetch_related(Prefetch('replies', queryset=approved, to_attr='approved_replies')),
+                    to_attr='approved_replies'
+                )
+            ).order_by('-created_at')[:limit]
+            likes = BlogPostLike.objects.filter(user=user).order_by('-liked_at')[:limit]
+            bookmarks = BlogPostBookmark.objects.filter(user=user).order_by('-bookmarked_at')[:limit]
+            return {
+                'recent_comments': BlogPostCommentSerializer(comments, many=True).data,
+                'recent_likes': BlogPostLikeSerializer(likes, many=True).data,
+                'recent_bookmarks': BlogPostBookmarkSerializer(bookmarks, many=True).data,
+            }
+        
+        return UserDashboardService._cached(user.pk, 'activity', build)
@@ -0,0 +1,41 @@
+"""
+Signal handlers for the blog app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BlogPost, BlogPostBookmark, BlogPostComment, BlogPostLike, UserReadingProgress
+from .services import BlogTaxonomyCountService, bump_listing_cache_version, bump_user_cache_version
+
+
+@receiver(post_save, sender=BlogPostLike)
+@receiver(post_delete, sender=BlogPostLike)
+@receiver(post_save, sender=BlogPostBookmark)
+@receiver(post_delete, sender=BlogPostBookmark)
+@receiver(post_save, sender=BlogPostComment)
+@receiver(post_delete, sender=BlogPostComment)
+@receiver(post_save, sender=UserReadingProgress)
+@receiver(post_delete, sender=UserReadingProgress)
+def invalidate_user_caches(sender, instance, **kwargs):
+    """Refresh the acting user's cached dashboard and interaction state once committed."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_user_cache_version(user_id))
+
+
+@receiver(post_delete, sender=BlogPost)
+def remove_post_from_counts(sender, instance, **kwargs):
+    """Take a deleted post out of its category and tag counts, within the delete's transaction."""
+    BlogTaxonomyCountService.apply_change(BlogTaxonomyCountService.terms(instance), None)
+
+
+# Post fields that change what the cached listings show
+LISTING_FIELDS = {'status', 'published_at', 'is_featured'}
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_post_listings(sender, instance, update_fields=None, **kwargs):
+    """Retire cached post listings once a post is published, rescheduled, featured or removed."""
+    if update_fields is None or LISTING_FIELDS & set(update_fields):
+        transaction.on_commit(bump_listing_cache_version)
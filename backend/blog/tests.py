@@ -0,0 +1,560 @@
+"""
+Tests for blog services, caches and their invalidation.
+"""
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+
+from core.images import read_manifest
+from core.models import UserAgent, VisitorSketch
+from core.sketches import ALL_OBJECTS
+from jobs.models import Job
+from jobs.queue import claim_jobs, run_job
+from team.models import TeamMember
+from .events import view_events
+from .models import (
+    BlogCategory, BlogPost, BlogPostAnalytics, BlogPostBookmark, BlogPostLike, BlogPostView, BlogTag,
+    UserReadingProgress
+)
+from .services import (
+    BlogAnalyticsBatchService, BlogAnalyticsService, BlogInteractionService, BlogPublishingService, BlogTaxonomyCountService,
+    ReadingProgressService, UserDashboardService, listing_cache_version, user_cache_version
+)
+
+
+def create_author():
+    return TeamMember.objects.create(name='Author', role=TeamMember.ROLE_CHOICES[0][0], bio='Bio')
+
+
+def create_post(author, slug, **fields):
+    fields.setdefault('status', 'published')
+    return BlogPost.objects.create(title=slug.title(), slug=slug, body='Body', author=author, **fields)
+
+
+class BlogAnalyticsBatchTests(TestCase):
+    """Incremental recomputation picks posts by a watermark taken at the start of each run."""
+
+    def setUp(self):
+        cache.clear()
+        author = create_author()
+        self.first, self.second = create_post(author, 'first'), create_post(author, 'second')
+
+    def view(self, post, ip='10.0.0.1', at=None):
+        view = BlogPostView.objects.create(post=post, ip_address=ip)
+        if at:
+            BlogPostView.objects.filter(pk=view.pk).update(viewed_at=at)
+
+    def test_command_records_its_start_as_watermark(self):
+        self.view(self.first)
+        before = timezone.now()
+
+        call_command('recompute_blog_analytics', stdout=io.StringIO())
+
+        watermark = BlogAnalyticsBatchService.last_run_at()
+        self.assertGreaterEqual(watermark, before)
+        self.assertEqual(BlogPostAnalytics.objects.get(post=self.first).unique_views, 1)
+
+    def test_other_analytics_writes_do_not_move_watermark(self):
+        self.view(self.first)
+        call_command('recompute_blog_analytics', stdout=io.StringIO())
+        watermark = BlogAnalyticsBatchService.last_run_at()
+
+        # Recomputing a single post, or an admin edit
+        self.view(self.second)
+        BlogPostAnalytics(post=self.second).calculate_metrics()
+        BlogPostAnalytics.objects.filter(post=self.first).update(updated_at=timezone.now())
+
+        self.assertEqual(BlogAnalyticsBatchService.last_run_at(), watermark)
+
+    def test_changed_post_ids_selects_posts_with_new_events(self):
+        since = timezone.now() - timedelta(hours=1)
+        self.view(self.first, at=since - timedelta(minutes=1))
+        self.view(self.second, at=since + timedelta(minutes=1))
+
+        self.assertEqual(BlogAnalyticsBatchService.changed_post_ids(since), [str(self.second.pk)])
+
+    def test_incremental_command_only_recomputes_changed_posts(self):
+        self.view(self.first)
+        call_command('recompute_blog_analytics', stdout=io.StringIO())
+        watermark = BlogAnalyticsBatchService.last_run_at()
+        self.view(self.second, at=watermark + timedelta(seconds=1))
+
+        call_command('recompute_blog_analytics', '--incremental', stdout=io.StringIO())
+
+        self.assertEqual(BlogPostAnalytics.objects.get(post=self.second).unique_views, 1)
+        self.assertEqual(BlogPostAnalytics.objects.get(post=self.first).updated_at, watermark)
+        self.assertGreater(BlogAnalyticsBatchService.last_run_at(), watermark)
+
+
+BROWSER_UA = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
+
+
+@override_settings(RATE_LIMIT_ENABLED=False, EVENT_FLUSH_INTERVAL=3600, EVENT_BATCH_SIZE=100)
+class BlogViewEventTests(TestCase):
+    """Post views are buffered and their visitors sketched once per flush."""
+
+    def setUp(self):
+        cache.clear()
+        UserAgent.clear_cache()
+        self.addCleanup(view_events.flush)
+        author = create_author()
+        self.posts = [create_post(author, f'post-{i}') for i in range(3)]
+
+    def view(self, post, ip):
+        return self.client.get(f'/api/v1/blog/posts/{post.slug}/', REMOTE_ADDR=ip, HTTP_USER_AGENT=BROWSER_UA)
+
+    def test_views_are_counted_before_and_after_flush(self):
+        self.assertEqual(self.view(self.posts[0], '203.0.113.1').json()['view_count'], 1)
+        self.assertEqual(self.view(self.posts[0], '203.0.113.1').json()['view_count'], 2)
+        self.assertEqual(BlogPostView.objects.count(), 0)
+
+        self.assertEqual(view_events.flush(), 2)
+
+        self.posts[0].refresh_from_db()
+        self.assertEqual(self.posts[0].view_count, 2)
+        self.assertEqual(BlogPostView.objects.filter(post=self.posts[0]).count(), 2)
+
+    def test_flush_locks_each_sketch_once_per_batch(self):
+        for i in range(12):
+            self.view(self.posts[i % 3], f'203.0.113.{i % 4}')
+
+        with CaptureQueriesContext(connection) as queries:
+            view_events.flush()
+
+        locking = [query['sql'] for query in queries if 'FOR UPDATE' in query['sql']]
+        self.assertEqual(len(locking), 1)
+        # Three post sketches and the site-wide one for today
+        self.assertEqual(VisitorSketch.objects.filter(event='blog.view').count(), 4)
+        self.assertTrue(VisitorSketch.objects.filter(event='blog.view', object_id=ALL_OBJECTS).exists())
+        self.assertEqual(BlogAnalyticsService.unique_visitors(), 4)
+        self.assertEqual(BlogAnalyticsService.unique_visitors([self.posts[0].pk]), 4)
+
+    def test_bot_views_are_not_recorded(self):
+        self.client.get(f'/api/v1/blog/posts/{self.posts[0].slug}/', HTTP_USER_AGENT='Googlebot/2.1')
+
+        self.assertEqual(view_events.flush(), 0)
+
+
+
+class ReadingProgressTests(TestCase):
+    """Progress pings are merged into one row per user and post, in one upsert per batch."""
+
+    def setUp(self):
+        author = create_author()
+        self.posts = [create_post(author, f'post-{i}') for i in range(3)]
+        self.user = get_user_model().objects.create_user('reader', 'reader@example.com', 'password')
+
+    def ping(self, post, percentage, time_spent=0):
+        return {'user_id': self.user.pk, 'post_id': post.pk, 'progress_percentage': percentage, 'time_spent': time_spent}
+
+    def test_percentage_only_grows_and_time_accumulates(self):
+        ReadingProgressService.upsert_progress([self.ping(self.posts[0], 50, 30)])
+        # A late ping, and two for the same post in one batch
+        progress, = ReadingProgressService.upsert_progress([
+            self.ping(self.posts[0], 30, 10), self.ping(self.posts[0], 40, 5)
+        ])
+
+        self.assertEqual((progress.progress_percentage, progress.time_spent), (50, 45))
+        self.assertFalse(progress.is_completed)
+
+    def test_completion_is_sticky(self):
+        first, = ReadingProgressService.upsert_progress([self.ping(self.posts[0], 95)])
+        later, = ReadingProgressService.upsert_progress([self.ping(self.posts[0], 10)])
+
+        self.assertTrue(later.is_completed)
+        self.assertEqual(later.progress_percentage, 95)
+        self.assertEqual(later.completed_at, first.completed_at)
+
+    def test_rows_are_written_in_key_order(self):
+        posts = sorted(self.posts, key=lambda post: post.pk, reverse=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            ReadingProgressService.upsert_progress([self.ping(post, 10) for post in posts])
+
+        sql, = [query['sql'] for query in queries if 'ON CONFLICT' in query['sql']]
+        positions = [sql.index(str(post.pk)) for post in posts]
+        self.assertEqual(positions, sorted(positions, reverse=True))
+
+    def test_batch_skips_unknown_posts(self):
+        self.client.force_login(self.user)
+        missing = '00000000-0000-0000-0000-000000000000'
+
+        response = self.client.post('/api/v1/blog/reading-progress/batch/', {'updates': [
+            {'post': self.posts[0].pk, 'progress_percentage': 60, 'time_spent': 12},
+            {'post': missing, 'progress_percentage': 10},
+        ]}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['skipped'], [missing])
+        self.assertEqual([result['post'] for result in response.json()['results']], [str(self.posts[0].pk)])
+        self.assertEqual(UserReadingProgress.objects.get(user=self.user).time_spent, 12)
+
+
+
+class TaxonomyCountTests(TestCase):
+    """Category and tag counts only include posts readers can see."""
+
+    def setUp(self):
+        self.author = create_author()
+        self.category = BlogCategory.objects.create(name='Django', slug='django')
+        self.tag = BlogTag.objects.create(name='orm')
+
+    def counts(self):
+        self.category.refresh_from_db()
+        self.tag.refresh_from_db()
+        return self.category.published_post_count, self.tag.published_post_count
+
+    def create_post(self, slug, **fields):
+        return create_post(self.author, slug, new_category=self.category, tags=['orm'], **fields)
+
+    def test_future_published_posts_are_not_counted(self):
+        self.create_post('now')
+        future = self.create_post('later', published_at=timezone.now() + timedelta(days=1))
+        self.assertEqual(self.counts(), (1, 1))
+
+        BlogPost.objects.filter(pk=future.pk).update(published_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(BlogTaxonomyCountService.reconcile(), {'blogcategory': 1, 'blogtag': 1})
+        self.assertEqual(self.counts(), (2, 2))
+
+    def test_scheduled_posts_count_once_published(self):
+        post = self.create_post('scheduled', status='scheduled', published_at=timezone.now() + timedelta(hours=1))
+        self.assertEqual(self.counts(), (0, 0))
+
+        BlogPost.objects.filter(pk=post.pk).update(published_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([published.pk for published in BlogPublishingService.publish_due()], [str(post.pk)])
+        self.assertEqual(self.counts(), (1, 1))
+        BlogPost.objects.get(pk=post.pk).delete()
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_saving_a_tag_only_recounts_when_renamed(self):
+        self.create_post('tagged')
+        tag = BlogTag.objects.get(pk=self.tag.pk)
+        # A post published after the tag was loaded
+        self.create_post('another')
+
+        tag.color = '#000000'
+        with CaptureQueriesContext(connection) as queries:
+            tag.save()
+        self.assertFalse(any('blog_blogpost' in query['sql'] for query in queries))
+        self.assertEqual(self.counts(), (2, 2))
+
+        tag.name = 'django-orm'
+        tag.save()
+        self.assertEqual(BlogTag.objects.get(pk=tag.pk).published_post_count, 0)
+
+
+
+class UserDashboardCacheTests(TestCase):
+    """Dashboards are cached per user and retired when that user's activity commits."""
+
+    def setUp(self):
+        cache.clear()
+        self.post = create_post(create_author(), 'post')
+        User = get_user_model()
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        self.other = User.objects.create_user('other', 'other@example.com', 'password')
+
+    def test_dashboard_is_served_from_cache(self):
+        UserDashboardService.get_dashboard(self.user)
+
+        with self.assertNumQueries(0):
+            dashboard = UserDashboardService.get_dashboard(self.user)
+        self.assertEqual(dashboard['liked_posts_count'], 0)
+
+    def test_activity_retires_only_the_users_cache(self):
+        UserDashboardService.get_dashboard(self.user)
+        other_version = user_cache_version(self.other.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BlogPostLike.objects.create(post=self.post, user=self.user)
+
+        self.assertEqual(UserDashboardService.get_dashboard(self.user)['liked_posts_count'], 1)
+        self.assertEqual(user_cache_version(self.other.pk), other_version)
+
+    def test_progress_upsert_retires_the_cache(self):
+        self.assertEqual(UserDashboardService.get_dashboard(self.user)['reading_progress_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingProgressService.upsert_progress([
+                {'user_id': self.user.pk, 'post_id': self.post.pk, 'progress_percentage': 40}
+            ])
+
+        dashboard = UserDashboardService.get_dashboard(self.user)
+        self.assertEqual(dashboard['reading_progress_count'], 1)
+        self.assertEqual([item['slug'] for item in dashboard['recently_read']], ['post'])
+
+    def test_recently_read_only_lists_published_posts(self):
+        draft = create_post(self.post.author, 'draft', status='draft')
+        for post in (self.post, draft):
+            UserReadingProgress.objects.create(user=self.user, post=post, progress_percentage=40)
+        dashboard = UserDashboardService.get_dashboard(self.user)
+        self.assertEqual([item['slug'] for item in dashboard['recently_read']], ['post'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.status = 'draft'
+            self.post.save()
+
+        dashboard = UserDashboardService.get_dashboard(self.user)
+        self.assertEqual(dashboard['recently_read'], [])
+        self.assertEqual(dashboard['reading_progress_count'], 2)
+
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class InteractionStateTests(TestCase):
+    """Post lists embed the user's liked/bookmarked flags for the whole page."""
+
+    def setUp(self):
+        cache.clear()
+        author = create_author()
+        published_at = timezone.now() - timedelta(hours=1)
+        self.posts = [create_post(author, f'post-{i}', published_at=published_at) for i in range(3)]
+        self.user = get_user_model().objects.create_user('reader', 'reader@example.com', 'password')
+
+    def list_interactions(self):
+        response = self.client.get('/api/v1/blog/posts/')
+        self.assertEqual(response.status_code, 200)
+        return {post['slug']: post['user_interactions'] for post in response.json()['results']}
+
+    def test_anonymous_flags_are_false(self):
+        interactions = self.list_interactions()
+
+        self.assertEqual(len(interactions), 3)
+        self.assertTrue(all(value == {'is_liked': False, 'is_bookmarked': False} for value in interactions.values()))
+
+    def test_list_embeds_flags_and_follows_new_likes(self):
+        self.client.force_login(self.user)
+        BlogPostBookmark.objects.create(post=self.posts[1], user=self.user)
+        self.assertEqual(self.list_interactions()['post-1'], {'is_liked': False, 'is_bookmarked': True})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BlogPostLike.objects.create(post=self.posts[0], user=self.user)
+
+        interactions = self.list_interactions()
+        self.assertEqual(interactions['post-0'], {'is_liked': True, 'is_bookmarked': False})
+        self.assertEqual(interactions['post-2'], {'is_liked': False, 'is_bookmarked': False})
+
+    def test_sets_are_cached(self):
+        BlogPostLike.objects.create(post=self.posts[0], user=self.user)
+        ids = [post.pk for post in self.posts]
+        BlogInteractionService.get_interaction_state(self.user, ids)
+
+        with self.assertNumQueries(0):
+            state = BlogInteractionService.get_interaction_state(self.user, ids)
+        self.assertTrue(state[str(self.posts[0].pk)]['is_liked'])
+
+    def test_heavy_users_are_looked_up_per_page(self):
+        BlogPostLike.objects.create(post=self.posts[0], user=self.user)
+
+        with mock.patch.object(BlogInteractionService, 'INTERACTION_SET_LIMIT', 0):
+            self.assertIsNone(BlogInteractionService.get_interaction_sets(self.user))
+            state = BlogInteractionService.get_interaction_state(self.user, [self.posts[0].pk, self.posts[1].pk])
+
+        self.assertEqual(state[str(self.posts[0].pk)], {'is_liked': True, 'is_bookmarked': False})
+        self.assertFalse(state[str(self.posts[1].pk)]['is_liked'])
+
+
+
+class PublishingTests(TestCase):
+    """Visibility follows the clock per query; due scheduled posts are flipped to published."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_author()
+        now = timezone.now()
+        self.visible = create_post(self.author, 'visible', published_at=now - timedelta(hours=1))
+        self.future = create_post(self.author, 'future', published_at=now + timedelta(hours=1))
+        self.due = create_post(self.author, 'due', status='scheduled', published_at=now - timedelta(minutes=1))
+        self.later = create_post(self.author, 'later', status='scheduled', published_at=now + timedelta(hours=2))
+
+    def slugs(self, queryset):
+        return sorted(queryset.values_list('slug', flat=True))
+
+    def test_published_and_upcoming(self):
+        self.assertEqual(self.slugs(BlogPost.objects.published()), ['visible'])
+        self.assertEqual(self.slugs(BlogPost.objects.upcoming()), ['future', 'later'])
+        self.assertEqual(self.slugs(BlogPost.objects.due()), ['due'])
+
+    def test_publish_due_flips_due_posts_and_retires_listings(self):
+        version = listing_cache_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            published = BlogPublishingService.publish_due()
+
+        self.assertEqual([post.slug for post in published], ['due'])
+        self.assertEqual(self.slugs(BlogPost.objects.published()), ['due', 'visible'])
+        self.assertGreater(listing_cache_version(), version)
+        self.assertEqual(BlogPublishingService.next_publish_at(), self.later.published_at)
+        self.assertEqual(BlogPublishingService.publish_due(), [])
+
+
+class PublishDueLockingTests(TransactionTestCase):
+    """Concurrent runs skip posts another run has locked instead of publishing them twice."""
+
+    def test_locked_posts_are_skipped(self):
+        author = create_author()
+        due_at = timezone.now() - timedelta(minutes=1)
+        locked = create_post(author, 'locked', status='scheduled', published_at=due_at)
+        free = create_post(author, 'free', status='scheduled', published_at=due_at + timedelta(seconds=1))
+
+        other = connections.create_connection('default')
+        self.addCleanup(other.close)
+        with other.cursor() as cursor:
+            cursor.execute('BEGIN')
+            cursor.execute(
+                f'SELECT id FROM {BlogPost._meta.db_table} WHERE id = %s FOR UPDATE', [str(locked.pk)]
+            )
+            published = BlogPublishingService.publish_due()
+            cursor.execute('ROLLBACK')
+
+        self.assertEqual([post.pk for post in published], [str(free.pk)])
+        self.assertEqual(BlogPost.objects.get(pk=locked.pk).status, 'scheduled')
+        self.assertEqual([post.slug for post in BlogPublishingService.publish_due()], ['locked'])
+
+
+class FeedViewTests(TestCase):
+    """Feeds are cached per scope, revalidate with 304 and change as soon as their posts do."""
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_author()
+        self.category = BlogCategory.objects.create(name='Django', slug='django')
+        self.tag = BlogTag.objects.create(name='orm')
+        published_at = timezone.now() - timedelta(hours=1)
+        self.post = create_post(
+            self.author, 'scoped', new_category=self.category, tags=['orm'], published_at=published_at
+        )
+        create_post(self.author, 'general', published_at=published_at)
+        create_post(self.author, 'draft', status='draft')
+
+    def get(self, path, **headers):
+        return self.client.get(f'/api/v1/blog/{path}', **headers)
+
+    def test_rss_and_atom_feeds_list_published_posts(self):
+        rss, atom = self.get('rss/'), self.get('atom/')
+
+        self.assertTrue(rss['Content-Type'].startswith('application/rss+xml'))
+        self.assertTrue(atom['Content-Type'].startswith('application/atom+xml'))
+        self.assertIn(b'http://www.w3.org/2005/Atom', atom.content)
+        for response in (rss, atom):
+            self.assertIn(b'/blog/scoped/', response.content)
+            self.assertIn(b'/blog/general/', response.content)
+            self.assertNotIn(b'/blog/draft/', response.content)
+            self.assertIn('max-age', response['Cache-Control'])
+
+    def test_category_and_tag_feeds(self):
+        for path in ('rss/category/django/', 'atom/category/django/', 'rss/tag/orm/', 'atom/tag/orm/'):
+            response = self.get(path)
+            self.assertIn(b'/blog/scoped/', response.content)
+            self.assertNotIn(b'/blog/general/', response.content)
+
+        BlogCategory.objects.create(name='Hidden', slug='hidden', is_active=False)
+        for path in ('rss/category/unknown/', 'atom/tag/unknown/', 'rss/category/hidden/'):
+            self.assertEqual(self.get(path).status_code, 404)
+
+    def test_unchanged_feed_answers_304(self):
+        response = self.get('rss/')
+
+        self.assertEqual(self.get('rss/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.get('rss/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        # Each feed variant has its own ETag
+        self.assertEqual(self.get('atom/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_rendering_queries_do_not_grow_with_posts(self):
+        with CaptureQueriesContext(connection) as few:
+            self.get('rss/')
+        for index in range(5):
+            create_post(self.author, f'more-{index}', new_category=self.category, published_at=self.post.published_at)
+        cache.clear()
+
+        with self.assertNumQueries(len(few)):
+            self.assertIn(b'/blog/more-4/', self.get('rss/').content)
+
+    def test_cached_feed_is_served_without_rendering(self):
+        first = self.get('rss/')
+
+        with mock.patch('blog.rss_feed.BlogPostFeed.items') as items, self.assertNumQueries(1):
+            second = self.get('rss/')
+        items.assert_not_called()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_editing_or_unpublishing_a_post_changes_the_feed(self):
+        original = self.get('rss/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'Renamed post'
+            self.post.save()
+        edited = self.get('rss/')
+        self.assertNotEqual(edited['ETag'], original['ETag'])
+        self.assertIn(b'Renamed post', edited.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.status = 'draft'
+            self.post.save()
+        unpublished = self.get('rss/')
+        self.assertNotEqual(unpublished['ETag'], edited['ETag'])
+        self.assertNotIn(b'/blog/scoped/', unpublished.content)
+        self.assertEqual(self.get('rss/', HTTP_IF_NONE_MATCH=original['ETag']).status_code, 200)
+
+
+@override_settings(IMAGE_VARIANT_WIDTHS=[100, 200])
+class ImageUploadTests(TestCase):
+    """Uploads return at once with the original; a job adds the variants."""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        media = override_settings(MEDIA_ROOT=directory)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.client.force_login(get_user_model().objects.create_user('editor', 'editor@example.com', 'password'))
+
+    def upload(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (300, 200), (200, 100, 50)).save(buffer, 'JPEG')
+        return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def test_variants_are_generated_by_a_job(self):
+        response = self.client.post('/api/v1/blog/upload-image/', {'image': self.upload()})
+
+        self.assertEqual(response.status_code, 201)
+        manifest = response.json()['image']
+        self.assertTrue(manifest['pending'])
+        self.assertEqual(manifest['variants'], [])
+        job = Job.objects.get(name='images.generate_variants')
+        self.assertEqual(job.payload, {'directory': manifest['directory']})
+
+        self.assertTrue(run_job(claim_jobs('worker')[0]))
+
+        manifest = read_manifest(manifest['directory'])
+        self.assertFalse(manifest['pending'])
+        self.assertEqual({variant['width'] for variant in manifest['variants']}, {100, 200})
+
+    @override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMITS={'image_upload': '1/min'}, RATE_LIMIT_TRUSTED_IPS=[])
+    def test_uploads_need_a_user_and_are_rate_limited(self):
+        first = self.client.post('/api/v1/blog/upload-image/', {'image': self.upload()})
+        second = self.client.post('/api/v1/blog/upload-image/', {'image': self.upload()})
+        self.client.logout()
+        anonymous = self.client.post('/api/v1/blog/upload-image/', {'image': self.upload()})
+        # The health check only reports status
+        health = self.client.post('/api/v1/blog/health/', {'image': self.upload()})
+
+        self.assertEqual(
+            [first.status_code, second.status_code, anonymous.status_code, health.status_code],
+            [201, 429, 403, 405]
+        )
+        self.assertEqual(Job.objects.filter(name='images.generate_variants').count(), 1)
@@ -1,7 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
-from .rss_feed import BlogPostFeed
+from .rss_feed import BlogPostAtomFeed, BlogPostFeed, CachedFeedView
+
+rss_feed = CachedFeedView(BlogPostFeed())
+atom_feed = CachedFeedView(BlogPostAtomFeed())
 
 router = DefaultRouter()
 router.register(r'categories', views.BlogCategoryViewSet, basename='blogcategory')
@@ -16,8 +19,15 @@ router.register(r'reading-progress', views.UserReadingProgressViewSet, basename=
 router.register(r'analytics', views.BlogPostAnalyticsViewSet, basename='blogpostanalytics')
 
 urlpatterns = [
+    # Before the router so 'platform' is not taken as an analytics pk
+    path('analytics/platform/', views.PlatformAnalyticsView.as_view(), name='blog_platform_analytics'),
     path('', include(router.urls)),
     path('upload-image/', views.ImageUploadView.as_view(), name='upload_image'),
     path('health/', views.BlogHealthCheckView.as_view(), name='blog_health'),
-    path('rss/', BlogPostFeed(), name='blog_rss'),
+    path('rss/', rss_feed, name='blog_rss'),
+    path('rss/category/<slug:slug>/', rss_feed, {'kind': 'category'}, name='blog_rss_category'),
+    path('rss/tag/<slug:slug>/', rss_feed, {'kind': 'tag'}, name='blog_rss_tag'),
+    path('atom/', atom_feed, name='blog_atom'),
+    path('atom/category/<slug:slug>/', atom_feed, {'kind': 'category'}, name='blog_atom_category'),
+    path('atom/tag/<slug:slug>/', atom_feed, {'kind': 'tag'}, name='blog_atom_tag'),
 ]
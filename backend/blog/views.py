@@ -4,30 +4,77 @@ Views for blog app.
 from rest_framework import viewsets, status, filters, pagination
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny, IsAuthenticated
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, F, Count
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-import uuid
-import os
+from django.conf import settings
 
+from core.images import InvalidImage, store_upload
+from core.ratelimit import TokenBucketThrottle, get_client_ip
+from jobs.queue import enqueue
+from .events import record_view
 from .models import BlogPost, BlogCategory, BlogPostView, BlogPostLike, BlogPostBookmark, BlogPostShare, BlogTag, BlogPostComment, UserReadingProgress, BlogPostAnalytics
 from .serializers import (
     BlogPostListSerializer, BlogPostDetailSerializer, BlogPostCreateSerializer, BlogPostUpdateSerializer,
     BlogCategorySerializer, BlogPostViewSerializer, BlogPostLikeSerializer, 
     BlogPostBookmarkSerializer, BlogPostShareSerializer, BlogTagSerializer,
-    BlogPostCommentSerializer, UserReadingProgressSerializer, BlogPostAnalyticsSerializer
+    BlogPostCommentSerializer, UserReadingProgressSerializer, BlogPostAnalyticsSerializer,
+    ReadingProgressUpdateSerializer
 )
 from .permissions import IsAuthorOrReadOnly, IsOwnerOrReadOnly
+from .services import BlogAnalyticsService, BlogInteractionService, ReadingProgressService, UserDashboardService
+
+
+def upload_blog_image(request):
+    """Store an uploaded blog image with a placeholder and queue its resized WebP/AVIF variants."""
+    image_file = request.FILES.get('image')
+    if not image_file:
+        return Response({
+            'error': 'No image file provided'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Validate file type
+    allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+    if image_file.content_type not in allowed_types:
+        return Response({
+            'error': 'Invalid file type. Only JPEG, PNG, GIF, and WebP are allowed.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Validate file size
+    if image_file.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+        return Response({
+            'error': f'File size too large. Maximum size is {settings.IMAGE_UPLOAD_MAX_SIZE // (1024 * 1024)}MB.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        manifest = store_upload(image_file, 'blog_images')
+        if manifest['pending']:
+            enqueue('images.generate_variants', {'directory': manifest['directory']})
+    except InvalidImage as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': f'Upload failed: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return Response({
+        'success': True,
+        'filename': manifest['original']['name'],
+        'url': manifest['original']['url'],
+        'size': image_file.size,
+        'content_type': image_file.content_type,
+        'image': manifest,
+    }, status=status.HTTP_201_CREATED)
 
 
 class ImageUploadView(APIView):
     """Separate view for image upload - requires authentication for security"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scopes = {'post': 'image_upload'}
     
     def get(self, request):
         """Test endpoint to verify permissions"""
@@ -36,6 +83,10 @@ class ImageUploadView(APIView):
             'permissions': 'IsAuthenticated',
             'user': request.user.username if request.user.is_authenticated else 'Anonymous'
         })
+    
+    def post(self, request):
+        """Upload an image and return its responsive variants."""
+        return upload_blog_image(request)
 
 
 class BlogHealthCheckView(APIView):
@@ -63,49 +114,6 @@ class BlogHealthCheckView(APIView):
                 'error': str(e),
                 'timestamp': timezone.now().isoformat()
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def post(self, request):
-        """Upload an image for blog posts."""
-        try:
-            image_file = request.FILES.get('image')
-            if not image_file:
-                return Response({
-                    'error': 'No image file provided'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate file type
-            allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-            if image_file.content_type not in allowed_types:
-                return Response({
-                    'error': 'Invalid file type. Only JPEG, PNG, GIF, and WebP are allowed.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate file size (max 5MB)
-            if image_file.size > 5 * 1024 * 1024:
-                return Response({
-                    'error': 'File size too large. Maximum size is 5MB.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Generate unique filename
-            file_extension = os.path.splitext(image_file.name)[1]
-            filename = f"blog_images/{uuid.uuid4()}{file_extension}"
-            
-            # Save file
-            saved_path = default_storage.save(filename, ContentFile(image_file.read()))
-            file_url = default_storage.url(saved_path)
-            
-            return Response({
-                'success': True,
-                'filename': filename,
-                'url': file_url,
-                'size': image_file.size,
-                'content_type': image_file.content_type
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({
-                'error': f'Upload failed: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -122,11 +130,7 @@ class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     def posts(self, request, slug=None):
         """Get posts for a specific category"""
         category = self.get_object()
-        posts = BlogPost.objects.filter(
-            new_category=category,
-            status='published',
-            published_at__lte=timezone.now()
-        ).order_by('-published_at')
+        posts = BlogPost.objects.published().filter(new_category=category).order_by('-published_at')
         
         # Apply pagination
         page = self.paginate_queryset(posts)
@@ -139,8 +143,10 @@ class BlogCategoryViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class BlogPostViewSet(viewsets.ModelViewSet):
-    queryset = BlogPost.objects.filter(status='published', published_at__lte=timezone.now())
+    queryset = BlogPost.objects.published()
     permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scopes = {'view': 'blog_view'}
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['new_category', 'is_featured']  # Use new_category for filtering
     search_fields = ['title', 'excerpt', 'body', 'author__name']
@@ -155,7 +161,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             queryset = BlogPost.objects.all()
         else:
             # Anonymous users only see published posts
-            queryset = BlogPost.objects.filter(status='published', published_at__lte=timezone.now())
+            queryset = BlogPost.objects.published()
         
         # Filter by category slug - check if request has query_params (DRF Request)
         if hasattr(self.request, 'query_params'):
@@ -186,7 +192,9 @@ class BlogPostViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """Override permissions for different actions"""
-        if self.action in ['list', 'retrieve', 'view', 'like', 'bookmark', 'share', 'featured', 'popular', 'recent']:
+        if self.action in [
+            'list', 'retrieve', 'view', 'like', 'bookmark', 'share', 'featured', 'popular', 'recent', 'interactions'
+        ]:
             # Read actions - allow anyone
             permission_classes = [AllowAny]
         elif self.action in ['create']:
@@ -200,37 +208,55 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    # Most post ids accepted by one interactions lookup
+    MAX_INTERACTION_IDS = 100
+
+    def list(self, request, *args, **kwargs):
+        """List posts with the user's liked/bookmarked flags for the whole page"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        posts = page if page is not None else list(queryset)
+        
+        context = self.get_serializer_context()
+        context['interaction_state'] = BlogInteractionService.get_interaction_state(
+            request.user, [post.pk for post in posts]
+        )
+        serializer = self.get_serializer_class()(posts, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get', 'post'])
+    def interactions(self, request):
+        """
+        Liked/bookmarked flags for a page of posts: ``?ids=a,b`` or a POST
+        of ``{"ids": [...]}``. Anonymous users get all flags false.
+        """
+        if request.method == 'POST':
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        else:
+            ids = [post_id for post_id in request.query_params.get('ids', '').split(',') if post_id]
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'ids is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.MAX_INTERACTION_IDS:
+            return Response(
+                {'error': f'At most {self.MAX_INTERACTION_IDS} ids per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(BlogInteractionService.get_interaction_state(request.user, ids))
+
     def retrieve(self, request, *args, **kwargs):
         """Override retrieve to automatically track views"""
         try:
             instance = self.get_object()
             
             # Record view automatically when post is retrieved
-            referrer = request.META.get('HTTP_REFERER', '')
-            if referrer is None:
-                referrer = ''
-                
-            view_data = {
-                'post': instance,
-                'ip_address': self._get_client_ip(request),
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                'referrer': referrer
-            }
-            
-            if request.user.is_authenticated:
-                view_data['user'] = request.user
-            
-            # Create view record - handle errors gracefully
             try:
-                view_serializer = BlogPostViewSerializer(data=view_data)
-                if view_serializer.is_valid():
-                    view_serializer.save()
-                    # Increment view count
-                    instance.increment_view()
+                instance.view_count = record_view(instance, request)
             except Exception as e:
                 # Log error but don't fail the request
                 print(f"Error recording view: {e}")
-                pass
             
             serializer = self.get_serializer(instance)
             return Response(serializer.data)
@@ -248,34 +274,10 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         try:
             post = self.get_object()
             
-            # Create view record
-            referrer = request.META.get('HTTP_REFERER', '')
-            if referrer is None:
-                referrer = ''
-                
-            view_data = {
-                'post': post,
-                'ip_address': self._get_client_ip(request),
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                'referrer': referrer
-            }
-            
-            if request.user.is_authenticated:
-                view_data['user'] = request.user
-            
-            serializer = BlogPostViewSerializer(data=view_data)
-            if serializer.is_valid():
-                serializer.save()
-                
-                # Increment view count
-                post.increment_view()
-                
-                return Response({
-                    'message': 'View recorded successfully',
-                    'view_count': post.view_count
-                }, status=status.HTTP_200_OK)
-            
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'message': 'View recorded successfully',
+                'view_count': record_view(post, request)
+            }, status=status.HTTP_200_OK)
             
         except Exception as e:
             print(f"Error recording view: {e}")
@@ -521,30 +523,17 @@ class BlogPostViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
-        """Get dashboard data for authenticated users"""
+        """Get dashboard data for authenticated users; ``?page=`` pages reading progress"""
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Get user's reading progress
-        reading_progress = UserReadingProgress.objects.filter(user=request.user)
-        
-        # Get user's liked posts
-        liked_posts = BlogPostLike.objects.filter(user=request.user).values_list('post', flat=True)
-        
-        # Get user's bookmarked posts
-        bookmarked_posts = BlogPostBookmark.objects.filter(user=request.user).values_list('post', flat=True)
-        
-        dashboard_data = {
-            'reading_progress': UserReadingProgressSerializer(reading_progress, many=True).data,
-            'liked_posts_count': len(liked_posts),
-            'bookmarked_posts_count': len(bookmarked_posts),
-            'recently_read': self.get_serializer(
-                self.get_queryset().filter(id__in=reading_progress.values_list('post', flat=True))[:5], 
-                many=True
-            ).data
-        }
+        try:
+            page = int(request.query_params.get('page', 1))
+            page_size = int(request.query_params.get('page_size', 0)) or None
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(dashboard_data)
+        return Response(UserDashboardService.get_dashboard(request.user, page=page, page_size=page_size))
 
     @action(detail=False, methods=['get'])
     def my_activity(self, request):
@@ -552,37 +541,17 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Get user's comments
-        comments = BlogPostComment.objects.filter(user=request.user).order_by('-created_at')[:10]
-        
-        # Get user's likes
-        likes = BlogPostLike.objects.filter(user=request.user).order_by('-liked_at')[:10]
-        
-        # Get user's bookmarks
-        bookmarks = BlogPostBookmark.objects.filter(user=request.user).order_by('-bookmarked_at')[:10]
-        
-        activity_data = {
-            'recent_comments': BlogPostCommentSerializer(comments, many=True).data,
-            'recent_likes': BlogPostLikeSerializer(likes, many=True).data,
-            'recent_bookmarks': BlogPostBookmarkSerializer(bookmarks, many=True).data,
-        }
-        
-        return Response(activity_data)
+        return Response(UserDashboardService.get_activity(request.user))
 
 
 
     def _get_client_ip(self, request):
         """Get client IP address from request"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return get_client_ip(request)
 
 
 class BlogPostViewViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = BlogPostView.objects.all()
+    queryset = BlogPostView.objects.select_related('user_agent_ref')
     serializer_class = BlogPostViewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -636,11 +605,7 @@ class BlogTagViewSet(viewsets.ReadOnlyModelViewSet):
     def posts(self, request, slug=None):
         """Get posts for a specific tag"""
         tag = self.get_object()
-        posts = BlogPost.objects.filter(
-            tags__contains=[tag.name],
-            status='published',
-            published_at__lte=timezone.now()
-        ).order_by('-published_at')
+        posts = BlogPost.objects.published().filter(tags__contains=[tag.name]).order_by('-published_at')
         
         # Apply pagination
         page = self.paginate_queryset(posts)
@@ -763,9 +728,63 @@ class UserReadingProgressViewSet(viewsets.ModelViewSet):
             return super().get_queryset()
         return super().get_queryset().filter(user=self.request.user)
     
-    def perform_create(self, serializer):
-        """Save the reading progress with the authenticated user."""
-        serializer.save(user=self.request.user)
+    def _upsert(self, updates):
+        """Upsert validated pings for the current user, skipping unknown posts."""
+        post_ids = {update['post'] for update in updates}
+        existing = set(BlogPost.objects.filter(pk__in=post_ids).values_list('pk', flat=True))
+        progress = ReadingProgressService.upsert_progress([
+            dict(update, user_id=self.request.user.pk, post_id=update['post'])
+            for update in updates
+            if update['post'] in existing
+        ])
+        return progress, sorted(post_ids - existing)
+    
+    def create(self, request, *args, **kwargs):
+        """Create or update the user's progress on a post with a single upsert."""
+        serializer = ReadingProgressUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        progress, missing = self._upsert([serializer.validated_data])
+        if missing:
+            return Response({'error': 'Post not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        data = UserReadingProgressSerializer(progress[0]).data
+        data['debounce_seconds'] = settings.READING_PROGRESS_DEBOUNCE_SECONDS
+        return Response(data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Record several progress pings in one request and one upsert.
+        
+        Accepts a list of pings, or ``{"updates": [...]}``. Clients should
+        collect pings and send them no more often than ``debounce_seconds``,
+        and flush on page hide.
+        """
+        updates = request.data.get('updates') if isinstance(request.data, dict) else request.data
+        if not isinstance(updates, list) or not updates:
+            return Response({'error': 'A non-empty list of updates is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(updates) > settings.READING_PROGRESS_BATCH_LIMIT:
+            return Response(
+                {'error': f'At most {settings.READING_PROGRESS_BATCH_LIMIT} updates per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = ReadingProgressUpdateSerializer(data=updates, many=True)
+        serializer.is_valid(raise_exception=True)
+        progress, missing = self._upsert(serializer.validated_data)
+        return Response({
+            'results': [
+                {
+                    'post': item.post_id,
+                    'progress_percentage': item.progress_percentage,
+                    'time_spent': item.time_spent,
+                    'is_completed': item.is_completed,
+                }
+                for item in progress
+            ],
+            'skipped': missing,
+            'debounce_seconds': settings.READING_PROGRESS_DEBOUNCE_SECONDS
+        })
 
 
 class BlogPostAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
@@ -783,3 +802,14 @@ class BlogPostAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
         if self.request.user.is_staff:
             return super().get_queryset()
         return BlogPostAnalytics.objects.none()
+
+
+class PlatformAnalyticsView(APIView):
+    """Platform-wide blog analytics for staff, served from a short-lived cache."""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        """Return the cached summary; ``?refresh=1`` recomputes it."""
+        if request.query_params.get('refresh') in ('1', 'true'):
+            BlogAnalyticsService.invalidate_platform_analytics()
+        return Response(BlogAnalyticsService.get_platform_analytics())
@@ -12,6 +12,9 @@ from django.db.models import Q, Count, F
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
+from core.ratelimit import get_client_ip
+
+from .events import record_view
 from .models import (
     BlogPost, BlogCategory, BlogPostLike, BlogPostBookmark, 
     BlogPostShare, BlogTag, BlogPostComment, UserReadingProgress
@@ -146,10 +149,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             ).select_related('author', 'new_category')
         else:
             # Anonymous users can only see published posts
-            return super().get_queryset().filter(
-                status='published',
-                published_at__lte=timezone.now()
-            ).select_related('author', 'new_category')
+            return super().get_queryset().published().select_related('author', 'new_category')
     
     def get_permissions(self):
         """Return appropriate permissions based on action."""
@@ -171,14 +171,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         # Record view for published posts
         if instance.status == 'published':
             try:
-                from .models import BlogPostView
-                BlogPostView.objects.create(
-                    post=instance,
-                    ip_address=self._get_client_ip(request),
-                    user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                    referrer=request.META.get('HTTP_REFERER', '')
-                )
-                instance.increment_view()
+                instance.view_count = record_view(instance, request)
             except Exception as e:
                 # Log error but don't fail the request
                 print(f"Error recording view: {e}")
@@ -334,12 +327,7 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     
     def _get_client_ip(self, request):
         """Get client IP address from request."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return get_client_ip(request)
 
 
 class BlogPostCommentViewSet(viewsets.ModelViewSet):
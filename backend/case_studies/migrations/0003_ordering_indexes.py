@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-19 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("case_studies", "0002_auto_20250820_1904"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="casestudy",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["order", "-published_at", "-created_at"],
+                name="case_study_pub_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="casestudy",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["-published_at", "-created_at"],
+                name="case_study_pub_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="casestudy",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["-created_at"],
+                name="case_study_pub_created_idx",
+            ),
+        ),
+    ]
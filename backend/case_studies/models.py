@@ -76,6 +76,18 @@ class CaseStudy(models.Model):
         ordering = ['order', '-published_at', '-created_at']
         verbose_name = 'Case Study'
         verbose_name_plural = 'Case Studies'
+        # Back the public list orderings (see CaseStudyViewSet.ordering_plans)
+        indexes = [
+            models.Index(
+                fields=['order', '-published_at', '-created_at'], name='case_study_pub_order_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=['-published_at', '-created_at'], name='case_study_pub_date_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(fields=['-created_at'], name='case_study_pub_created_idx', condition=models.Q(is_published=True)),
+        ]
 
     def __str__(self):
         return self.title
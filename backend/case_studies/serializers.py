@@ -1,17 +1,20 @@
 from rest_framework import serializers
+
+from core.fields import DownloadFileField, ThumbnailURLField
 from .models import CaseStudy
 
 
 class CaseStudyListSerializer(serializers.ModelSerializer):
     """Simplified serializer for list views"""
     reading_time = serializers.ReadOnlyField()
+    hero_image_url = ThumbnailURLField('card', source='hero_image')
     
     class Meta:
         model = CaseStudy
         fields = [
             'id', 'title', 'slug', 'subtitle', 'summary', 'category',
             'client_name', 'client_industry', 'project_duration',
-            'technologies', 'hero_image', 'is_featured', 'order',
+            'technologies', 'hero_image', 'hero_image_url', 'is_featured', 'order',
             'reading_time', 'created_at'
         ]
 
@@ -21,6 +24,8 @@ class CaseStudyDetailSerializer(serializers.ModelSerializer):
     reading_time = serializers.ReadOnlyField()
     has_metrics = serializers.ReadOnlyField()
     has_testimonial = serializers.ReadOnlyField()
+    case_study_pdf = DownloadFileField(read_only=True)
+    hero_image_url = ThumbnailURLField('hero', source='hero_image')
     
     class Meta:
         model = CaseStudy
@@ -32,7 +37,7 @@ class CaseStudyDetailSerializer(serializers.ModelSerializer):
             'technologies', 'tools',
             'business_objectives', 'key_results', 'metrics', 'roi',
             'client_testimonial', 'client_contact_name', 'client_contact_role',
-            'hero_image', 'gallery_images',
+            'hero_image', 'hero_image_url', 'gallery_images',
             'live_url', 'case_study_pdf',
             'is_featured', 'is_published', 'order',
             'reading_time', 'has_metrics', 'has_testimonial',
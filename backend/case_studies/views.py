@@ -3,22 +3,34 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods
+from core.filedelivery import serve_field_file
+from core.ordering import IndexedOrderingFilter, OrderingPlanHeaderMixin
+from core.ratelimit import rate_limited
 from .models import CaseStudy
 from .serializers import CaseStudyListSerializer, CaseStudyDetailSerializer, CaseStudyCreateSerializer
 
 
-class CaseStudyViewSet(viewsets.ReadOnlyModelViewSet):
+class CaseStudyViewSet(OrderingPlanHeaderMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for case studies.
     Read-only for public access.
     """
     queryset = CaseStudy.objects.filter(is_published=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, IndexedOrderingFilter]
     filterset_fields = ['category', 'client_industry', 'is_featured', 'is_published']
     search_fields = ['title', 'subtitle', 'summary', 'description', 'client_name']
-    ordering_fields = ['order', 'created_at', 'published_at']
-    ordering = ['order', '-published_at', '-created_at']
+    # ?ordering= value -> order_by, each backed by an index on CaseStudy
+    ordering_plans = {
+        'order': ('order', '-published_at', '-created_at'),
+        '-order': ('-order', 'published_at', 'created_at'),
+        '-published_at': ('-published_at', '-created_at'),
+        'published_at': ('published_at', 'created_at'),
+        '-created_at': ('-created_at',),
+        'created_at': ('created_at',),
+    }
+    ordering = 'order'
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -44,14 +56,6 @@ class CaseStudyViewSet(viewsets.ReadOnlyModelViewSet):
         if industry:
             queryset = queryset.filter(client_industry__icontains=industry)
         
-        # Apply ordering
-        ordering = self.request.query_params.get('ordering', None)
-        if ordering:
-            queryset = queryset.order_by(ordering)
-        else:
-            # Use default ordering
-            queryset = queryset.order_by('order', '-published_at', '-created_at')
-        
         return queryset
     
     def retrieve(self, request, slug=None):
@@ -72,3 +76,11 @@ class CaseStudyViewSet(viewsets.ReadOnlyModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+@require_http_methods(["GET", "HEAD"])
+@rate_limited('file_download')
+def case_study_pdf_download(request, slug):
+    """Serve a published case study's PDF with Range and conditional request support."""
+    case_study = get_object_or_404(CaseStudy, slug=slug, is_published=True)
+    return serve_field_file(request, case_study.case_study_pdf)
@@ -14,7 +14,8 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
 
     list_display = [
         'name', 'email', 'company', 'subject', 'lead_score', 'status', 
-        'assigned_to', 'submitted_at', 'is_high_priority_display', 'needs_follow_up_display'
+        'assigned_to', 'submitted_at', 'duplicate_count', 'is_high_priority_display',
+        'needs_follow_up_display'
     ]
     
     list_filter = [
@@ -31,7 +32,7 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
         'id', 'submitted_at', 'first_contacted_at', 'last_contacted_at',
         'follow_up_scheduled', 'follow_up_completed', 'created_at', 'updated_at',
         'is_high_priority_display', 'is_qualified_display', 'needs_follow_up_display',
-        'time_since_submission_display'
+        'time_since_submission_display', 'duplicate_count', 'last_duplicate_at'
     ]
 
     fieldsets = (
@@ -49,6 +50,10 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
             'fields': ('source', 'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content'),
             'classes': ('collapse',)
         }),
+        ('Duplicates', {
+            'fields': ('duplicate_count', 'last_duplicate_at'),
+            'classes': ('collapse',)
+        }),
         ('Communication History', {
             'fields': ('first_contacted_at', 'last_contacted_at', 'follow_up_scheduled', 'follow_up_completed'),
             'classes': ('collapse',)
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-19 07:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contact", "0004_contactsubmission_processed_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contactsubmission",
+            name="duplicate_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Repeat submissions folded into this record"
+            ),
+        ),
+        migrations.AddField(
+            model_name="contactsubmission",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="contactsubmission",
+            name="last_duplicate_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="contactsubmission",
+            index=models.Index(
+                fields=["fingerprint", "submitted_at"],
+                name="contact_con_fingerp_a4fa51_idx",
+            ),
+        ),
+    ]
@@ -6,6 +6,9 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from core.dedup import SubmissionDeduplicator
+from scoring.engine import score_submission
+
 
 class ContactSubmission(models.Model):
     """Enhanced contact form submission model with lead scoring capabilities."""
@@ -116,12 +119,25 @@ class ContactSubmission(models.Model):
     utm_term = models.CharField(max_length=100, blank=True)
     utm_content = models.CharField(max_length=100, blank=True)
 
+    # Deduplication
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    duplicate_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Repeat submissions folded into this record"
+    )
+    last_duplicate_at = models.DateTimeField(null=True, blank=True)
+
     # Timestamps
     submitted_at = models.DateTimeField(default=timezone.now)
     first_contacted_at = models.DateTimeField(null=True, blank=True)
     last_contacted_at = models.DateTimeField(null=True, blank=True)
     follow_up_scheduled = models.DateTimeField(null=True, blank=True)
     follow_up_completed = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When background enrichment and scoring completed"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -135,6 +151,7 @@ class ContactSubmission(models.Model):
             models.Index(fields=['lead_score', 'submitted_at']),
             models.Index(fields=['assigned_to', 'status']),
             models.Index(fields=['utm_source', 'utm_campaign']),
+            models.Index(fields=['fingerprint', 'submitted_at']),
         ]
 
     def __str__(self):
@@ -163,92 +180,12 @@ class ContactSubmission(models.Model):
         return timezone.now() - self.submitted_at
 
     def calculate_lead_score(self):
-        """Calculate lead score based on form data."""
-        score = 0
-        
-        # Basic information (0-20 points)
-        if self.name: score += 5
-        if self.email: score += 5
-        if self.phone: score += 5
-        if self.company: score += 5
-        
-        # Project details (0-40 points)
-        if self.project_budget:
-            budget_score = {
-                'under-10k': 5,
-                '10k-25k': 10,
-                '25k-50k': 15,
-                '50k-100k': 20,
-                '100k-250k': 25,
-                '250k+': 30,
-                'not-sure': 10
-            }
-            score += budget_score.get(self.project_budget, 0)
-        
-        if self.timeline:
-            timeline_score = {
-                'asap': 20,
-                '1-3-months': 15,
-                '3-6-months': 10,
-                '6-12-months': 5,
-                '12-months+': 0,
-                'flexible': 10
-            }
-            score += timeline_score.get(self.timeline, 0)
-        
-        if self.team_size:
-            team_score = {
-                'solo': 10,
-                '2-5': 15,
-                '6-10': 20,
-                '11-25': 25,
-                '26-50': 30,
-                '50+': 35
-            }
-            score += team_score.get(self.team_size, 0)
-        
-        if self.industry:
-            industry_score = {
-                'fintech': 20,
-                'healthcare': 20,
-                'ecommerce': 15,
-                'saas': 25,
-                'education': 15,
-                'real-estate': 10,
-                'manufacturing': 15,
-                'consulting': 10,
-                'other': 10
-            }
-            score += industry_score.get(self.industry, 0)
-        
-        if self.urgency:
-            urgency_score = {
-                'low': 5,
-                'medium': 10,
-                'high': 20,
-                'critical': 25
-            }
-            score += urgency_score.get(self.urgency, 0)
-        
-        # Subject priority (0-20 points)
-        if self.subject:
-            subject_score = {
-                'project': 20,
-                'consultation': 15,
-                'quote': 15,
-                'partnership': 10,
-                'general': 5,
-                'support': 10,
-                'career': 5,
-                'other': 5
-            }
-            score += subject_score.get(self.subject, 0)
-        
-        return min(score, 100)  # Cap at 100
+        """Calculate lead score with the active contact scoring model."""
+        return score_submission(self, 'contact')
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, score_lead=True, **kwargs):
         """Override save to automatically calculate lead score."""
-        if not self.lead_score:
+        if score_lead and not self.lead_score:
             self.lead_score = self.calculate_lead_score()
         super().save(*args, **kwargs)
 
@@ -275,3 +212,11 @@ class ContactSubmission(models.Model):
         """Update the lead status."""
         self.status = new_status
         self.save(update_fields=['status', 'updated_at'])
+
+
+# Folds repeat submissions from the public form into the first record
+submission_deduplicator = SubmissionDeduplicator(
+    ContactSubmission,
+    fields=['subject', 'message'],
+    timestamp_field='submitted_at'
+)
@@ -2,7 +2,7 @@
 Serializers for contact app.
 """
 from rest_framework import serializers
-from .models import ContactSubmission
+from .models import ContactSubmission, submission_deduplicator
 
 
 class ContactSubmissionSerializer(serializers.ModelSerializer):
@@ -16,12 +16,13 @@ class ContactSubmissionSerializer(serializers.ModelSerializer):
             'lead_score', 'status', 'assigned_to', 'notes', 'source',
             'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
             'submitted_at', 'first_contacted_at', 'last_contacted_at',
-            'follow_up_scheduled', 'follow_up_completed', 'created_at', 'updated_at'
+            'follow_up_scheduled', 'follow_up_completed', 'processed_at',
+            'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'lead_score', 'status', 'assigned_to', 'submitted_at',
             'first_contacted_at', 'last_contacted_at', 'follow_up_scheduled',
-            'follow_up_completed', 'created_at', 'updated_at'
+            'follow_up_completed', 'processed_at', 'created_at', 'updated_at'
         ]
 
 
@@ -37,14 +38,24 @@ class ContactSubmissionCreateSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        """Create a new contact submission with automatic lead scoring."""
+        """Create a new contact submission, or return the recent one it repeats."""
+        return self.save_or_fold(validated_data)[0]
+    
+    def save_or_fold(self, validated_data=None):
+        """
+        Store the raw submission, or fold it into a recent identical one.
+        
+        Returns ``(submission, created)``; enrichment and scoring run in the background.
+        """
+        validated_data = dict(self.validated_data if validated_data is None else validated_data)
         # Set default source if not provided
         validated_data.setdefault('source', 'website')
         
-        # Create the submission (lead score will be calculated automatically in save method)
-        submission = ContactSubmission.objects.create(**validated_data)
-        
-        return submission
+        self.instance, created = submission_deduplicator.save(
+            ContactSubmission(**validated_data),
+            score_lead=False
+        )
+        return self.instance, created
 
 
 class ContactSubmissionUpdateSerializer(serializers.ModelSerializer):
@@ -114,6 +125,7 @@ class ContactAnalyticsSerializer(serializers.Serializer):
     high_priority_leads = serializers.IntegerField()
     needs_follow_up = serializers.IntegerField()
     avg_lead_score = serializers.FloatField()
+    suppressed_duplicates = serializers.IntegerField()
     
     # Status breakdown
     status_breakdown = serializers.DictField()
@@ -0,0 +1,35 @@
+"""
+Background tasks for contact app.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.leads import enrich_submission, notification_recipients
+from jobs.queue import enqueue
+from jobs.registry import task
+
+from .models import ContactSubmission
+
+
+@task('contact.process_submission')
+def process_submission(payload):
+    """Enrich and score a new contact submission, then queue notifications."""
+    with transaction.atomic():
+        submission = ContactSubmission.objects.select_for_update().filter(
+            pk=payload['submission_id']
+        ).first()
+        if submission is None or submission.processed_at:
+            return
+
+        enrich_submission(submission)
+        submission.lead_score = submission.calculate_lead_score()
+        submission.processed_at = timezone.now()
+        submission.save(update_fields=[
+            'name', 'email', 'company', 'source', 'lead_score', 'processed_at', 'updated_at'
+        ])
+
+        if notification_recipients():
+            enqueue('leads.notify', {
+                'model': 'contact.ContactSubmission',
+                'submission_id': str(submission.pk),
+            })
@@ -5,9 +5,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q, Avg, Sum
 from django.contrib.auth.models import User
+from core.ratelimit import TokenBucketThrottle
+from jobs.queue import enqueue
 from .models import ContactSubmission
 from .serializers import (
     ContactSubmissionSerializer,
@@ -24,6 +27,8 @@ class ContactSubmissionViewSet(viewsets.ModelViewSet):
     
     queryset = ContactSubmission.objects.all()
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scopes = {'create': 'contact_submit'}
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -36,29 +41,34 @@ class ContactSubmissionViewSet(viewsets.ModelViewSet):
         return ContactSubmissionSerializer
     
     def create(self, request, *args, **kwargs):
-        """Create a new contact submission."""
+        """Store a new contact submission and queue it for processing."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Extract UTM parameters from request
-        utm_data = {}
-        for key in ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content']:
-            if key in request.data:
-                utm_data[key] = request.data[key]
+        # Persist the raw submission and its processing job atomically
+        with transaction.atomic():
+            submission, created = serializer.save_or_fold()
+            if created:
+                enqueue('contact.process_submission', {'submission_id': str(submission.id)})
         
-        # Create submission with UTM data
-        submission = serializer.save(**utm_data)
-        
-        # Get the full serialized data for response
-        response_serializer = ContactSubmissionSerializer(submission)
+        if not created:
+            return Response({
+                'success': True,
+                'message': 'This submission was already received',
+                'submission_id': submission.id,
+                'lead_score': submission.lead_score,
+                'status': submission.status,
+                'duplicate': True,
+                'data': ContactSubmissionSerializer(submission).data
+            }, status=status.HTTP_200_OK)
         
         return Response({
             'success': True,
-            'message': 'Contact submission created successfully',
+            'message': 'Contact submission received successfully',
             'submission_id': submission.id,
             'lead_score': submission.lead_score,
             'status': submission.status,
-            'data': response_serializer.data
+            'data': ContactSubmissionSerializer(submission).data
         }, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['post'])
@@ -191,6 +201,9 @@ class ContactSubmissionViewSet(viewsets.ModelViewSet):
             # Average lead score
             avg_lead_score = submissions.aggregate(avg_score=Avg('lead_score'))['avg_score'] or 0
             
+            # Repeat submissions folded into existing records
+            suppressed_duplicates = submissions.aggregate(total=Sum('duplicate_count'))['total'] or 0
+            
             # Status breakdown
             status_breakdown = dict(submissions.values_list('status').annotate(count=Count('id')))
             
@@ -242,6 +255,7 @@ class ContactSubmissionViewSet(viewsets.ModelViewSet):
                 'high_priority_leads': high_priority_leads,
                 'needs_follow_up': needs_follow_up,
                 'avg_lead_score': round(avg_lead_score, 1),
+                'suppressed_duplicates': suppressed_duplicates,
                 'status_breakdown': status_breakdown,
                 'subject_breakdown': subject_breakdown,
                 'industry_breakdown': industry_breakdown,
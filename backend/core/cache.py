@@ -0,0 +1,31 @@
+"""
+Version counters for invalidating groups of cached values.
+
+Cached payloads are stored under keys that include a version read from the
+shared cache; bumping the version retires all of them at once without
+having to know their keys. Versions are ``time.time_ns()`` values, so a
+version started after a key expired is still newer than any before it.
+
+Versions are kept for ``CACHE_VERSION_TIMEOUT`` seconds (forever with a
+shared cache). With the per-process fallback cache that bounds how long
+other processes keep using a version after it was bumped.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def cache_version(key):
+    """Return the current version stored under ``key``, starting one if none is set."""
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=settings.CACHE_VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_cache_version(key):
+    """Replace the version stored under ``key``, retiring everything cached under the old one."""
+    cache.set(key, time.time_ns(), timeout=settings.CACHE_VERSION_TIMEOUT)
@@ -0,0 +1,166 @@
+"""
+Duplicate detection for public form submissions.
+
+A submission's fingerprint is a SHA-256 of its normalized email and content.
+A submission repeats an earlier one when a record with the same fingerprint
+was stored less than the window ago; repeats are folded into that record
+instead of creating new rows. The lookup and insert run under a
+transaction-level advisory lock on the fingerprint, so two processes
+accepting the same submission at once cannot both insert it, wherever the
+two fall in time. Other databases (SQLite in development) have no advisory
+locks; there a process-wide lock only keeps threads of one process apart.
+Each process keeps an LRU of recent fingerprints in front
+of the database, so repeats it has seen fold straight into the known record
+by primary key.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .leads import normalize_email
+
+
+def normalize_text(value):
+    """Collapse whitespace and case so trivial edits still match."""
+    return ' '.join(str(value or '').split()).lower()
+
+
+class RecentFingerprints:
+    """Thread-safe LRU of fingerprints seen in the last window and the records they belong to."""
+
+    def __init__(self, window_seconds, lru_size=10000):
+        self.window_seconds = window_seconds
+        self.lru_size = lru_size
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()
+
+    def get(self, fingerprint, now):
+        """Return the primary key recorded for a fingerprint still inside the window."""
+        with self._lock:
+            entry = self._lru.get(fingerprint)
+            if entry is None:
+                return None
+            pk, first_seen = entry
+            if (now - first_seen).total_seconds() >= self.window_seconds:
+                del self._lru[fingerprint]
+                return None
+            self._lru.move_to_end(fingerprint)
+            return pk
+
+    def add(self, fingerprint, pk, first_seen):
+        """Remember a fingerprint and the record it belongs to."""
+        with self._lock:
+            self._lru[fingerprint] = (pk, first_seen)
+            self._lru.move_to_end(fingerprint)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def discard(self, fingerprint):
+        """Forget a fingerprint whose record is gone."""
+        with self._lock:
+            self._lru.pop(fingerprint, None)
+
+    def clear(self):
+        """Forget everything, e.g. between tests."""
+        with self._lock:
+            self._lru.clear()
+
+
+class SubmissionDeduplicator:
+    """Create submissions, folding repeats within the window into the first record."""
+
+    def __init__(self, model, fields, timestamp_field, window_seconds=None):
+        self.model = model
+        self.fields = fields
+        self.timestamp_field = timestamp_field
+        self.window_seconds = window_seconds or settings.SUBMISSION_DEDUP_WINDOW
+        self.recent = RecentFingerprints(self.window_seconds)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.counters = {'created': 0, 'suppressed': 0, 'cache_hits': 0, 'index_lookups': 0}
+
+    def fingerprint(self, instance):
+        """Return the content fingerprint of an unsaved submission."""
+        parts = [normalize_email(instance.email)]
+        parts.extend(normalize_text(getattr(instance, field)) for field in self.fields)
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    @contextmanager
+    def _locked(self, fingerprint):
+        """Run the lookup and insert for a fingerprint in a transaction no one else can enter."""
+        if connection.vendor != 'postgresql':
+            with self._save_lock, transaction.atomic():
+                yield
+            return
+        with transaction.atomic():
+            # Signed 64-bit key taken from the (uniform) fingerprint
+            key = int(fingerprint[:16], 16) - (1 << 63)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [key])
+            yield
+
+    def _find(self, fingerprint, now):
+        self._count('index_lookups')
+        return self.model.objects.filter(
+            fingerprint=fingerprint,
+            **{f'{self.timestamp_field}__gt': now - timedelta(seconds=self.window_seconds)}
+        ).order_by(self.timestamp_field).values_list('pk', self.timestamp_field).first()
+
+    def _fold(self, pk, now):
+        folded = self.model.objects.filter(pk=pk).update(
+            duplicate_count=F('duplicate_count') + 1,
+            last_duplicate_at=now,
+        )
+        if not folded:
+            return None
+        self._count('suppressed')
+        return self.model.objects.get(pk=pk)
+
+    def save(self, instance, **save_kwargs):
+        """
+        Save ``instance`` unless it repeats a recent submission.
+
+        Returns ``(submission, created)``; when ``created`` is False the
+        returned submission is the existing record the repeat was folded into.
+        """
+        now = timezone.now()
+        fingerprint = self.fingerprint(instance)
+        instance.fingerprint = fingerprint
+
+        existing_pk = self.recent.get(fingerprint, now)
+        if existing_pk is not None:
+            self._count('cache_hits')
+            existing = self._fold(existing_pk, now)
+            if existing is not None:
+                return existing, False
+            # Deleted since; look again below
+            self.recent.discard(fingerprint)
+
+        with self._locked(fingerprint):
+            found = self._find(fingerprint, now)
+            if found is not None:
+                existing_pk, first_seen = found
+                existing = self._fold(existing_pk, now)
+                self.recent.add(fingerprint, existing_pk, first_seen)
+                return existing, False
+            instance.save(**save_kwargs)
+
+        self._count('created')
+        self.recent.add(fingerprint, instance.pk, getattr(instance, self.timestamp_field) or now)
+        return instance, True
+
+    def stats(self):
+        """Return this process's dedup counters."""
+        with self._lock:
+            return dict(self.counters)
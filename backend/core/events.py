@@ -0,0 +1,249 @@
+"""
+Batched ingestion of engagement events (views, downloads).
+
+Recording an event used to cost an INSERT plus a full-row save of the
+counted object. An ``EventBuffer`` instead:
+
+- drops requests from crawlers and other automated user agents;
+- drops repeats of the same event by the same visitor within a window, using
+  one atomic ``cache.add`` per event so all processes share the filter;
+- keeps accepted rows in memory and writes them with one ``bulk_create``
+  once ``EVENT_BATCH_SIZE`` rows are waiting or ``EVENT_FLUSH_INTERVAL``
+  seconds have passed;
+- coalesces the counter increments of a batch into a single ``F()`` UPDATE
+  rather than one full-row save per event;
+- optionally folds the batch's visitors into the daily unique-visitor
+  sketches of ``core.sketches`` in the same transaction.
+
+If the database rejects a batch because of a bad row (a value the column
+type refuses, a target deleted meanwhile), the batch is retried one row at a
+time so only the offending rows are dropped.
+
+Buffered events are lost if a process dies before flushing; buffers are
+flushed on interpreter exit and the flush interval bounds the exposure.
+"""
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_ipv46_address
+from django.db import DataError, IntegrityError, connection, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .sketches import record_visitors
+
+logger = logging.getLogger(__name__)
+
+BOT_USER_AGENT_RE = re.compile(
+    r'bot|crawl|spider|slurp|scrapy|curl|wget|python-requests|httpx|aiohttp|go-http-client|'
+    r'java/|okhttp|headless|phantomjs|lighthouse|pingdom|uptime|monitor|preview|facebookexternalhit|'
+    r'whatsapp|embedly|quora link',
+    re.IGNORECASE
+)
+
+# Errors caused by a bad row rather than the database; psycopg 3 raises
+# ValueError when it cannot adapt a value (an invalid inet) to its column
+ROW_ERRORS = (DataError, IntegrityError, ValueError)
+
+_buffers = []
+
+
+def is_bot(user_agent):
+    """Return True for user agents of crawlers, link previewers and scripts."""
+    return bool(user_agent) and BOT_USER_AGENT_RE.search(user_agent) is not None
+
+
+def clean_ip(value):
+    """Return ``value`` if it is an IPv4 or IPv6 address, else None (e.g. ``X-Forwarded-For: unknown``)."""
+    value = (value or '').strip()
+    try:
+        validate_ipv46_address(value)
+    except ValidationError:
+        return None
+    return value
+
+
+class EventBuffer:
+    """Filter, batch and persist events for one event model and its counter."""
+
+    def __init__(self, name, model, target_field, counter_field, dedup_window,
+                 batch_size=None, flush_interval=None, sketch_event=None):
+        self.name = name
+        self.model = model
+        self.target_field = target_field
+        self.counter_field = counter_field
+        self.dedup_window = dedup_window
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self.sketch_event = sketch_event
+        self.target_model = model._meta.get_field(target_field).related_model
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._rows = []
+        self._visits = []
+        self._pending = Counter()
+        self._first_buffered_at = None
+        self._timer = None
+        self.counters = Counter()
+        _buffers.append(self)
+
+    @property
+    def batch_size(self):
+        return self._batch_size or settings.EVENT_BATCH_SIZE
+
+    @property
+    def flush_interval(self):
+        return self._flush_interval if self._flush_interval is not None else settings.EVENT_FLUSH_INTERVAL
+
+    def _visitor_key(self, target_id, visitor):
+        digest = hashlib.sha1(str(visitor).encode('utf-8')).hexdigest()
+        return f'events:{self.name}:{target_id}:{digest}'
+
+    def _is_duplicate(self, target_id, visitor):
+        if not self.dedup_window:
+            return False
+        try:
+            return not cache.add(self._visitor_key(target_id, visitor), 1, timeout=self.dedup_window)
+        except Exception as e:
+            logger.warning('Event dedup cache unavailable, accepting event: %s', e)
+            return False
+
+    def record(self, instance, visitor):
+        """
+        Queue an unsaved event row.
+
+        ``visitor`` identifies who caused the event (user id, or IP and user
+        agent) for duplicate filtering. Returns True if the event was
+        accepted, False if it was dropped as a bot or a repeat.
+        """
+        target_id = getattr(instance, f'{self.target_field}_id')
+        if is_bot(getattr(instance, 'user_agent', '')):
+            self._count('bots')
+            return False
+        if self._is_duplicate(target_id, visitor):
+            self._count('duplicates')
+            return False
+
+        with self._lock:
+            self.counters['accepted'] += 1
+            self._rows.append(instance)
+            if self.sketch_event:
+                self._visits.append((target_id, timezone.localdate(), visitor))
+            self._pending[target_id] += 1
+            if self._first_buffered_at is None:
+                self._first_buffered_at = time.monotonic()
+            due = (
+                len(self._rows) >= self.batch_size
+                or time.monotonic() - self._first_buffered_at >= self.flush_interval
+            )
+            if not due and self._timer is None and self.flush_interval:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if due:
+            self.flush()
+        return True
+
+    def pending_count(self, target_id):
+        """Return accepted events for ``target_id`` not yet written to the database."""
+        with self._lock:
+            return self._pending.get(target_id, 0)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own connection; don't leak it.
+            connection.close()
+
+    def flush(self):
+        """Write buffered events and their counter increments. Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                visits, self._visits = self._visits, []
+                self._pending = Counter()
+                self._first_buffered_at = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not rows:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                self._write(rows, visits)
+                written = len(rows)
+            except ROW_ERRORS as e:
+                logger.warning(
+                    'Batch of %d %s event(s) rejected (%s), writing them one by one', len(rows), self.name, e
+                )
+                written = self._write_each(rows, visits)
+            except Exception:
+                logger.exception('Failed to flush %d %s event(s)', len(rows), self.name)
+                self._count('dropped', len(rows))
+                return 0
+
+            with self._lock:
+                self.counters['flushed'] += written
+                self.counters['flushes'] += 1
+                self.counters['flush_ms'] += round((time.perf_counter() - started) * 1000, 3)
+            return written
+
+    def _write(self, rows, visits):
+        """Insert ``rows``, add them to their targets' counters and record ``visits``, atomically."""
+        pending = Counter(getattr(row, f'{self.target_field}_id') for row in rows)
+        # One UPDATE adds each target's share of the batch to its counter.
+        increment = Case(
+            *[When(pk=target_id, then=Value(delta)) for target_id, delta in pending.items()],
+            default=Value(0)
+        )
+        with transaction.atomic():
+            self.model.objects.bulk_create(rows, batch_size=self.batch_size)
+            self.target_model.objects.filter(pk__in=list(pending)).update(
+                **{self.counter_field: F(self.counter_field) + increment}
+            )
+            if visits:
+                record_visitors(self.sketch_event, visits)
+
+    def _write_each(self, rows, visits):
+        """Write ``rows`` one at a time, dropping those the database rejects. Returns rows written."""
+        # ``visits`` is either empty or parallel to ``rows``
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                self._write([row], visits[index:index + 1])
+            except ROW_ERRORS:
+                logger.exception('Dropped %s event for %s', self.name, getattr(row, f'{self.target_field}_id'))
+                self._count('dropped')
+            else:
+                written += 1
+        return written
+
+    def stats(self):
+        """Return this process's counters and the number of buffered events."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['buffered'] = len(self._rows)
+        return stats
+
+
+def flush_all():
+    """Flush every event buffer in this process."""
+    return sum(buffer.flush() for buffer in _buffers)
+
+
+atexit.register(flush_all)
@@ -0,0 +1,35 @@
+"""
+Shared serializer fields.
+"""
+from rest_framework import serializers
+
+from .s3 import file_download_url
+from .thumbnails import thumbnail_url
+
+
+class DownloadFileField(serializers.FileField):
+    """
+    File field that represents S3 files with a cached presigned URL.
+
+    Files in other storages are rendered exactly like ``FileField``.
+    """
+
+    def to_representation(self, value):
+        if value and getattr(value.storage, 'bucket_name', None):
+            return file_download_url(value)
+        return super().to_representation(value)
+
+
+class ThumbnailURLField(serializers.ReadOnlyField):
+    """
+    URL of a cached, resized derivative of an image field.
+
+    ``spec`` names one of ``core.thumbnails.SPECS``; null without an image.
+    """
+
+    def __init__(self, spec, **kwargs):
+        self.spec = spec
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return thumbnail_url(value, self.spec)
@@ -0,0 +1,208 @@
+"""
+File delivery with conditional requests, byte ranges and proxy offload.
+
+Files are streamed with ``FileResponse`` so WSGI servers that provide
+``wsgi.file_wrapper`` (gunicorn) hand the descriptor to ``sendfile()``
+instead of copying it through Python. Partial responses keep that
+property: the file is positioned at the start of the range and the
+response length bounds the transfer.
+
+With ``FILE_DELIVERY_ACCEL_REDIRECT`` enabled, files under one of
+``FILE_DELIVERY_ACCEL_LOCATIONS`` are handed to a fronting nginx with
+``X-Accel-Redirect``, which then takes care of ranges and caching, e.g.::
+
+    location /protected/media/ {
+        internal;
+        alias /app/media/;
+    }
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from .s3 import file_download_url
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+class DeliveryFileResponse(FileResponse):
+    """FileResponse with larger blocks for servers without sendfile."""
+
+    block_size = 256 * 1024
+
+
+class RangeFile:
+    """Read-only window of ``length`` bytes of an open file, starting at ``start``."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        # Lets sendfile() start from the current offset; Content-Length bounds it.
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def make_etag(stat):
+    """Return a strong ETag derived from file size and modification time."""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Parse a single ``bytes=`` range into inclusive ``(start, end)`` offsets.
+
+    Returns None when the header should be ignored (malformed or multiple
+    ranges) and raises RangeNotSatisfiable when no byte of it exists.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request, etag, last_modified):
+    """Return True if a Range request may be honoured under its If-Range condition."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        # If-Range requires a strong comparison
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def accel_redirect_path(path):
+    """Return the internal proxy URL for ``path``, or None if it is not exposed."""
+    real_path = os.path.realpath(path)
+    for root, prefix in settings.FILE_DELIVERY_ACCEL_LOCATIONS.items():
+        root = os.path.realpath(root)
+        if real_path.startswith(root + os.sep):
+            return prefix.rstrip('/') + '/' + os.path.relpath(real_path, root).replace(os.sep, '/')
+    return None
+
+
+def serve_file(request, path, filename=None, as_attachment=True, content_type=None):
+    """Serve a local file with ETag/Last-Modified validation and single-range support."""
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('File not found')
+
+    filename = filename or os.path.basename(path)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    etag = make_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        if not_modified.status_code == 304:
+            not_modified['ETag'] = etag
+        return not_modified
+
+    if settings.FILE_DELIVERY_ACCEL_REDIRECT:
+        accel_path = accel_redirect_path(path)
+        if accel_path:
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = accel_path
+            response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+            return response
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and request.method in ('GET', 'HEAD') and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+    file = open(path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        response = DeliveryFileResponse(
+            RangeFile(file, start, end - start + 1),
+            status=206,
+            as_attachment=as_attachment,
+            filename=filename,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        response = DeliveryFileResponse(
+            file,
+            as_attachment=as_attachment,
+            filename=filename,
+            content_type=content_type
+        )
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def serve_field_file(request, field_file, filename=None, as_attachment=True):
+    """
+    Serve a model file: S3 files redirect to a presigned URL, local files stream.
+
+    Files in other storages that have no local path are streamed from the
+    storage, without ranges or conditional requests.
+    """
+    if not field_file:
+        raise Http404('No file attached')
+
+    if getattr(field_file.storage, 'bucket_name', None):
+        return HttpResponseRedirect(file_download_url(field_file))
+
+    filename = filename or os.path.basename(field_file.name)
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        try:
+            file = field_file.storage.open(field_file.name, 'rb')
+        except FileNotFoundError:
+            raise Http404('File not found')
+        return DeliveryFileResponse(file, as_attachment=as_attachment, filename=filename)
+
+    return serve_file(request, path, filename=filename, as_attachment=as_attachment)
@@ -0,0 +1,239 @@
+"""
+Responsive image variants for uploaded images.
+
+``store_upload()`` checks an upload with Pillow and streams the original to
+storage unchanged, with a manifest of its dimensions, a tiny blurred
+placeholder as a data URI and a ``srcset`` of the original alone, marked
+``pending``. ``generate_variants()`` then writes resized copies at
+``IMAGE_VARIANT_WIDTHS`` in each of ``IMAGE_VARIANT_FORMATS`` that this
+Pillow build can encode (WebP, AVIF) plus a JPEG or PNG fallback, and
+rewrites the manifest with a ready ``srcset`` per MIME type. Upload views
+run it as the ``images.generate_variants`` job (``core.tasks``), so requests
+do not wait for the encoders; ``process_upload()`` does both in turn.
+
+Variants are encoded on a shared thread pool of ``IMAGE_PIPELINE_WORKERS``
+threads; Pillow releases the GIL while resizing and encoding, so the widths
+are processed in parallel. Files are stored next to each other::
+
+    blog_images/<uuid>/original.jpg
+    blog_images/<uuid>/640w.webp
+    blog_images/<uuid>/manifest.json
+"""
+import base64
+import io
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError, features
+
+# Pillow format -> (MIME type, extension) accepted for uploads
+UPLOAD_FORMATS = {
+    'JPEG': ('image/jpeg', 'jpg'),
+    'PNG': ('image/png', 'png'),
+    'GIF': ('image/gif', 'gif'),
+    'WEBP': ('image/webp', 'webp'),
+}
+
+# Variant format -> (Pillow format, MIME type, extension, encoder options)
+VARIANT_FORMATS = {
+    'avif': ('AVIF', 'image/avif', 'avif', {'quality': 55, 'speed': 8}),
+    'webp': ('WEBP', 'image/webp', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', 'image/png', 'png', {'optimize': True}),
+}
+
+PLACEHOLDER_SIZE = 16
+MANIFEST_NAME = 'manifest.json'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class InvalidImage(ValueError):
+    """The upload is not an image this pipeline accepts."""
+
+
+def get_pool():
+    """Return the process-wide pool variants are encoded on."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.IMAGE_PIPELINE_WORKERS, thread_name_prefix='image-worker'
+                )
+    return _pool
+
+
+def variant_formats(has_alpha=False):
+    """Formats to encode variants in: the configured modern formats Pillow supports, then a fallback."""
+    formats = [name for name in settings.IMAGE_VARIANT_FORMATS if name in VARIANT_FORMATS and features.check(name)]
+    return formats + ['png' if has_alpha else 'jpeg']
+
+
+def open_upload(file):
+    """Open and check an uploaded image without decoding its pixels."""
+    try:
+        image = Image.open(file)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise InvalidImage('The file is not a valid image.') from None
+    if image.format not in UPLOAD_FORMATS:
+        raise InvalidImage('Invalid file type. Only JPEG, PNG, GIF, and WebP are allowed.')
+    if image.width * image.height > settings.IMAGE_MAX_PIXELS:
+        raise InvalidImage(f'Image is too large. Maximum is {settings.IMAGE_MAX_PIXELS} pixels.')
+    return image
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def encode(image, variant_format):
+    """Encode ``image`` in ``variant_format`` and return the bytes."""
+    pillow_format, _, _, options = VARIANT_FORMATS[variant_format]
+    if pillow_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def placeholder(image):
+    """Return a tiny blurred copy of ``image`` as a data URI."""
+    small = image.copy()
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    small = small.convert('RGBA' if _has_alpha(image) else 'RGB').filter(ImageFilter.GaussianBlur(1))
+    variant_format = 'webp' if features.check('webp') else 'png'
+    mime_type = VARIANT_FORMATS[variant_format][1]
+    return f'data:{mime_type};base64,{base64.b64encode(encode(small, variant_format)).decode("ascii")}'
+
+
+def _normalize(image):
+    """Apply the EXIF orientation and convert to RGB, or RGBA if the image has transparency."""
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+    if image.mode == 'RGBA' and image.getchannel('A').getextrema()[0] == 255:
+        # Fully opaque: no need for a PNG fallback
+        image = image.convert('RGB')
+    return image
+
+
+def _save(storage, name, content):
+    # Replace rather than let the storage pick another name, so retries are idempotent
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, content)
+
+
+def _write_width(image, width, formats, directory, storage):
+    """Resize ``image`` to ``width`` and store it in every format; runs on the pool."""
+    height = max(1, round(image.height * width / image.width))
+    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+    variants = []
+    for variant_format in formats:
+        _, mime_type, extension, _ = VARIANT_FORMATS[variant_format]
+        content = encode(resized, variant_format)
+        name = _save(storage, f'{directory}/{width}w.{extension}', ContentFile(content))
+        variants.append({
+            'url': storage.url(name),
+            'width': width,
+            'height': height,
+            'type': mime_type,
+            'size': len(content),
+        })
+    return variants
+
+
+def _write_manifest(storage, directory, manifest):
+    _save(storage, f'{directory}/{MANIFEST_NAME}', ContentFile(json.dumps(manifest).encode('utf-8')))
+
+
+def read_manifest(directory, storage=None):
+    """Return the stored manifest of the upload in ``directory``."""
+    storage = storage or default_storage
+    with storage.open(f'{directory}/{MANIFEST_NAME}', 'rb') as handle:
+        return json.loads(handle.read())
+
+
+def store_upload(file, prefix, storage=None):
+    """
+    Store an uploaded image and return its manifest, with no variants yet.
+
+    ``manifest['pending']`` is True when ``generate_variants()`` has
+    variants to add (animated GIFs keep their animation, so only the
+    original is served). Raises ``InvalidImage`` if the upload is not an
+    accepted image.
+    """
+    storage = storage or default_storage
+    image = open_upload(file)
+    source_type, extension = UPLOAD_FORMATS[image.format]
+    animated = getattr(image, 'is_animated', False)
+    image.load()
+
+    # Store the original as uploaded; storages copy it across in chunks
+    directory = f'{prefix}/{uuid.uuid4()}'
+    file.seek(0)
+    original_name = storage.save(f'{directory}/original.{extension}', file)
+    original_url = storage.url(original_name)
+
+    image = _normalize(image)
+    manifest = {
+        'directory': directory,
+        'original': {
+            'url': original_url,
+            'name': original_name,
+            'type': source_type,
+            'size': storage.size(original_name),
+        },
+        'width': image.width,
+        'height': image.height,
+        'placeholder': placeholder(image),
+        'variants': [],
+        'srcset': {source_type: f'{original_url} {image.width}w'},
+        'pending': not animated,
+    }
+    _write_manifest(storage, directory, manifest)
+    return manifest
+
+
+def generate_variants(directory, storage=None, pool=None):
+    """Write the resized variants of the upload in ``directory``, update its manifest and return it."""
+    storage = storage or default_storage
+    pool = pool or get_pool()
+    manifest = read_manifest(directory, storage)
+    if not manifest.get('pending'):
+        return manifest
+
+    with storage.open(manifest['original']['name'], 'rb') as source:
+        image = Image.open(source)
+        image.load()
+    image = _normalize(image)
+
+    formats = variant_formats(image.mode == 'RGBA')
+    widths = sorted({min(width, image.width) for width in settings.IMAGE_VARIANT_WIDTHS})
+    futures = [pool.submit(_write_width, image, width, formats, directory, storage) for width in widths]
+    variants = [variant for future in futures for variant in future.result()]
+
+    srcset = {}
+    for variant in variants:
+        entry = f"{variant['url']} {variant['width']}w"
+        srcset[variant['type']] = f"{srcset[variant['type']]}, {entry}" if variant['type'] in srcset else entry
+    manifest.update(variants=variants, srcset=srcset, pending=False)
+    _write_manifest(storage, directory, manifest)
+    return manifest
+
+
+def process_upload(file, prefix, storage=None, pool=None):
+    """
+    Store an uploaded image with its responsive variants and return their manifest.
+
+    Raises ``InvalidImage`` if the upload is not an accepted image.
+    """
+    manifest = store_upload(file, prefix, storage)
+    return generate_variants(manifest['directory'], storage, pool)
@@ -0,0 +1,60 @@
+"""
+Shared processing steps for inbound lead submissions.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+
+# Source inferred from utm_medium when a submission only says it came from the website.
+SOURCE_BY_UTM_MEDIUM = {
+    'email': 'email',
+    'newsletter': 'email',
+    'social': 'social-media',
+    'social-media': 'social-media',
+    'cpc': 'search',
+    'ppc': 'search',
+    'organic': 'search',
+    'referral': 'referral',
+}
+
+
+def normalize_email(email):
+    """Return the canonical form of an email address."""
+    return (email or '').strip().lower()
+
+
+def enrich_submission(submission):
+    """Normalize contact details and infer the lead source from UTM parameters."""
+    submission.name = ' '.join(submission.name.split())
+    submission.email = normalize_email(submission.email)
+    submission.company = submission.company.strip()
+
+    medium = submission.utm_medium.strip().lower()
+    if submission.source == 'website' and medium in SOURCE_BY_UTM_MEDIUM:
+        submission.source = SOURCE_BY_UTM_MEDIUM[medium]
+
+
+def notification_recipients():
+    """Return the addresses that receive new lead notifications."""
+    return [address for address in settings.LEAD_NOTIFICATION_EMAILS if address]
+
+
+def send_lead_notification(submission, label):
+    """Email the sales inbox about a processed submission."""
+    recipients = notification_recipients()
+    if not recipients:
+        return 0
+
+    lines = [
+        f'Name: {submission.name}',
+        f'Email: {submission.email}',
+        f'Company: {submission.company or "-"}',
+        f'Source: {submission.source}',
+        f'Lead score: {submission.lead_score}',
+        f'Status: {submission.status}',
+    ]
+    return send_mail(
+        subject=f'New {label}: {submission.name} (score {submission.lead_score})',
+        message='\n'.join(lines),
+        from_email=None,
+        recipient_list=recipients,
+    )
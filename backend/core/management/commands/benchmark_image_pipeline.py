@@ -0,0 +1,76 @@
+"""
+Management command to benchmark the image upload pipeline on a batch of images.
+"""
+import io
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from core.images import process_upload, variant_formats
+
+
+class Command(BaseCommand):
+    help = 'Benchmark processing a batch of uploads into responsive variants with different pool sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--images',
+            type=int,
+            default=10,
+            help='Number of images in the batch (default: 10)'
+        )
+        parser.add_argument(
+            '--size',
+            default='2400x1600',
+            help='Dimensions of the generated JPEG images (default: 2400x1600)'
+        )
+        parser.add_argument(
+            '--workers',
+            default='1,2,4',
+            help='Comma separated pool sizes to compare (default: 1,2,4)'
+        )
+
+    def make_image(self, size, seed):
+        """A photo-like JPEG: a gradient with some noise, so it compresses realistically."""
+        gradient = Image.linear_gradient('L').resize(size).rotate(seed * 17 % 360)
+        noise = Image.effect_noise(size, 30 + seed % 20)
+        image = Image.merge('RGB', (gradient, noise, Image.blend(gradient, noise, 0.3)))
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=90)
+        return buffer.getvalue()
+
+    def handle(self, *args, **options):
+        size = tuple(int(part) for part in options['size'].lower().split('x'))
+        count = max(1, options['images'])
+        images = [self.make_image(size, seed) for seed in range(count)]
+        self.stdout.write(
+            f"{count} images of {size[0]}x{size[1]} ({sum(map(len, images)) / count / 1024:.0f} KB each), "
+            f"variant formats: {', '.join(variant_formats())}"
+        )
+
+        self.stdout.write(f"{'Workers':>7} {'Seconds':>9} {'Images/s':>9} {'Variants/s':>11} {'Output MB':>10}")
+        for workers in (int(value) for value in options['workers'].split(',')):
+            with tempfile.TemporaryDirectory() as directory, ThreadPoolExecutor(max_workers=workers) as pool:
+                storage = FileSystemStorage(location=directory)
+                started = time.perf_counter()
+                manifests = [
+                    process_upload(SimpleUploadedFile(f'{index}.jpg', content, 'image/jpeg'), 'bench', storage, pool)
+                    for index, content in enumerate(images)
+                ]
+                elapsed = time.perf_counter() - started
+
+            variants = sum(len(manifest['variants']) for manifest in manifests)
+            output = sum(variant['size'] for manifest in manifests for variant in manifest['variants'])
+            self.stdout.write(
+                f'{workers:>7} {elapsed:>9.2f} {count / elapsed:>9.2f} {variants / elapsed:>11.1f} '
+                f'{output / (1024 * 1024):>10.1f}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            'Each upload is processed in turn; its widths are resized and encoded in parallel on the pool.'
+        ))
@@ -0,0 +1,73 @@
+"""
+Management command to measure the per-request overhead of the rate limiter.
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.ratelimit import TokenBucketLimiter
+
+# Per-check budget the limiter is expected to stay under.
+BUDGET_MICROSECONDS = 1000
+
+
+class Command(BaseCommand):
+    help = 'Benchmark token bucket checks against the configured cache and the in-process fallback'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20000,
+            help='Number of checks per run (default: 20000)'
+        )
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=1000,
+            help='Number of distinct client IPs to spread checks over (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        clients = [f'198.51.{i // 256 % 256}.{i % 256}' for i in range(max(1, options['clients']))]
+
+        runs = [
+            ('shared cache', TokenBucketLimiter(key_prefix='ratelimit-benchmark')),
+            ('in-process fallback', TokenBucketLimiter(key_prefix='ratelimit-benchmark', use_cache=False)),
+        ]
+
+        self.stdout.write(
+            f"{'Backend':<22} {'Checks':>8} {'Mean us':>9} {'p50 us':>8} {'p99 us':>8} {'Max us':>8} {'Rejected':>9}"
+        )
+        over_budget = False
+        for label, bench_limiter in runs:
+            timings, rejected = self._run(bench_limiter, clients, iterations)
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            over_budget |= p99 > BUDGET_MICROSECONDS
+            self.stdout.write(
+                f"{label:<22} {len(timings):>8} {statistics.fmean(timings):>9.1f} "
+                f"{statistics.median(timings):>8.1f} {p99:>8.1f} {timings[-1]:>8.1f} {rejected:>9}"
+            )
+
+            for ip in clients:
+                bench_limiter.reset('benchmark', ip)
+
+        if over_budget:
+            self.stdout.write(self.style.WARNING(f'p99 exceeded the {BUDGET_MICROSECONDS} us budget.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'p99 within the {BUDGET_MICROSECONDS} us budget.'))
+
+    @staticmethod
+    def _run(bench_limiter, clients, iterations):
+        timings = []
+        rejected = 0
+        for i in range(iterations):
+            ip = clients[i % len(clients)]
+            started = time.perf_counter()
+            allowed, _ = bench_limiter.hit('benchmark', ip, 10, 60)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+            rejected += not allowed
+        return timings, rejected
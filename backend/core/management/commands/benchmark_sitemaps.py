@@ -0,0 +1,72 @@
+"""
+Management command to benchmark sitemap generation for large sites.
+"""
+import itertools
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.sitemaps import SECTIONS, SITEMAP_LIMIT, write_chunks, write_index
+
+
+class Command(BaseCommand):
+    help = 'Benchmark writing gzipped sitemaps for a large number of synthetic URLs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--urls',
+            type=int,
+            default=1000000,
+            help='Number of URLs to generate (default: 1000000)'
+        )
+
+    def handle(self, *args, **options):
+        total = max(1, options['urls'])
+        section = SECTIONS['blog']
+        now = timezone.now()
+
+        def rows(start=0, count=total):
+            for pk in range(start, start + count):
+                yield pk, f'benchmark-post-{pk}', now - timedelta(seconds=pk)
+
+        with tempfile.TemporaryDirectory() as directory:
+            storage = FileSystemStorage(location=directory)
+            names = (f'sitemap-blog-{number}.xml.gz' for number in itertools.count(1))
+
+            started = time.perf_counter()
+            chunks = write_chunks(storage, section, rows(), names)
+            write_index(storage, chunks)
+            full = time.perf_counter() - started
+            size = sum(storage.size(chunk['name']) for chunk in chunks)
+
+            # An incremental build rewrites only the file whose key range changed
+            def rewrite_one():
+                write_chunks(storage, section, rows(0, min(total, SITEMAP_LIMIT)), iter([chunks[0]['name']]))
+                write_index(storage, chunks)
+
+            started = time.perf_counter()
+            rewrite_one()
+            single = time.perf_counter() - started
+
+            tracemalloc.start()
+            rewrite_one()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.stdout.write(f"{'Scenario':<30} {'Files':>6} {'URLs':>9} {'Seconds':>9} {'URLs/s':>10}")
+        self.stdout.write(f"{'full build':<30} {len(chunks):>6} {total:>9} {full:>9.2f} {total / full:>10.0f}")
+        changed = min(total, SITEMAP_LIMIT)
+        self.stdout.write(f"{'one changed file':<30} {1:>6} {changed:>9} {single:>9.2f} {changed / single:>10.0f}")
+        self.stdout.write(
+            f'Compressed size: {size / (1024 * 1024):.1f} MB; '
+            f'peak memory while rewriting one file: {peak / 1024:.0f} KB'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Rows are synthetic; a real build adds one streamed query per rewritten file, '
+            'and sections with no changes cost a single aggregate query.'
+        ))
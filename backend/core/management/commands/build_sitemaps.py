@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the XML sitemaps.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite the sitemap files of content types that changed since the last build. '
+        'Cheap when nothing changed, so it can run every few minutes from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rewrite every sitemap file, e.g. after bulk updates that do not touch updated_at'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = build_sitemaps(full=options['full'])
+        if written is None:
+            raise CommandError('Another sitemap build is running')
+
+        for section, files in written.items():
+            self.stdout.write(f'{section}: {f"{files} file(s) written" if files else "unchanged"}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Sitemaps up to date in {time.perf_counter() - started:.2f}s'
+        ))
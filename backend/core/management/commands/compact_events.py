@@ -0,0 +1,59 @@
+"""
+Management command to maintain partitions and compact old engagement events.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.partitions import add_months, compact_events, ensure_partitions, event_models, is_partitioned, month_start
+
+
+class Command(BaseCommand):
+    help = (
+        'Create upcoming monthly partitions for engagement event tables, roll events older than '
+        'the retention period up into daily counts and drop them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retain-months',
+            type=int,
+            default=settings.EVENT_RETENTION_MONTHS,
+            help=f'Full months of raw events to keep besides the current one '
+                 f'(default: {settings.EVENT_RETENTION_MONTHS})'
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Monthly partitions to create ahead of the current month (default: 3)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be compacted without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = add_months(month_start(date.today()), -options['retain_months'])
+        self.stdout.write(f'Compacting raw events before {cutoff:%Y-%m-%d}')
+
+        for spec, model in event_models():
+            table = model._meta.db_table
+            if is_partitioned(table) and not options['dry_run']:
+                created = ensure_partitions(table, spec.time_field, months_ahead=options['months_ahead'])
+                for name in created:
+                    self.stdout.write(f'  created partition {name}')
+
+            summary = compact_events(spec, model, cutoff, dry_run=options['dry_run'])
+            dropped = summary['partitions_dropped']
+            verb = 'would drop' if options['dry_run'] else 'dropped'
+            self.stdout.write(
+                f"{table}: {verb} {len(dropped)} partition(s), {summary['rows_deleted']} row(s) "
+                f"outside partitions, wrote {summary['daily_rows']} daily count(s)"
+            )
+            for name in dropped:
+                self.stdout.write(f'  {name}')
+
+        self.stdout.write(self.style.SUCCESS('Event compaction complete.'))
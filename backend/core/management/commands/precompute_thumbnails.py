@@ -0,0 +1,31 @@
+"""
+Management command to create thumbnails for existing images.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.signals import THUMBNAIL_FIELDS
+from core.thumbnails import precompute
+
+
+class Command(BaseCommand):
+    help = 'Create the thumbnails every model image exposes, e.g. after a deploy or a cleared cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Re-create thumbnails that already exist'
+        )
+
+    def handle(self, *args, **options):
+        for model, fields in THUMBNAIL_FIELDS.items():
+            images = Q()
+            for field in fields:
+                images |= Q(**{f'{field}__isnull': False}) & ~Q(**{field: ''})
+            count = 0
+            for instance in model.objects.filter(images).iterator():
+                precompute(instance, fields, refresh=options['refresh'])
+                count += 1
+            self.stdout.write(f'{model._meta.label}: {count} instance(s)')
+        self.stdout.write(self.style.SUCCESS('Thumbnails up to date'))
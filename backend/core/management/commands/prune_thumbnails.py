@@ -0,0 +1,24 @@
+"""
+Management command to evict least recently used thumbnails.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.thumbnails import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete least recently used thumbnails until the cache is within its size cap'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-mb',
+            type=int,
+            default=None,
+            help=f'Size cap in MB (default: THUMBNAIL_CACHE_MAX_BYTES, {settings.THUMBNAIL_CACHE_MAX_BYTES // (1024 * 1024)})'
+        )
+
+    def handle(self, *args, **options):
+        max_bytes = options['max_mb'] * 1024 * 1024 if options['max_mb'] is not None else None
+        deleted = prune(max_bytes)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} thumbnail(s)'))
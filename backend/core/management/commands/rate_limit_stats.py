@@ -0,0 +1,21 @@
+"""
+Management command to show configured rate limits and rejection counts.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.ratelimit import limiter
+
+
+class Command(BaseCommand):
+    help = 'Show configured rate limits and how many requests each scope has rejected'
+
+    def handle(self, *args, **options):
+        scopes = sorted(settings.RATE_LIMITS)
+        rejections = limiter.rejection_counts(scopes)
+
+        status = 'enabled' if settings.RATE_LIMIT_ENABLED else 'disabled'
+        self.stdout.write(f'Rate limiting is {status}.')
+        self.stdout.write(f"{'Scope':<22} {'Rate':>10} {'Rejected':>10}")
+        for scope in scopes:
+            self.stdout.write(f'{scope:<22} {settings.RATE_LIMITS[scope]:>10} {rejections[scope]:>10}')
@@ -0,0 +1,65 @@
+# Generated by Django 5.0 on 2026-10-19 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyEventCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event", models.CharField(max_length=50)),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("day", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("unique_visitors", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Daily Event Count",
+                "verbose_name_plural": "Daily Event Counts",
+                "ordering": ["-day"],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserAgent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.TextField()),
+                ("value_hash", models.CharField(max_length=64, unique=True)),
+                ("first_seen_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "User Agent",
+                "verbose_name_plural": "User Agents",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyeventcount",
+            constraint=models.UniqueConstraint(
+                fields=("event", "object_id", "day"),
+                name="daily_event_count_unique_day",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_user_agent_daily_event_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="dailyeventcount",
+            name="object_id",
+            field=models.CharField(max_length=36),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-19 05:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_daily_event_count_object_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VisitorSketch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event", models.CharField(max_length=50)),
+                ("object_id", models.CharField(max_length=36)),
+                ("day", models.DateField()),
+                ("registers", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Visitor Sketch",
+                "verbose_name_plural": "Visitor Sketches",
+                "ordering": ["-day"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="visitorsketch",
+            constraint=models.UniqueConstraint(
+                fields=("event", "object_id", "day"), name="visitor_sketch_unique_day"
+            ),
+        ),
+    ]
@@ -1,6 +1,10 @@
 """
 Custom models for the core app.
 """
+import hashlib
+import threading
+from collections import OrderedDict
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
@@ -21,8 +25,146 @@ class User(AbstractUser):
         return self.username or self.email
 
 
+class UserAgent(models.Model):
+    """
+    Distinct user-agent strings.
+    
+    Event rows reference these instead of repeating the full header text;
+    ``intern`` maps a string to its id through a per-process LRU.
+    """
+    value = models.TextField()
+    value_hash = models.CharField(max_length=64, unique=True)
+    first_seen_at = models.DateTimeField(auto_now_add=True)
+    
+    CACHE_SIZE = 5000
+    _ids = OrderedDict()
+    _values = OrderedDict()
+    _lock = threading.Lock()
+    
+    class Meta:
+        verbose_name = 'User Agent'
+        verbose_name_plural = 'User Agents'
+    
+    def __str__(self):
+        return self.value[:100]
+    
+    @staticmethod
+    def hash_value(value):
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def _remember(cls, value, pk):
+        with cls._lock:
+            cls._ids[value] = pk
+            cls._ids.move_to_end(value)
+            cls._values[pk] = value
+            cls._values.move_to_end(pk)
+            while len(cls._ids) > cls.CACHE_SIZE:
+                cls._ids.popitem(last=False)
+            while len(cls._values) > cls.CACHE_SIZE:
+                cls._values.popitem(last=False)
+    
+    @classmethod
+    def intern(cls, value):
+        """Return the id for ``value``, creating the row on first sight; None for blank."""
+        if not value:
+            return None
+        with cls._lock:
+            pk = cls._ids.get(value)
+        if pk is None:
+            pk = cls.objects.get_or_create(
+                value_hash=cls.hash_value(value),
+                defaults={'value': value}
+            )[0].pk
+        cls._remember(value, pk)
+        return pk
+    
+    @classmethod
+    def lookup(cls, pk):
+        """Return the string for an id, or None if it is not cached."""
+        with cls._lock:
+            return cls._values.get(pk)
+    
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._ids.clear()
+            cls._values.clear()
+
 
+class UserAgentMixin(models.Model):
+    """
+    Stores ``user_agent`` as a reference to an interned ``UserAgent``.
+    
+    ``user_agent`` stays readable and writable as a plain string, including
+    as a constructor/``objects.create()`` keyword.
+    """
+    user_agent_ref = models.ForeignKey(
+        UserAgent,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='user agent'
+    )
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def user_agent(self):
+        value = self.__dict__.get('_user_agent')
+        if value is not None:
+            return value
+        if self.user_agent_ref_id is None:
+            return ''
+        value = UserAgent.lookup(self.user_agent_ref_id)
+        if value is None:
+            value = self.user_agent_ref.value
+        self._user_agent = value
+        return value
+    
+    @user_agent.setter
+    def user_agent(self, value):
+        self._user_agent = value or ''
+        self.user_agent_ref_id = UserAgent.intern(value)
 
 
+class DailyEventCount(models.Model):
+    """Per-day totals of raw engagement events that have been compacted away."""
+    event = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=36)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    unique_visitors = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-day']
+        verbose_name = 'Daily Event Count'
+        verbose_name_plural = 'Daily Event Counts'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'object_id', 'day'], name='daily_event_count_unique_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event} #{self.object_id} on {self.day}: {self.count}"
 
 
+class VisitorSketch(models.Model):
+    """HyperLogLog sketch of the distinct visitors of one object (or all, ``'*'``) on one day."""
+    event = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=36)
+    day = models.DateField()
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-day']
+        verbose_name = 'Visitor Sketch'
+        verbose_name_plural = 'Visitor Sketches'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'object_id', 'day'], name='visitor_sketch_unique_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event} #{self.object_id} on {self.day}"
@@ -0,0 +1,110 @@
+"""
+Index-backed ordering for public list endpoints.
+
+A view lists the orderings clients may ask for in ``ordering_plans``,
+mapping each ``?ordering=`` value to the full ``order_by`` it runs::
+
+    ordering_plans = {
+        'order': ('order', '-created_at'),
+        '-created_at': ('-created_at',),
+    }
+    ordering = 'order'
+
+Every plan must be served by an index: one of the model's ``Meta.indexes``
+whose fields are exactly the plan or the plan reversed (PostgreSQL scans
+an index backwards), or for a single field, that field's own unique or
+``db_index`` index. This is checked the first time the view is used, so
+an ordering cannot be exposed without its index. Any other value is
+rejected with a 400 rather than sorting on an unindexed or related field.
+
+With ``DEBUG`` on, responses carry the chosen plan in ``X-Ordering-Plan``.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+OrderingPlan = namedtuple('OrderingPlan', ['key', 'fields', 'index'])
+
+PLAN_HEADER = 'X-Ordering-Plan'
+
+
+def _reverse(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def find_index(model, fields):
+    """Return the name of an index of ``model`` that can serve ``order_by(*fields)``, or None."""
+    fields = list(fields)
+    reversed_fields = [_reverse(field) for field in fields]
+    for index in model._meta.indexes:
+        if list(index.fields) in (fields, reversed_fields):
+            return index.name
+    if len(fields) == 1:
+        field = model._meta.get_field(fields[0].lstrip('-'))
+        if field.primary_key or field.unique or field.db_index:
+            return f'{field.column} column index'
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_plans(view_class, model):
+    """Resolve ``view_class.ordering_plans`` to ``{key: OrderingPlan}``, checking every index."""
+    plans = {}
+    for key, fields in view_class.ordering_plans.items():
+        index = find_index(model, fields)
+        if index is None:
+            raise ImproperlyConfigured(
+                f'{view_class.__name__} orders by {", ".join(fields)} but no index on '
+                f'{model._meta.label} covers it'
+            )
+        plans[key] = OrderingPlan(key, tuple(fields), index)
+    if view_class.ordering not in plans:
+        raise ImproperlyConfigured(f'{view_class.__name__}.ordering must be one of its ordering_plans')
+    return plans
+
+
+class IndexedOrderingFilter(BaseFilterBackend):
+    """Apply one of the view's index-backed ``ordering_plans``."""
+
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def get_plan(self, request, queryset, view):
+        plans = get_plans(type(view), queryset.model)
+        key = request.query_params.get(self.ordering_param, '').strip() or view.ordering
+        if key not in plans:
+            raise ValidationError({
+                self.ordering_param: f"Unsupported ordering '{key}'. Choose one of: {', '.join(plans)}"
+            })
+        return plans[key]
+
+    def filter_queryset(self, request, queryset, view):
+        plan = self.get_plan(request, queryset, view)
+        view.ordering_plan = plan
+        return queryset.order_by(*plan.fields)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.ordering_param,
+            'required': False,
+            'in': 'query',
+            'description': f"One of: {', '.join(view.ordering_plans)} (default: {view.ordering})",
+            'schema': {'type': 'string', 'enum': list(view.ordering_plans)},
+        }]
+
+
+class OrderingPlanHeaderMixin:
+    """Report the ordering plan used by ``IndexedOrderingFilter`` when ``DEBUG`` is on."""
+
+    ordering_plan = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if settings.DEBUG and self.ordering_plan is not None:
+            plan = self.ordering_plan
+            response[PLAN_HEADER] = f"{plan.key}; order_by={','.join(plan.fields)}; index={plan.index}"
+        return response
@@ -0,0 +1,362 @@
+"""
+Monthly range partitioning and retention for raw engagement event tables.
+
+On PostgreSQL the event tables are declared ``PARTITION BY RANGE`` on their
+timestamp, with one ``<table>_pYYYYMM`` partition per month and a
+``<table>_default`` partition catching anything outside them. Expiring a
+month is then a ``DROP TABLE`` of its partition instead of a large DELETE,
+and time-range queries only scan the partitions they touch.
+
+Before a month is dropped its rows are rolled up into ``DailyEventCount``
+(events and distinct visitors per object per day). On other databases the
+same roll-up runs and expired rows are deleted instead.
+"""
+from collections import namedtuple
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import CharField, Count, Value
+from django.db.models.functions import Cast, Coalesce, TruncDate
+
+EventTable = namedtuple('EventTable', ['event', 'model_label', 'time_field', 'target_field'])
+
+EVENT_TABLES = [
+    EventTable('blog.view', 'blog.BlogPostView', 'viewed_at', 'post'),
+    EventTable('blog.share', 'blog.BlogPostShare', 'shared_at', 'post'),
+    EventTable('resources.view', 'resources.ResourceView', 'viewed_at', 'resource'),
+    EventTable('resources.download', 'resources.ResourceDownload', 'downloaded_at', 'resource'),
+]
+
+
+def month_start(value):
+    """Return the first day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """Return the first day of the month ``months`` after ``value``'s month."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(value):
+    return datetime(value.year, value.month, value.day, tzinfo=dt_timezone.utc).isoformat()
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y%m}'
+
+
+def is_partitioned(table, using=None):
+    """Return True if ``table`` is a partitioned PostgreSQL table."""
+    conn = using or connection
+    if conn.vendor != 'postgresql':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [table]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table, using=None):
+    """Return ``{month: partition_name}`` for the monthly partitions of ``table``."""
+    conn = using or connection
+    prefix = f'{table}_p'
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+            partitions[date(int(suffix[:4]), int(suffix[4:]), 1)] = name
+    return partitions
+
+
+def create_partition(table, column, month, using=None):
+    """
+    Create the partition for ``month`` unless it exists.
+
+    Rows for that month already sitting in the default partition are moved
+    into the new partition, which PostgreSQL requires before it will attach.
+    """
+    conn = using or connection
+    name = partition_name(table, month)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    qn = conn.ops.quote_name
+    default = f'{table}_default'
+
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {qn(default)} WHERE {qn(column)} >= %s AND {qn(column)} < %s)',
+            [start, end]
+        )
+        if cursor.fetchone()[0]:
+            cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(default)}')
+            cursor.execute(
+                f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)',
+                [start, end]
+            )
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {qn(default)} WHERE {qn(column)} >= %s AND {qn(column)} < %s '
+                f'RETURNING *) INSERT INTO {qn(table)} SELECT * FROM moved',
+                [start, end]
+            )
+            cursor.execute(f'ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default)} DEFAULT')
+        else:
+            cursor.execute(
+                f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)',
+                [start, end]
+            )
+    return True
+
+
+def ensure_partitions(table, column, months_ahead=3, using=None, today=None):
+    """Create partitions from the current month through ``months_ahead`` months ahead."""
+    current = month_start(today or date.today())
+    return [
+        partition_name(table, add_months(current, offset))
+        for offset in range(months_ahead + 1)
+        if create_partition(table, column, add_months(current, offset), using=using)
+    ]
+
+
+def _table_definition(conn, table):
+    """Return the foreign keys, plain indexes, primary key and id sequence of ``table``."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            """,
+            [table]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT indexdef FROM pg_indexes i
+            WHERE i.tablename = %s AND NOT EXISTS (
+                SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname AND c.contype IN ('p', 'u')
+            )
+            """,
+            [table]
+        )
+        indexes = [row[0].replace(' ON ONLY ', ' ON ') for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [table]
+        )
+        primary_key = cursor.fetchone()[0]
+        cursor.execute(f'SELECT max(id) FROM {conn.ops.quote_name(table)}')
+        max_id = cursor.fetchone()[0]
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [table, 'id'])
+        sequence = cursor.fetchone()[0]
+        cursor.execute(
+            'SELECT attidentity FROM pg_attribute WHERE attrelid = %s::regclass AND attname = %s',
+            [table, 'id']
+        )
+        is_identity = cursor.fetchone()[0] != ''
+    return foreign_keys, indexes, primary_key, max_id, sequence, is_identity
+
+
+def _rebuild_table(schema_editor, table, create_table):
+    """
+    Replace ``table`` with the one ``create_table(old_name)`` creates, keeping its rows,
+    id sequence, foreign keys and indexes. ``create_table`` returns the primary key columns.
+    """
+    qn = schema_editor.quote_name
+    old = f'{table}__rebuild'
+    foreign_keys, indexes, primary_key, max_id, sequence, is_identity = _table_definition(
+        schema_editor.connection, table
+    )
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+    schema_editor.execute(f'ALTER TABLE {qn(old)} DROP CONSTRAINT {qn(primary_key)}')
+    key = create_table(old)
+    schema_editor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(primary_key)} PRIMARY KEY ({key})')
+
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+    if is_identity:
+        schema_editor.execute(
+            f'ALTER TABLE {qn(table)} ALTER COLUMN id RESTART WITH {(max_id or 0) + 1}'
+        )
+    elif sequence:
+        # serial column: the default still points at the old table's sequence
+        schema_editor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.id')
+    schema_editor.execute(f'DROP TABLE {qn(old)}')
+
+    for name, definition in foreign_keys:
+        schema_editor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}')
+    for definition in indexes:
+        schema_editor.execute(definition)
+
+
+def partition_table(schema_editor, table, column, months_ahead=3):
+    """
+    Convert an existing table into a monthly range-partitioned one (PostgreSQL).
+
+    The primary key becomes ``(id, column)``, as PostgreSQL requires the
+    partition key in unique constraints; ids stay unique through the
+    table's sequence. Foreign keys and indexes are recreated on the new
+    parent so they apply to every partition. Intended to run from a
+    migration; it copies existing rows, so large tables take a while.
+    Tables that are already partitioned are left alone.
+    """
+    if schema_editor.connection.vendor != 'postgresql' or is_partitioned(table, schema_editor.connection):
+        return
+    qn = schema_editor.quote_name
+
+    def create_table(old):
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f'SELECT min({qn(column)}) FROM {qn(old)}')
+            oldest = cursor.fetchone()[0]
+        schema_editor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            f'PARTITION BY RANGE ({qn(column)})'
+        )
+        schema_editor.execute(f'CREATE TABLE {qn(table + "_default")} PARTITION OF {qn(table)} DEFAULT')
+
+        first_month = month_start(oldest) if oldest else month_start(date.today())
+        last_month = add_months(month_start(date.today()), months_ahead)
+        month = first_month
+        while month <= last_month:
+            schema_editor.execute(
+                f'CREATE TABLE {qn(partition_name(table, month))} PARTITION OF {qn(table)} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [_bound(month), _bound(add_months(month, 1))]
+            )
+            month = add_months(month, 1)
+        return f'id, {qn(column)}'
+
+    _rebuild_table(schema_editor, table, create_table)
+
+
+def unpartition_table(schema_editor, table, column, months_ahead=3):
+    """
+    Turn a table converted by ``partition_table`` back into a plain one (PostgreSQL).
+
+    Rows from every partition are copied into the new table, whose primary
+    key is ``id`` again. Takes the same arguments as ``partition_table`` so
+    the two can be a migration's forward and reverse steps.
+    """
+    if schema_editor.connection.vendor != 'postgresql' or not is_partitioned(table, schema_editor.connection):
+        return
+    qn = schema_editor.quote_name
+
+    def create_table(old):
+        schema_editor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING IDENTITY)'
+        )
+        return 'id'
+
+    _rebuild_table(schema_editor, table, create_table)
+
+
+def event_models():
+    """Yield ``(EventTable, model)`` for every registered event table."""
+    for spec in EVENT_TABLES:
+        yield spec, apps.get_model(spec.model_label)
+
+
+def rollup_events(spec, model, start=None, end=None):
+    """
+    Store per-day totals for events with ``start <= timestamp < end``.
+
+    Re-running for the same range overwrites the totals, so a roll-up
+    interrupted before its rows were dropped can simply be repeated.
+    """
+    from .models import DailyEventCount
+
+    filters = {}
+    if start is not None:
+        filters[f'{spec.time_field}__gte'] = _bound(start)
+    if end is not None:
+        filters[f'{spec.time_field}__lt'] = _bound(end)
+
+    target = model._meta.get_field(spec.target_field).attname
+    visitor = Coalesce(
+        Cast('user_id', CharField()),
+        Cast('ip_address', CharField()),
+        Value(''),
+        output_field=CharField()
+    )
+    rows = (
+        model.objects.filter(**filters)
+        .order_by()
+        .annotate(day=TruncDate(spec.time_field))
+        .values(target, 'day')
+        .annotate(count=Count('pk'), unique_visitors=Count(visitor, distinct=True))
+    )
+    totals = [
+        DailyEventCount(
+            event=spec.event,
+            object_id=row[target],
+            day=row['day'],
+            count=row['count'],
+            unique_visitors=row['unique_visitors'],
+        )
+        for row in rows.iterator()
+    ]
+    DailyEventCount.objects.bulk_create(
+        totals,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['event', 'object_id', 'day'],
+        update_fields=['count', 'unique_visitors'],
+    )
+    return len(totals)
+
+
+def compact_events(spec, model, cutoff, dry_run=False):
+    """
+    Roll up and remove events older than ``cutoff`` (a month start).
+
+    Whole monthly partitions are rolled up and dropped; stragglers in the
+    default partition, or all rows on unpartitioned tables, are rolled up
+    and deleted. Returns a summary dict.
+    """
+    table = model._meta.db_table
+    qn = connection.ops.quote_name
+    summary = {'partitions_dropped': [], 'daily_rows': 0, 'rows_deleted': 0}
+
+    if is_partitioned(table):
+        for month, name in sorted(list_partitions(table).items()):
+            if add_months(month, 1) > cutoff:
+                continue
+            summary['partitions_dropped'].append(name)
+            if dry_run:
+                continue
+            with transaction.atomic():
+                summary['daily_rows'] += rollup_events(spec, model, month, add_months(month, 1))
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}')
+                    cursor.execute(f'DROP TABLE {qn(name)}')
+
+    expired = model.objects.filter(**{f'{spec.time_field}__lt': _bound(cutoff)})
+    if dry_run:
+        for name in summary['partitions_dropped']:
+            month = date(int(name[-6:-2]), int(name[-2:]), 1)
+            expired = expired.exclude(**{
+                f'{spec.time_field}__gte': _bound(month),
+                f'{spec.time_field}__lt': _bound(add_months(month, 1)),
+            })
+        summary['rows_deleted'] = expired.count()
+        return summary
+    with transaction.atomic():
+        if expired.exists():
+            summary['daily_rows'] += rollup_events(spec, model, end=cutoff)
+            summary['rows_deleted'], _ = expired.delete()
+    return summary
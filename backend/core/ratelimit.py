@@ -0,0 +1,280 @@
+"""
+Token bucket rate limiting for anonymous write endpoints.
+
+Each (scope, client IP) pair owns a bucket holding up to ``N`` tokens that
+refills continuously at ``N`` per period, as configured in
+``settings.RATE_LIMITS`` using DRF's rate syntax (``'5/min'``). Buckets are
+kept in GCRA form: a single "theoretical arrival time" per key. Continuous
+refill means limits apply over a sliding window rather than fixed clock
+intervals.
+
+The shared cache is used so every process sees the same buckets. Each
+check reads and advances the bucket atomically: on Redis with a Lua
+script, on other cache backends under a short-lived ``cache.add`` lock per
+bucket. If the cache is unavailable the limiter falls back to in-process
+buckets rather than failing open.
+
+Clients are identified by the right-most ``X-Forwarded-For`` address not
+added by one of ``TRUSTED_PROXIES``, so a client cannot pick its own
+bucket by sending the header itself.
+"""
+import ipaddress
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Prune expired in-process buckets once the fallback table grows past this.
+LOCAL_PRUNE_THRESHOLD = 10000
+
+# Per-bucket lock on caches without scripting: held for one get/set, retried briefly
+LOCK_TIMEOUT = 1
+LOCK_ATTEMPTS = 5
+LOCK_WAIT = 0.005
+
+# KEYS[1]: bucket; ARGV: now, interval, period (seconds, as strings to keep
+# fractions through Lua). Returns {allowed, retry_after}.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+if new_tat - now > period then
+    return {0, tostring(new_tat - now - period)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+@lru_cache(maxsize=4)
+def _gcra_script(location):
+    """Return the GCRA script registered on a client for the Redis server at ``location``."""
+    import redis
+
+    # The first server is the primary that Django's RedisCache writes to
+    client = redis.Redis.from_url(location.split(',')[0] if isinstance(location, str) else location[0])
+    return client.register_script(GCRA_SCRIPT)
+
+
+@lru_cache(maxsize=8)
+def _networks(proxies):
+    return [ipaddress.ip_network(network, strict=False) for network in proxies]
+
+
+def _is_trusted_proxy(address):
+    return any(address in network for network in _networks(tuple(settings.TRUSTED_PROXIES)))
+
+
+def get_client_ip(request):
+    """
+    Get client IP address from request.
+
+    ``X-Forwarded-For`` is only read when the request came from a trusted
+    proxy, and then from the right: each trusted proxy appends the address
+    it received the request from, so the first untrusted entry is the
+    client. Entries left of it are whatever the client sent.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    try:
+        hop = ipaddress.ip_address(remote_addr)
+    except ValueError:
+        return remote_addr
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    for entry in reversed(x_forwarded_for.split(',') if x_forwarded_for else []):
+        if not _is_trusted_proxy(hop):
+            break
+        try:
+            hop = ipaddress.ip_address(entry.strip())
+        except ValueError:
+            # Not an address ("unknown"): the proxy that added it is the closest we know
+            break
+    return str(hop)
+
+
+def parse_rate(rate):
+    """Parse ``'<requests>/<period>'`` into ``(requests, seconds)``."""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class TokenBucketLimiter:
+    """Shared-cache token buckets with an in-process fallback."""
+
+    def __init__(self, key_prefix='ratelimit', use_cache=True):
+        self.key_prefix = key_prefix
+        self.use_cache = use_cache
+        self._lock = threading.Lock()
+        self._local = {}
+        self._local_rejections = Counter()
+
+    def _key(self, scope, ident):
+        return f'{self.key_prefix}:{scope}:{ident}'
+
+    @staticmethod
+    def _advance(tat, now, capacity, period):
+        """Return ``(new_tat or None, retry_after)`` for one request."""
+        interval = period / capacity
+        new_tat = max(tat or now, now) + interval
+        if new_tat - now > period:
+            return None, new_tat - now - period
+        return new_tat, 0.0
+
+    def hit(self, scope, ident, capacity, period):
+        """
+        Take a token from the bucket for ``ident`` in ``scope``.
+
+        Returns ``(allowed, retry_after_seconds)``.
+        """
+        now = time.time()
+        key = self._key(scope, ident)
+        if self.use_cache:
+            try:
+                allowed, retry_after = self._hit_shared(key, now, capacity, period)
+            except Exception as e:
+                logger.warning('Rate limit cache unavailable, using in-process buckets: %s', e)
+                allowed, retry_after = self._hit_local(key, now, capacity, period)
+        else:
+            allowed, retry_after = self._hit_local(key, now, capacity, period)
+
+        if not allowed:
+            self._record_rejection(scope)
+            return False, retry_after
+        return True, 0.0
+
+    def _hit_shared(self, key, now, capacity, period):
+        backend = caches['default']
+        if isinstance(backend, RedisCache):
+            script = _gcra_script(settings.CACHES['default']['LOCATION'])
+            allowed, retry_after = script(
+                keys=[backend.make_and_validate_key(key)], args=[repr(now), repr(period / capacity), period]
+            )
+            return bool(int(allowed)), float(retry_after)
+
+        lock = f'{key}:lock'
+        for _ in range(LOCK_ATTEMPTS):
+            if backend.add(lock, 1, timeout=LOCK_TIMEOUT):
+                try:
+                    new_tat, retry_after = self._advance(backend.get(key), now, capacity, period)
+                    if new_tat is not None:
+                        backend.set(key, new_tat, timeout=math.ceil(new_tat - now))
+                    return new_tat is not None, retry_after
+                finally:
+                    backend.delete(lock)
+            time.sleep(LOCK_WAIT)
+        # Requests for this bucket are arriving faster than it can be updated
+        return False, period / capacity
+
+    def _hit_local(self, key, now, capacity, period):
+        with self._lock:
+            new_tat, retry_after = self._advance(self._local.get(key), now, capacity, period)
+            if new_tat is not None:
+                self._local[key] = new_tat
+            if len(self._local) > LOCAL_PRUNE_THRESHOLD:
+                self._local = {k: tat for k, tat in self._local.items() if tat > now}
+            return new_tat is not None, retry_after
+
+    def _record_rejection(self, scope):
+        key = f'{self.key_prefix}:rejected:{scope}'
+        try:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+        except Exception:
+            with self._lock:
+                self._local_rejections[scope] += 1
+
+    def rejection_counts(self, scopes):
+        """Return rejected request totals per scope."""
+        keys = {f'{self.key_prefix}:rejected:{scope}': scope for scope in scopes}
+        try:
+            shared = cache.get_many(list(keys))
+        except Exception:
+            shared = {}
+        with self._lock:
+            return {
+                scope: shared.get(key, 0) + self._local_rejections[scope]
+                for key, scope in keys.items()
+            }
+
+    def reset(self, scope, ident):
+        """Refill the bucket for ``ident`` in ``scope``."""
+        key = self._key(scope, ident)
+        with self._lock:
+            self._local.pop(key, None)
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
+
+
+limiter = TokenBucketLimiter()
+
+
+def check_rate_limit(scope, request):
+    """
+    Apply the configured limit for ``scope`` to the request's client IP.
+
+    Returns ``(allowed, retry_after_seconds)``.
+    """
+    rate = settings.RATE_LIMITS.get(scope)
+    if not settings.RATE_LIMIT_ENABLED or not rate:
+        return True, 0.0
+
+    ip = get_client_ip(request)
+    if ip in settings.RATE_LIMIT_TRUSTED_IPS:
+        return True, 0.0
+
+    capacity, period = parse_rate(rate)
+    return limiter.hit(scope, ip, capacity, period)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle applying per-IP token buckets.
+
+    Views map actions (or lowercase HTTP methods) to scopes with
+    ``throttle_scopes``; unmapped actions are not limited.
+    """
+
+    def allow_request(self, request, view):
+        scopes = getattr(view, 'throttle_scopes', {})
+        scope = scopes.get(getattr(view, 'action', None) or request.method.lower())
+        if scope is None:
+            return True
+
+        allowed, self.retry_after = check_rate_limit(scope, request)
+        return allowed
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+def rate_limited(scope):
+    """Limit a plain Django view function, answering 429 when exhausted."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            allowed, retry_after = check_rate_limit(scope, request)
+            if not allowed:
+                response = JsonResponse({'error': 'Too many requests'}, status=429)
+                response['Retry-After'] = str(math.ceil(retry_after))
+                return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
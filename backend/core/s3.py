@@ -0,0 +1,113 @@
+"""
+Shared S3 client and presigned URL cache.
+
+boto3 clients are thread-safe but expensive to build (credential
+resolution, endpoint and service model loading), so one client per region
+and endpoint is created lazily and reused by every thread; its connection
+pool is sized by ``AWS_S3_MAX_POOL_CONNECTIONS``.
+
+Presigned URLs are cached per bucket, key and lifetime and handed out
+again until less than a fraction of their lifetime remains, so repeated
+downloads of the same object do not re-sign it. Set ``AWS_S3_ENDPOINT_URL``
+to point everything at a local S3 stand-in such as MinIO.
+"""
+import hashlib
+import threading
+import time
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_KEY_PREFIX = 'presigned-url'
+
+# Cached URLs are reused until less than this share of their lifetime remains.
+MIN_REMAINING_FRACTION = 0.2
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_s3_client(region_name=None):
+    """Return the process-wide S3 client for a region."""
+    region_name = region_name or settings.AWS_S3_REGION_NAME
+    endpoint_url = settings.AWS_S3_ENDPOINT_URL or None
+    client_key = (region_name, endpoint_url)
+
+    client = _clients.get(client_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(client_key)
+            if client is None:
+                client = boto3.session.Session().client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=Config(
+                        signature_version='s3v4',
+                        max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+                    ),
+                )
+                _clients[client_key] = client
+    return client
+
+
+def reset_s3_clients():
+    """Drop cached clients, e.g. after changing credentials in tests."""
+    with _clients_lock:
+        _clients.clear()
+
+
+def _cache_key(bucket, key, expires_in):
+    digest = hashlib.sha256(f'{bucket}\x1f{key}\x1f{expires_in}'.encode('utf-8')).hexdigest()
+    return f'{CACHE_KEY_PREFIX}:{digest}'
+
+
+def presigned_url(key, bucket=None, expires_in=None):
+    """Return a presigned GET URL for an object, reusing a cached one while it is fresh."""
+    bucket = bucket or settings.AWS_STORAGE_BUCKET_NAME
+    if not bucket:
+        raise ImproperlyConfigured('AWS_STORAGE_BUCKET_NAME is not set.')
+    expires_in = expires_in or settings.AWS_QUERYSTRING_EXPIRE
+
+    cache_key = _cache_key(bucket, key, expires_in)
+    now = time.time()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        url, expires_at = cached
+        if expires_at - now >= expires_in * MIN_REMAINING_FRACTION:
+            return url
+
+    url = get_s3_client().generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket, 'Key': key},
+        ExpiresIn=expires_in
+    )
+    cache.set(cache_key, (url, now + expires_in), timeout=int(expires_in * (1 - MIN_REMAINING_FRACTION)))
+    return url
+
+
+def file_download_url(field_file, expires_in=None):
+    """
+    Return a download URL for a model file.
+
+    Files in a signed S3 storage get a cached presigned URL; any other
+    storage (local media, public buckets, custom domains) returns its
+    regular URL.
+    """
+    if not field_file:
+        return None
+
+    storage = field_file.storage
+    bucket = getattr(storage, 'bucket_name', None)
+    if not bucket or not getattr(storage, 'querystring_auth', False) or getattr(storage, 'custom_domain', None):
+        return field_file.url
+
+    from storages.utils import clean_name
+
+    key = storage._normalize_name(clean_name(field_file.name))
+    return presigned_url(key, bucket=bucket, expires_in=expires_in or storage.querystring_expire)
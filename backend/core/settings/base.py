@@ -4,7 +4,7 @@ Base Django settings for KKEVO project.
 import os
 import sys
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # Fix for Windows XML module issue with Django autoreloader
 if sys.platform == 'win32':
@@ -57,6 +57,8 @@ LOCAL_APPS = [
     'resources',
     'lead_magnets',
     'case_studies',
+    'scoring',
+    'jobs',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -105,6 +107,123 @@ DATABASES = {
     }
 }
 
+# Cache
+# Shared cache used for cross-process invalidation. Falls back to a
+# per-process in-memory cache when REDIS_URL is not set; each process then
+# only sees another's cache version bumps (core.cache) once its own copy of
+# the version expires after CACHE_VERSION_TIMEOUT seconds.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+    CACHE_VERSION_TIMEOUT = None
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'kkevo-default',
+        }
+    }
+    CACHE_VERSION_TIMEOUT = 60
+
+# Lead notifications
+# Comma-separated addresses emailed when a new submission has been processed.
+LEAD_NOTIFICATION_EMAILS = config('LEAD_NOTIFICATION_EMAILS', default='', cast=Csv())
+
+# Repeat contact/lead magnet submissions within this many seconds are folded
+# into the first record instead of creating a new row.
+SUBMISSION_DEDUP_WINDOW = config('SUBMISSION_DEDUP_WINDOW', default=86400, cast=int)
+
+# Client IPs
+# Addresses or networks of the reverse proxies in front of the app. Only these
+# are believed when they report a client address in X-Forwarded-For. Set it
+# wherever the app runs behind a proxy (see env.example, railway.toml), or
+# every visitor gets the proxy's address and shares its rate limits.
+TRUSTED_PROXIES = config('TRUSTED_PROXIES', default='127.0.0.1,::1', cast=Csv())
+
+# Rate limiting
+# Token bucket limits per endpoint scope and client IP, in DRF rate syntax.
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMIT_TRUSTED_IPS = config('RATE_LIMIT_TRUSTED_IPS', default='', cast=Csv())
+RATE_LIMITS = {
+    'contact_submit': '5/min',
+    'lead_magnet_submit': '5/min',
+    'blog_view': '60/min',
+    'resource_view': '60/min',
+    'resource_download': '20/min',
+    'resource_rate': '10/min',
+    'checklist_download': '10/min',
+    'file_download': '30/min',
+    'image_upload': '10/min',
+}
+
+# Engagement events
+# View/download rows are buffered per process and written in batches once
+# EVENT_BATCH_SIZE rows are waiting or EVENT_FLUSH_INTERVAL seconds have passed
+# (0 writes every event immediately). Repeats by the same visitor within the
+# dedup window (seconds) are not recorded; blog views keep repeats, which the
+# bounce rate in BlogPostAnalytics is computed from.
+EVENT_BATCH_SIZE = config('EVENT_BATCH_SIZE', default=200, cast=int)
+EVENT_FLUSH_INTERVAL = config('EVENT_FLUSH_INTERVAL', default=2.0, cast=float)
+EVENT_DEDUP_WINDOWS = {
+    'blog_view': 0,
+    'resource_view': 30 * 60,
+    'resource_download': 60,
+}
+# Full months of raw events kept by compact_events before they are rolled up
+# into daily counts and dropped.
+EVENT_RETENTION_MONTHS = config('EVENT_RETENTION_MONTHS', default=12, cast=int)
+
+# Analytics and dashboards
+# Seconds the platform-wide blog analytics summary is served from cache.
+PLATFORM_ANALYTICS_CACHE_TTL = config('PLATFORM_ANALYTICS_CACHE_TTL', default=60, cast=int)
+# Seconds a user's blog dashboard is cached; their own likes, bookmarks,
+# comments and reading progress invalidate it immediately.
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=300, cast=int)
+# Seconds a user's liked/bookmarked post ids are cached for list page flags;
+# their own likes and bookmarks invalidate them immediately.
+INTERACTION_STATE_CACHE_TTL = config('INTERACTION_STATE_CACHE_TTL', default=3600, cast=int)
+# Seconds a homepage section snapshot may live; saving or deleting the
+# models behind it rebuilds it immediately.
+HOMEPAGE_CACHE_TTL = config('HOMEPAGE_CACHE_TTL', default=3600, cast=int)
+
+# Feeds
+# Rendered RSS/Atom XML is cached under a key that changes with the feed's
+# content, so the TTL only bounds memory use; max-age is how long clients and
+# proxies may reuse a feed before revalidating with ETag/Last-Modified.
+FEED_CACHE_TTL = config('FEED_CACHE_TTL', default=3600, cast=int)
+FEED_CACHE_MAX_AGE = config('FEED_CACHE_MAX_AGE', default=300, cast=int)
+
+# Image processing
+# Uploaded images get resized variants at these widths in each supported
+# format listed (plus a JPEG/PNG fallback), encoded by a background job on a
+# shared thread pool of the worker (`manage.py run_jobs`).
+IMAGE_VARIANT_WIDTHS = [320, 640, 960, 1280, 1920]
+IMAGE_VARIANT_FORMATS = config('IMAGE_VARIANT_FORMATS', default='avif,webp', cast=Csv())
+IMAGE_PIPELINE_WORKERS = config('IMAGE_PIPELINE_WORKERS', default=4, cast=int)
+IMAGE_UPLOAD_MAX_SIZE = config('IMAGE_UPLOAD_MAX_SIZE', default=5 * 1024 * 1024, cast=int)
+IMAGE_MAX_PIXELS = config('IMAGE_MAX_PIXELS', default=40_000_000, cast=int)
+
+# Sitemaps
+# Files written by `manage.py build_sitemaps` and served at /sitemap.xml and
+# /sitemaps/<file>; they list URLs under SITEMAP_BASE_URL, whose /sitemap.xml
+# and /sitemaps/ should be proxied to the backend. Any Django storage works.
+SITEMAP_BASE_URL = config('SITEMAP_BASE_URL', default='https://kkevo.app')
+SITEMAP_STORAGE = {
+    'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    'OPTIONS': {'location': config('SITEMAP_ROOT', default=str(BASE_DIR / 'sitemaps'))},
+}
+
+# Reading progress
+# Clients are asked to send progress pings at most this often (seconds) and
+# may send up to READING_PROGRESS_BATCH_LIMIT of them in one batch request.
+READING_PROGRESS_DEBOUNCE_SECONDS = config('READING_PROGRESS_DEBOUNCE_SECONDS', default=15, cast=int)
+READING_PROGRESS_BATCH_LIMIT = config('READING_PROGRESS_BATCH_LIMIT', default=50, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -138,6 +257,27 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Thumbnails
+# Resized copies of model images, kept on local disk and served with immutable
+# caching; the least recently used are evicted once the directory passes
+# THUMBNAIL_CACHE_MAX_BYTES (checked at most every THUMBNAIL_PRUNE_INTERVAL s).
+THUMBNAIL_ROOT = config('THUMBNAIL_ROOT', default=str(BASE_DIR / 'thumbnails'))
+THUMBNAIL_URL = config('THUMBNAIL_URL', default='/thumbnails/')
+THUMBNAIL_FORMAT = config('THUMBNAIL_FORMAT', default='webp')
+THUMBNAIL_CACHE_MAX_BYTES = config('THUMBNAIL_CACHE_MAX_BYTES', default=1024 * 1024 * 1024, cast=int)
+THUMBNAIL_PRUNE_INTERVAL = config('THUMBNAIL_PRUNE_INTERVAL', default=300, cast=int)
+
+# File downloads
+# When enabled, downloads under these roots are handed to nginx via
+# X-Accel-Redirect using the matching internal location.
+FILE_DELIVERY_ACCEL_REDIRECT = config('FILE_DELIVERY_ACCEL_REDIRECT', default=False, cast=bool)
+FILE_DELIVERY_ACCEL_LOCATIONS = {
+    str(MEDIA_ROOT): '/protected/media/',
+    str(BASE_DIR / 'static'): '/protected/static/',
+    str(STATIC_ROOT): '/protected/static/',
+    THUMBNAIL_ROOT: '/protected/thumbnails/',
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -251,3 +391,7 @@ AWS_S3_OBJECT_PARAMETERS = {
 }
 AWS_LOCATION = 'static'
 AWS_DEFAULT_ACL = 'public-read'
+# Point at a local S3 stand-in (e.g. MinIO) for development and tests
+AWS_S3_ENDPOINT_URL = config('AWS_S3_ENDPOINT_URL', default=None)
+AWS_S3_MAX_POOL_CONNECTIONS = config('AWS_S3_MAX_POOL_CONNECTIONS', default=10, cast=int)
+AWS_QUERYSTRING_EXPIRE = config('AWS_QUERYSTRING_EXPIRE', default=3600, cast=int)
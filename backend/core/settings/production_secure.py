@@ -140,6 +140,7 @@ CACHES = {
         'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
     }
 }
+CACHE_VERSION_TIMEOUT = None
 
 # Static files
 STATIC_ROOT = config('STATIC_ROOT', default='/var/www/static/')
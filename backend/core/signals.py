@@ -0,0 +1,38 @@
+"""
+Signal handlers for the core app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from case_studies.models import CaseStudy
+from portfolio.models import Portfolio
+from resources.models import Resource
+from services.models import Service
+from team.models import TeamMember
+from testimonials.models import Testimonial
+
+from .thumbnails import precompute
+
+# Model -> {image field: thumbnail specs its serializers expose}
+THUMBNAIL_FIELDS = {
+    TeamMember: {'avatar': ['avatar']},
+    Service: {'image': ['card']},
+    Portfolio: {'hero_image': ['card', 'hero']},
+    CaseStudy: {'hero_image': ['card', 'hero']},
+    Testimonial: {'logo': ['logo']},
+    Resource: {'thumbnail': ['thumbnail']},
+}
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=Portfolio)
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_save, sender=Resource)
+def precompute_thumbnails(sender, instance, **kwargs):
+    """Create the thumbnails of a saved model's images once the change is committed."""
+    fields = THUMBNAIL_FIELDS[sender]
+    if any(getattr(instance, field) for field in fields):
+        transaction.on_commit(lambda: precompute(instance, fields))
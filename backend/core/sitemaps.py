@@ -0,0 +1,275 @@
+"""
+Incremental XML sitemaps for the public site.
+
+Each section (blog posts, services) is written as gzipped ``urlset`` files
+of at most ``SITEMAP_LIMIT`` URLs, listed by a plain ``sitemap.xml`` index,
+all kept in ``SITEMAP_STORAGE``. Rows are streamed in primary key order, so a section's files split it into key
+ranges; ``manifest.json`` records each file's upper key and the row count
+and newest ``updated_at`` it was written from.
+
+``build_sitemaps()`` compares those watermarks with the database: a section
+whose count and newest ``updated_at`` are unchanged costs one aggregate
+query and is left alone, and within a changed section only the files whose
+key range changed are rewritten (a file that outgrows the limit is split).
+Edits bump ``updated_at``; publishing, unpublishing and deletes change the
+count. Bulk ``update()`` calls do neither, so run ``build_sitemaps --full``
+after them.
+"""
+import gzip
+import itertools
+import json
+import re
+import tempfile
+from collections import namedtuple
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponseRedirect
+from django.utils.encoding import iri_to_uri
+from django.utils.module_loading import import_string
+from xml.sax.saxutils import escape
+
+from blog.models import BlogPost
+from services.models import Service
+
+from .filedelivery import serve_file
+
+# Maximum URLs per file allowed by the sitemap protocol
+SITEMAP_LIMIT = 50000
+
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+FILE_NAME_RE = re.compile(r'^sitemap-[a-z-]+-\d+\.xml\.gz$')
+
+LOCK_KEY = 'sitemaps:build-lock'
+LOCK_TIMEOUT = 60 * 60
+
+URLSET_HEADER = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_FOOTER = b'</urlset>\n'
+
+Section = namedtuple('Section', ['name', 'queryset', 'path'])
+
+# Section name -> public rows and the site path of each, by slug. Only
+# models with a detail page on the frontend are listed, at its canonical
+# path (no trailing slash); the blog's own sitemap lists just its landing
+# and category pages, so each post appears once.
+SECTIONS = {
+    'blog': Section('blog', lambda: BlogPost.objects.published(), '/blog/{}'),
+    'services': Section('services', lambda: Service.objects.filter(is_active=True), '/services/{}'),
+}
+
+
+def get_storage():
+    """Return the storage sitemap files are written to."""
+    options = settings.SITEMAP_STORAGE
+    return import_string(options['BACKEND'])(**options.get('OPTIONS', {}))
+
+
+def file_url(name):
+    """Public URL of a sitemap file."""
+    return f"{settings.SITEMAP_BASE_URL.rstrip('/')}/sitemaps/{name}"
+
+
+def _lastmod(value):
+    return value.isoformat(timespec='seconds') if value else None
+
+
+def _save(storage, name, buffer):
+    buffer.seek(0)
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, File(buffer, name=name))
+
+
+def write_urlset(storage, name, section, rows):
+    """
+    Write ``rows`` of ``(pk, slug, updated_at)`` to the gzipped file ``name``.
+
+    Returns the file's manifest entry: name, last pk, URL count and newest
+    ``updated_at``.
+    """
+    base_url = settings.SITEMAP_BASE_URL.rstrip('/')
+    entry = {'name': name, 'last': None, 'count': 0, 'lastmod': None}
+    newest = None
+    with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) as buffer:
+        # mtime=0 keeps the output identical for identical content
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as archive:
+            archive.write(URLSET_HEADER)
+            for rows_batch in iter(lambda: list(itertools.islice(rows, 1000)), []):
+                lines = []
+                for pk, slug, updated_at in rows_batch:
+                    loc = escape(iri_to_uri(base_url + section.path.format(slug)))
+                    if updated_at:
+                        lines.append(f'<url><loc>{loc}</loc><lastmod>{_lastmod(updated_at)}</lastmod></url>\n')
+                        newest = updated_at if newest is None else max(newest, updated_at)
+                    else:
+                        lines.append(f'<url><loc>{loc}</loc></url>\n')
+                archive.write(''.join(lines).encode('utf-8'))
+                entry['count'] += len(rows_batch)
+                entry['last'] = rows_batch[-1][0]
+            archive.write(URLSET_FOOTER)
+        _save(storage, name, buffer)
+    entry['lastmod'] = newest.isoformat() if newest else None
+    return entry
+
+
+def write_chunks(storage, section, rows, names):
+    """Write ``rows`` to files of at most ``SITEMAP_LIMIT`` URLs, named from the ``names`` iterator."""
+    rows = iter(rows)
+    chunks = []
+    while True:
+        first = next(rows, None)
+        if first is None:
+            return chunks
+        batch = itertools.chain([first], itertools.islice(rows, SITEMAP_LIMIT - 1))
+        chunks.append(write_urlset(storage, next(names), section, batch))
+
+
+def write_index(storage, chunks):
+    """Write the sitemap index listing the files of manifest ``chunks``."""
+    with tempfile.SpooledTemporaryFile() as buffer:
+        buffer.write(
+            b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        )
+        for chunk in chunks:
+            line = f"<sitemap><loc>{escape(file_url(chunk['name']))}</loc>"
+            if chunk['lastmod']:
+                line += f"<lastmod>{_lastmod(datetime.fromisoformat(chunk['lastmod']))}</lastmod>"
+            buffer.write(f'{line}</sitemap>\n'.encode('utf-8'))
+        buffer.write(b'</sitemapindex>\n')
+        _save(storage, INDEX_NAME, buffer)
+
+
+def read_manifest(storage):
+    """Return the manifest of the last build, or an empty one."""
+    if not storage.exists(MANIFEST_NAME):
+        return {'sections': {}}
+    with storage.open(MANIFEST_NAME, 'rb') as handle:
+        return json.loads(handle.read())
+
+
+def _rows(queryset):
+    return queryset.order_by('pk').values_list('pk', 'slug', 'updated_at').iterator(chunk_size=5000)
+
+
+def _watermark(queryset):
+    totals = queryset.aggregate(count=Count('pk'), lastmod=Max('updated_at'))
+    return totals['count'], totals['lastmod'].isoformat() if totals['lastmod'] else None
+
+
+def _chunk_range(queryset, chunks, position):
+    """Rows in the key range of ``chunks[position]``; the last chunk is open-ended."""
+    if position > 0:
+        queryset = queryset.filter(pk__gt=chunks[position - 1]['last'])
+    if position < len(chunks) - 1:
+        queryset = queryset.filter(pk__lte=chunks[position]['last'])
+    return queryset
+
+
+def build_section(storage, section, previous=None, full=False):
+    """
+    Bring one section's files up to date.
+
+    Returns ``(manifest entry, files written)``.
+    """
+    queryset = section.queryset()
+    count, lastmod = _watermark(queryset)
+    previous = previous or {}
+    chunks = previous.get('chunks', [])
+    if (
+        not full and previous.get('count') == count and previous.get('lastmod') == lastmod
+        and all(storage.exists(chunk['name']) for chunk in chunks)
+    ):
+        return previous, 0
+
+    counter = itertools.count(1 if full else previous.get('next', 1))
+    names = (f'sitemap-{section.name}-{number}.xml.gz' for number in counter)
+
+    if full or not chunks:
+        new_chunks = write_chunks(storage, section, _rows(queryset), names)
+        written = len(new_chunks)
+    else:
+        new_chunks = []
+        written = 0
+        for position, chunk in enumerate(chunks):
+            rows = _chunk_range(queryset, chunks, position)
+            if _watermark(rows) == (chunk['count'], chunk['lastmod']) and storage.exists(chunk['name']):
+                new_chunks.append(chunk)
+                continue
+            # Rewrite in place; anything past the limit goes to new files
+            pieces = write_chunks(storage, section, _rows(rows), itertools.chain([chunk['name']], names))
+            if pieces and position < len(chunks) - 1:
+                # Keep the key ranges contiguous for the next build
+                pieces[-1]['last'] = chunk['last']
+            new_chunks.extend(pieces)
+            written += len(pieces)
+
+    return {'count': count, 'lastmod': lastmod, 'next': next(counter), 'chunks': new_chunks}, written
+
+
+def build_sitemaps(full=False, storage=None):
+    """
+    Rebuild the sitemap files of changed sections (all of them with ``full``).
+
+    Returns ``{section: files written}``, or None if another build is running.
+    """
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        return None
+    try:
+        storage = storage or get_storage()
+        manifest = read_manifest(storage)
+        previous_names = {
+            chunk['name'] for entry in manifest['sections'].values() for chunk in entry['chunks']
+        }
+
+        sections = {}
+        written = {}
+        for name, section in SECTIONS.items():
+            sections[name], written[name] = build_section(
+                storage, section, manifest['sections'].get(name), full=full
+            )
+
+        if full or sections != manifest['sections'] or not storage.exists(INDEX_NAME):
+            write_index(storage, [chunk for entry in sections.values() for chunk in entry['chunks']])
+            with tempfile.SpooledTemporaryFile() as buffer:
+                buffer.write(json.dumps({'sections': sections}, default=str).encode('utf-8'))
+                _save(storage, MANIFEST_NAME, buffer)
+
+        current_names = {chunk['name'] for entry in sections.values() for chunk in entry['chunks']}
+        for name in previous_names - current_names:
+            if storage.exists(name):
+                storage.delete(name)
+        return written
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _serve(request, name, content_type):
+    storage = get_storage()
+    if not storage.exists(name):
+        raise Http404('Sitemap not built')
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage: let it serve the file
+        return HttpResponseRedirect(storage.url(name))
+    return serve_file(request, path, as_attachment=False, content_type=content_type)
+
+
+def sitemap_index(request):
+    """Serve the sitemap index."""
+    return _serve(request, INDEX_NAME, 'application/xml')
+
+
+def sitemap_file(request, name):
+    """Serve one gzipped section sitemap."""
+    if not FILE_NAME_RE.match(name):
+        raise Http404('Unknown sitemap')
+    return _serve(request, name, 'application/gzip')
@@ -0,0 +1,135 @@
+"""
+Unique-visitor counting with per-day HyperLogLog sketches.
+
+Each accepted event adds its visitor to the sketch for its object and day,
+and to the site-wide sketch for that day (object ``'*'``). Writing locks
+those rows, and every object shares the site-wide one, so visits are
+recorded in batches: ``core.events.EventBuffer`` merges a whole flush at
+once. A unique-visitor query for any set of objects and date range merges
+the matching sketches, so its cost depends on the number of days and
+objects asked for, never on the number of raw events, and it keeps working
+after the raw rows have been compacted away (see ``core.partitions``).
+Estimates are within a few percent; see ``core.hll``.
+
+Event names follow ``core.partitions.EVENT_TABLES`` (``'blog.view'``,
+``'resources.download'``, ...).
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .hll import HyperLogLog
+
+ALL_OBJECTS = '*'
+
+# Events whose visitors are sketched as they are recorded
+SKETCHED_EVENTS = ('blog.view', 'resources.view', 'resources.download')
+
+
+def visitor_key(user_id=None, ip_address=None, user_agent=''):
+    """Identify a visitor: the user when signed in, otherwise IP and user agent."""
+    if user_id:
+        return f'user:{user_id}'
+    return f'ip:{ip_address}|{user_agent or ""}'
+
+
+def record_visitors(event, visits):
+    """
+    Add visitors to the daily sketches of ``event``.
+
+    ``visits`` is an iterable of ``(object_id, day, visitor)``. All sketches
+    touched are updated in one transaction; as merging is idempotent,
+    recording the same visit again is harmless. Returns sketches written.
+    """
+    from .models import VisitorSketch
+
+    sketches = defaultdict(HyperLogLog)
+    for object_id, day, visitor in visits:
+        sketches[(str(object_id), day)].add(visitor)
+        sketches[(ALL_OBJECTS, day)].add(visitor)
+    if not sketches:
+        return 0
+
+    with transaction.atomic():
+        VisitorSketch.objects.bulk_create(
+            [
+                VisitorSketch(event=event, object_id=object_id, day=day, registers=sketch.to_bytes())
+                for (object_id, day), sketch in sketches.items()
+            ],
+            ignore_conflicts=True
+        )
+        lookup = Q()
+        for object_id, day in sketches:
+            lookup |= Q(object_id=object_id, day=day)
+        now = timezone.now()
+        changed = []
+        # Lock in a stable order so concurrent writers cannot deadlock
+        for row in VisitorSketch.objects.select_for_update().filter(lookup, event=event).order_by('pk'):
+            stored = HyperLogLog.from_bytes(row.registers)
+            if stored.merge(sketches[(row.object_id, row.day)]):
+                row.registers = stored.to_bytes()
+                row.updated_at = now
+                changed.append(row)
+        VisitorSketch.objects.bulk_update(changed, ['registers', 'updated_at'])
+    return len(sketches)
+
+
+def unique_visitors(event, object_ids=None, start=None, end=None):
+    """
+    Estimate distinct visitors for ``event`` over ``start <= day <= end``.
+
+    ``object_ids`` limits the count to those objects (a visitor of several
+    counts once); by default the site-wide sketches are used.
+    """
+    return visitor_sketch(event, object_ids, start, end).count()
+
+
+def visitor_sketch(event, object_ids=None, start=None, end=None):
+    """Return the merged sketch behind ``unique_visitors``."""
+    from .models import VisitorSketch
+
+    sketches = VisitorSketch.objects.filter(event=event)
+    if object_ids is None:
+        sketches = sketches.filter(object_id=ALL_OBJECTS)
+    else:
+        sketches = sketches.filter(object_id__in=[str(object_id) for object_id in object_ids])
+    if start is not None:
+        sketches = sketches.filter(day__gte=start)
+    if end is not None:
+        sketches = sketches.filter(day__lte=end)
+    return HyperLogLog.union(
+        HyperLogLog.from_bytes(registers)
+        for registers in sketches.values_list('registers', flat=True).iterator()
+    )
+
+
+def rebuild_sketches(spec, model, start=None, end=None, chunk_size=10000):
+    """
+    Fold raw events with ``start <= day <= end`` into the sketches.
+
+    Used to backfill sketches from events recorded before they existed.
+    Returns the number of events read.
+    """
+    target = model._meta.get_field(spec.target_field).attname
+    rows = model.objects.order_by().annotate(day=TruncDate(spec.time_field))
+    if start is not None:
+        rows = rows.filter(day__gte=start)
+    if end is not None:
+        rows = rows.filter(day__lte=end)
+
+    total = 0
+    visits = []
+    for row in rows.values_list(target, 'day', 'user_id', 'ip_address', 'user_agent_ref__value').iterator(
+        chunk_size=chunk_size
+    ):
+        object_id, day, user_id, ip_address, user_agent = row
+        visits.append((object_id, day, visitor_key(user_id, ip_address, user_agent)))
+        if len(visits) >= chunk_size:
+            record_visitors(spec.event, visits)
+            total += len(visits)
+            visits = []
+    record_visitors(spec.event, visits)
+    return total + len(visits)
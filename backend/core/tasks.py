@@ -0,0 +1,31 @@
+"""
+Background tasks shared by the lead capture apps, image variants and thumbnails.
+"""
+from django.apps import apps
+
+from jobs.registry import task
+
+from .images import generate_variants
+from .leads import send_lead_notification
+from .thumbnails import render_queued
+
+
+@task('leads.notify')
+def notify_new_lead(payload):
+    """Send the new lead notification for a processed submission."""
+    model = apps.get_model(payload['model'])
+    submission = model.objects.filter(pk=payload['submission_id']).first()
+    if submission is not None:
+        send_lead_notification(submission, model._meta.verbose_name)
+
+
+@task('images.generate_variants')
+def generate_image_variants(payload):
+    """Write the resized variants of a stored upload."""
+    generate_variants(payload['directory'])
+
+
+@task('thumbnails.generate')
+def generate_thumbnail(payload):
+    """Create a derivative that was missing when its URL was asked for."""
+    render_queued(payload['name'], payload['spec'], payload['format'])
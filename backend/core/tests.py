@@ -0,0 +1,695 @@
+"""
+Tests for HyperLogLog unique-visitor sketches against exact counts, for
+index usage of the public list endpoints, incremental sitemaps, image
+variants and thumbnails.
+"""
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+from PIL import Image
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from blog.models import BlogPost
+from case_studies.models import CaseStudy
+from jobs.models import Job
+from jobs.queue import claim_jobs, run_job
+from portfolio.models import Portfolio
+from resources.models import Resource, ResourceCategory, ResourceType, ResourceView
+from services.models import CompanyStats, Service
+from team.models import TeamMember
+from testimonials.models import Testimonial
+
+from . import images, ratelimit, thumbnails
+from .cache import bump_cache_version, cache_version
+from .explain import explain, plan_nodes, scans
+from .hll import HyperLogLog
+from .images import InvalidImage, generate_variants, process_upload, store_upload, variant_formats
+from .models import DailyEventCount, UserAgent, VisitorSketch
+from .partitions import (
+    add_months, create_partition, ensure_partitions, is_partitioned, list_partitions, month_start, partition_name,
+    partition_table, unpartition_table
+)
+from .ratelimit import TokenBucketLimiter, TokenBucketThrottle, get_client_ip, rate_limited
+from .sitemaps import build_sitemaps, get_storage, read_manifest
+from .thumbnails import derivative_path, prune, thumbnail_url
+from .sketches import ALL_OBJECTS, record_visitors, unique_visitors
+
+
+def assert_close(test, estimate, exact, sketch=None):
+    # Three standard errors, plus a little slack for tiny counts
+    tolerance = 3 * (sketch or HyperLogLog()).standard_error * exact + 2
+    test.assertLessEqual(abs(estimate - exact), tolerance, f'estimate {estimate} vs exact {exact}')
+
+
+class CacheVersionTests(SimpleTestCase):
+    """Versions are started on first read, stay stable and only grow when bumped."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_stable_until_bumped(self):
+        version = cache_version('test:version')
+        self.assertEqual(cache_version('test:version'), version)
+
+        bump_cache_version('test:version')
+
+        self.assertGreater(cache_version('test:version'), version)
+
+
+class HyperLogLogTests(SimpleTestCase):
+    """Estimates, merging and serialization of a single sketch."""
+
+    def test_estimates_match_exact_counts(self):
+        for exact in (0, 1, 10, 1000, 50000):
+            sketch = HyperLogLog().update(f'visitor-{i}' for i in range(exact))
+            assert_close(self, sketch.count(), exact, sketch)
+
+    def test_repeated_values_are_counted_once(self):
+        sketch = HyperLogLog().update(f'visitor-{i % 500}' for i in range(20000))
+        assert_close(self, sketch.count(), 500, sketch)
+
+    def test_merge_estimates_union(self):
+        first = HyperLogLog().update(f'visitor-{i}' for i in range(0, 6000))
+        second = HyperLogLog().update(f'visitor-{i}' for i in range(4000, 10000))
+        combined = HyperLogLog().update(f'visitor-{i}' for i in range(10000))
+
+        self.assertTrue(first.merge(second))
+        self.assertEqual(first.registers, combined.registers)
+        self.assertFalse(first.merge(second))
+        assert_close(self, first.count(), 10000, first)
+
+    def test_round_trips_through_bytes(self):
+        sketch = HyperLogLog(precision=10).update(range(300))
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+
+        self.assertEqual(restored.precision, 10)
+        self.assertEqual(restored.registers, sketch.registers)
+        # Mostly empty sketches compress to a few dozen bytes
+        self.assertLess(len(HyperLogLog().update(['one']).to_bytes()), 100)
+
+    def test_rejects_mismatched_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+
+class VisitorSketchTests(TestCase):
+    """Stored daily sketches answer range and multi-object queries."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.start = date(2026, 3, 1)
+        self.exact = {}
+        visits = []
+        for offset in range(10):
+            day = self.start + timedelta(days=offset)
+            for object_id in ('a', 'b', 'c'):
+                visitors = {f'user:{rng.randrange(3000)}' for _ in range(rng.randrange(200, 600))}
+                self.exact[(object_id, day)] = visitors
+                visits.extend((object_id, day, visitor) for visitor in visitors)
+        rng.shuffle(visits)
+        # Several batches, as separate flushes would write them
+        for index in range(0, len(visits), 2500):
+            record_visitors('test.view', visits[index:index + 2500])
+
+    def exact_count(self, object_ids, start, end):
+        return len(set().union(*(
+            visitors for (object_id, day), visitors in self.exact.items()
+            if object_id in object_ids and start <= day <= end
+        )))
+
+    def test_one_sketch_per_object_and_day(self):
+        self.assertEqual(VisitorSketch.objects.filter(event='test.view').count(), 10 * 4)
+        self.assertTrue(VisitorSketch.objects.filter(object_id=ALL_OBJECTS, day=self.start).exists())
+
+    def test_unique_visitors_over_ranges(self):
+        end = self.start + timedelta(days=9)
+        middle = self.start + timedelta(days=3)
+        cases = [
+            (['a'], self.start, self.start),
+            (['a'], self.start, end),
+            (['b', 'c'], middle, end),
+        ]
+        for object_ids, start, stop in cases:
+            assert_close(
+                self,
+                unique_visitors('test.view', object_ids, start, stop),
+                self.exact_count(object_ids, start, stop)
+            )
+
+    def test_site_wide_count_covers_all_objects(self):
+        end = self.start + timedelta(days=9)
+        assert_close(
+            self,
+            unique_visitors('test.view', start=self.start, end=end),
+            self.exact_count({'a', 'b', 'c'}, self.start, end)
+        )
+
+    def test_recording_again_changes_nothing(self):
+        before = unique_visitors('test.view', ['a'])
+        visits = [('a', self.start, visitor) for visitor in self.exact[('a', self.start)]]
+        record_visitors('test.view', visits)
+        self.assertEqual(unique_visitors('test.view', ['a']), before)
+        self.assertEqual(unique_visitors('test.view', ['missing']), 0)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are PostgreSQL specific')
+class ListIndexUsageTests(TestCase):
+    """Each public list query is served by its partial index, not a sort over a full scan."""
+
+    # endpoint -> (table, index expected to serve its default list query)
+    ENDPOINTS = {
+        '/api/v1/services/': ('services_service', 'service_active_order_idx'),
+        '/api/v1/stats/': ('services_companystats', 'stats_active_order_idx'),
+        '/api/v1/team/': ('team_teammember', 'team_active_order_idx'),
+        '/api/v1/testimonials/': ('testimonials_testimonial', 'testimonial_active_order_idx'),
+        '/api/v1/resources/': ('resources_resource', 'resource_active_list_idx'),
+        '/api/v1/portfolio/': ('portfolio_portfolio', 'portfolio_pub_order_idx'),
+        '/api/v1/case-studies/': ('case_studies_casestudy', 'case_study_pub_order_idx'),
+        '/api/v1/blog/posts/': ('blog_blogpost', 'blog_post_pub_list_idx'),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        author = TeamMember.objects.create(name='Author', role=TeamMember.ROLE_CHOICES[0][0], bio='Bio')
+        resource_type = ResourceType.objects.create(name='Guide', slug='guide')
+        resource_category = ResourceCategory.objects.create(name='Backend', slug='backend')
+        for i in range(30):
+            # A mix of visible and hidden rows, as the partial indexes skip the latter
+            visible = i % 3 != 0
+            Service.objects.create(
+                title=f'Service {i}', short_desc='Service', long_desc='Service', category='web', order=i,
+                is_active=visible
+            )
+            CompanyStats.objects.create(name=f'stat-{i}', value=i, label='Stat', order=i, is_active=visible)
+            TeamMember.objects.create(
+                name=f'Member {i}', role=TeamMember.ROLE_CHOICES[0][0], bio='Bio', order=i, is_active=visible
+            )
+            Testimonial.objects.create(client=f'Client {i}', quote='Great', order=i, is_active=visible)
+            Resource.objects.create(
+                title=f'Resource {i}', slug=f'resource-{i}', description='Resource', type=resource_type,
+                category=resource_category, order=i, is_active=visible
+            )
+            Portfolio.objects.create(
+                title=f'Project {i}', description='Project', category='web', client='Client', year='2024',
+                order=i, status='published' if visible else 'draft'
+            )
+            CaseStudy.objects.create(
+                title=f'Case {i}', summary='Case', description='Case', client_name='Client', client_industry='Retail',
+                category='web', project_duration='3 months', team_size='4', challenge='-', solution='-',
+                approach='-', order=i, is_published=visible
+            )
+            BlogPost.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', body='Post', author=author, order=i,
+                status='published' if visible else 'draft'
+            )
+        with connection.cursor() as cursor:
+            for table, _ in cls.ENDPOINTS.values():
+                cursor.execute(f'ANALYZE {table}')
+
+    def list_query(self, url, table):
+        """Return the SQL of the ordered list query ``url`` runs against ``table``."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        candidates = [
+            query['sql'] for query in queries
+            if f'FROM "{table}"' in query['sql'] and 'ORDER BY' in query['sql']
+        ]
+        self.assertTrue(candidates, f'{url} ran no ordered query on {table}')
+        return candidates[0]
+
+    def test_list_endpoints_use_their_indexes(self):
+        for url, (table, index) in self.ENDPOINTS.items():
+            with self.subTest(url=url):
+                plan = explain(self.list_query(url, table))
+                used = scans(plan)
+                self.assertIn(index, [name for _, relation, name in used if relation == table], used)
+                self.assertNotIn('Sort', [node['Node Type'] for node in plan_nodes(plan)], used)
+
+
+@mock.patch('core.sitemaps.SITEMAP_LIMIT', 2)
+class SitemapBuildTests(TestCase):
+    """Sitemaps only rewrite the files whose rows changed."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        storage = override_settings(
+            SITEMAP_BASE_URL='https://example.com',
+            SITEMAP_STORAGE={
+                'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': directory}
+            },
+        )
+        storage.enable()
+        self.addCleanup(storage.disable)
+        self.author = TeamMember.objects.create(name='Author', role=TeamMember.ROLE_CHOICES[0][0], bio='Bio')
+        self.posts = [self.create_post(i) for i in range(5)]
+
+    def create_post(self, i):
+        # Ordered ids, so the key ranges of the files are predictable
+        return BlogPost.objects.create(
+            id=str(uuid.UUID(int=i + 1)), title=f'Post {i}', slug=f'post-{i}', body='Body', author=self.author,
+            status='published', published_at=django_timezone.now() - timedelta(days=1)
+        )
+
+    def post_urls(self):
+        """Return the post URLs of each sitemap file, in key order."""
+        storage = get_storage()
+        files = []
+        for chunk in read_manifest(storage)['sections']['blog']['chunks']:
+            with storage.open(chunk['name'], 'rb') as handle:
+                content = gzip.decompress(handle.read()).decode()
+            files.append([line.split('/')[-1] for line in content.split('</loc>')[:-1]])
+        return files
+
+    def test_builds_are_incremental(self):
+        self.assertEqual(build_sitemaps()['blog'], 3)
+        self.assertEqual(self.post_urls(), [['post-0', 'post-1'], ['post-2', 'post-3'], ['post-4']])
+        self.assertEqual(build_sitemaps()['blog'], 0)
+
+        self.posts[2].title = 'Renamed'
+        self.posts[2].save()
+        self.assertEqual(build_sitemaps()['blog'], 1)
+
+        self.posts[0].status = 'draft'
+        self.posts[0].save()
+        self.create_post(5)
+        self.create_post(6)
+        # The first file shrinks and the last one grows past the limit into a new file
+        self.assertEqual(build_sitemaps()['blog'], 3)
+        self.assertEqual(self.post_urls(), [['post-1'], ['post-2', 'post-3'], ['post-4', 'post-5'], ['post-6']])
+
+    def test_lists_only_frontend_routes(self):
+        Service.objects.create(
+            title='Web', slug='web', short_desc='Web', long_desc='Web', category=Service.CATEGORY_CHOICES[0][0]
+        )
+
+        self.assertEqual(set(build_sitemaps()), {'blog', 'services'})
+        storage = get_storage()
+        with storage.open('sitemap-services-1.xml.gz', 'rb') as handle:
+            self.assertIn('<loc>https://example.com/services/web</loc>', gzip.decompress(handle.read()).decode())
+
+    def test_serves_index_and_files(self):
+        build_sitemaps()
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        index = b''.join(response.streaming_content).decode()
+        self.assertIn('<loc>https://example.com/sitemaps/sitemap-blog-1.xml.gz</loc>', index)
+
+        response = self.client.get('/sitemaps/sitemap-blog-1.xml.gz')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn(
+            '<loc>https://example.com/blog/post-0</loc>',
+            gzip.decompress(b''.join(response.streaming_content)).decode()
+        )
+        self.assertEqual(self.client.get('/sitemaps/manifest.json').status_code, 404)
+
+
+@override_settings(IMAGE_VARIANT_WIDTHS=[100, 200, 800])
+class ImagePipelineTests(SimpleTestCase):
+    """Uploads are stored with resized variants, a placeholder and a srcset per format."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.storage = FileSystemStorage(location=directory, base_url='/media/')
+
+    def upload(self, mode='RGB', image_format='JPEG', size=(400, 300)):
+        buffer = io.BytesIO()
+        Image.new(mode, size, (200, 100, 50, 0) if mode == 'RGBA' else (200, 100, 50)).save(buffer, image_format)
+        return SimpleUploadedFile(f'upload.{image_format.lower()}', buffer.getvalue())
+
+    def test_variants_and_srcset(self):
+        manifest = process_upload(self.upload(), 'images', storage=self.storage)
+        self.assertEqual((manifest['width'], manifest['height']), (400, 300))
+        self.assertTrue(manifest['placeholder'].startswith('data:image/'))
+        self.assertTrue(self.storage.exists(manifest['original']['name']))
+
+        formats = variant_formats()
+        # Widths past the original are capped to it
+        self.assertEqual(
+            sorted({(variant['width'], variant['height']) for variant in manifest['variants']}),
+            [(100, 75), (200, 150), (400, 300)]
+        )
+        self.assertEqual(len(manifest['variants']), 3 * len(formats))
+        self.assertEqual(len(manifest['srcset']), len(formats))
+        self.assertTrue(manifest['srcset']['image/jpeg'].endswith('/400w.jpg 400w'))
+
+    def test_store_upload_leaves_variants_to_generate_variants(self):
+        manifest = store_upload(self.upload(), 'images', storage=self.storage)
+        self.assertTrue(manifest['pending'])
+        self.assertEqual(manifest['variants'], [])
+        self.assertEqual(manifest['srcset'], {'image/jpeg': f"{manifest['original']['url']} 400w"})
+        self.assertEqual(images.read_manifest(manifest['directory'], self.storage), manifest)
+
+        generated = generate_variants(manifest['directory'], self.storage)
+
+        self.assertFalse(generated['pending'])
+        self.assertEqual(len(generated['variants']), 3 * len(variant_formats()))
+        self.assertEqual(images.read_manifest(manifest['directory'], self.storage), generated)
+
+    def test_generate_variants_can_be_retried(self):
+        manifest = store_upload(self.upload(), 'images', storage=self.storage)
+        generate_variants(manifest['directory'], self.storage)
+        stored = images.read_manifest(manifest['directory'], self.storage)
+
+        # A retry after a partial run overwrites the same files
+        with open(self.storage.path(f"{manifest['directory']}/manifest.json"), 'w') as handle:
+            handle.write(json.dumps({**stored, 'pending': True}))
+        self.assertEqual(generate_variants(manifest['directory'], self.storage), stored)
+        self.assertEqual(len(self.storage.listdir(manifest['directory'])[1]), len(stored['variants']) + 2)
+
+    def test_transparent_images_fall_back_to_png(self):
+        manifest = process_upload(self.upload('RGBA', 'PNG'), 'images', storage=self.storage)
+        self.assertIn('image/png', manifest['srcset'])
+        self.assertNotIn('image/jpeg', manifest['srcset'])
+
+    def test_rejects_non_images(self):
+        with self.assertRaises(InvalidImage):
+            process_upload(SimpleUploadedFile('upload.jpg', b'not an image'), 'images', storage=self.storage)
+
+
+class ThumbnailTests(TestCase):
+    """Image fields are exposed as cached, immutable derivatives."""
+
+    def setUp(self):
+        # The digest index would point at the previous test's files
+        cache.clear()
+        for setting in ('MEDIA_ROOT', 'THUMBNAIL_ROOT'):
+            directory = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, directory)
+            override = override_settings(**{setting: directory})
+            override.enable()
+            self.addCleanup(override.disable)
+
+    def create_member(self, name='Jane', size=(600, 400), precompute=True):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (20, 120, 200)).save(buffer, 'JPEG')
+        # Thumbnails are made once the save commits
+        with self.captureOnCommitCallbacks(execute=precompute):
+            return TeamMember.objects.create(
+                name=name, role=TeamMember.ROLE_CHOICES[0][0], bio='Bio',
+                avatar=SimpleUploadedFile(f'{name.lower()}.jpg', buffer.getvalue())
+            )
+
+    def test_serializer_url_serves_resized_immutable_file(self):
+        member = self.create_member()
+        url = self.client.get(f'/api/v1/team/{member.pk}/').json()['avatar_url']
+        self.assertRegex(url, r'^/thumbnails/avatar/[0-9a-f]{12}/team/avatars/jane.*\.jpg\.webp$')
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(Image.open(io.BytesIO(b''.join(response.streaming_content))).size, (256, 256))
+
+    def test_missing_thumbnail_is_queued_not_rendered(self):
+        member = self.create_member(precompute=False)
+
+        with mock.patch('core.thumbnails.render', wraps=thumbnails.render) as render:
+            urls = [thumbnail_url(member.avatar, 'avatar') for _ in range(2)]
+            render.assert_not_called()
+        self.assertEqual(urls, [member.avatar.url] * 2)
+        self.assertEqual(Job.objects.filter(name='thumbnails.generate').count(), 1)
+
+        self.assertTrue(run_job(claim_jobs('worker')[0]))
+
+        self.assertRegex(thumbnail_url(member.avatar, 'avatar'), r'^/thumbnails/avatar/[0-9a-f]{12}/')
+
+    def test_storage_errors_fall_back_to_the_original(self):
+        member = self.create_member(precompute=False)
+
+        with mock.patch('core.thumbnails.current_digest', side_effect=RuntimeError('storage down')):
+            self.assertEqual(thumbnail_url(member.avatar, 'avatar'), member.avatar.url)
+        with mock.patch.object(FileSystemStorage, 'exists', side_effect=RuntimeError('storage down')):
+            response = self.client.get(f'/thumbnails/avatar/{"0" * 12}/{member.avatar.name}.webp')
+        self.assertEqual(response.status_code, 404)
+
+    def test_evicted_thumbnails_are_recreated(self):
+        url = thumbnail_url(self.create_member().avatar, 'avatar')
+        self.assertEqual(prune(0), 1)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # An outdated hash redirects to the current file
+        stale = url.replace(url.split('/')[3], '0' * 12)
+        self.assertRedirects(self.client.get(stale), url, fetch_redirect_response=False)
+
+    def test_prune_evicts_least_recently_used(self):
+        old, recent = self.create_member('Old'), self.create_member('Recent')
+        old_path = derivative_path(old.avatar.name, 'avatar', 'webp', thumbnail_url(old.avatar, 'avatar').split('/')[3])
+        recent_path = derivative_path(
+            recent.avatar.name, 'avatar', 'webp', thumbnail_url(recent.avatar, 'avatar').split('/')[3]
+        )
+        os.utime(old_path, (time.time() - 3600, time.time() - 3600))
+        # One byte over the cap: evicting the older file is enough
+        self.assertEqual(prune(os.path.getsize(old_path) + os.path.getsize(recent_path) - 1), 1)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(recent_path))
+
+    def test_rejects_unknown_specs_and_paths(self):
+        self.assertEqual(self.client.get('/thumbnails/huge/000000000000/team/avatars/a.jpg.webp').status_code, 404)
+        self.assertEqual(self.client.get('/thumbnails/avatar/000000000000/../secret.jpg.webp').status_code, 404)
+        # Only the specs a field exposes, and only files under its upload directory
+        self.assertEqual(self.client.get('/thumbnails/hero/000000000000/team/avatars/a.jpg.webp').status_code, 404)
+        self.assertEqual(self.client.get('/thumbnails/avatar/000000000000/other/a.jpg.webp').status_code, 404)
+
+    def test_made_up_hash_redirects_without_rendering(self):
+        url = thumbnail_url(self.create_member().avatar, 'avatar')
+        bogus = url.replace(url.split('/')[3], 'f' * 12)
+
+        with mock.patch('core.thumbnails.render') as render:
+            for _ in range(3):
+                self.assertRedirects(self.client.get(bogus), url, fetch_redirect_response=False)
+            render.assert_not_called()
+
+    def test_evicted_current_thumbnail_is_rendered_once(self):
+        url = thumbnail_url(self.create_member().avatar, 'avatar')
+        prune(0)
+        bogus = url.replace(url.split('/')[3], 'f' * 12)
+
+        with mock.patch('core.thumbnails.render', wraps=thumbnails.render) as render:
+            self.assertRedirects(self.client.get(bogus), url, fetch_redirect_response=False)
+            self.assertRedirects(self.client.get(bogus), url, fetch_redirect_response=False)
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(render.call_count, 1)
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True, RATE_LIMITS={'test': '3/min'}, RATE_LIMIT_TRUSTED_IPS=[],
+    TRUSTED_PROXIES=['127.0.0.1', '10.0.0.0/8']
+)
+class RateLimitTests(SimpleTestCase):
+    """Token buckets allow a burst, refill continuously and answer 429 when empty."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.limiter = TokenBucketLimiter(key_prefix='ratelimit-test')
+
+    def test_burst_then_reject(self):
+        results = [self.limiter.hit('test', '203.0.113.7', 3, 60)[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+        # Another client has its own bucket
+        self.assertTrue(self.limiter.hit('test', '203.0.113.8', 3, 60)[0])
+
+    def test_tokens_refill_over_time(self):
+        now = time.time()
+        with mock.patch('core.ratelimit.time.time', return_value=now):
+            for _ in range(3):
+                self.limiter.hit('test', '203.0.113.7', 3, 60)
+            allowed, retry_after = self.limiter.hit('test', '203.0.113.7', 3, 60)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 20, places=3)
+
+        # One token every 20 seconds
+        with mock.patch('core.ratelimit.time.time', return_value=now + 20):
+            self.assertEqual([self.limiter.hit('test', '203.0.113.7', 3, 60)[0] for _ in range(2)], [True, False])
+
+    def test_busy_bucket_is_rejected_not_bypassed(self):
+        cache.add('ratelimit-test:test:203.0.113.7:lock', 1)
+
+        with mock.patch('core.ratelimit.time.sleep'):
+            allowed, retry_after = self.limiter.hit('test', '203.0.113.7', 3, 60)
+
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 20)
+
+    def test_redis_script_is_registered_once(self):
+        caches_setting = {'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379/0',
+        }}
+        ratelimit._gcra_script.cache_clear()
+        self.addCleanup(ratelimit._gcra_script.cache_clear)
+
+        with override_settings(CACHES=caches_setting), mock.patch('redis.Redis.from_url') as from_url:
+            from_url.return_value.register_script.return_value.return_value = [1, '0']
+            results = [self.limiter.hit('test', '203.0.113.7', 3, 60) for _ in range(2)]
+
+        self.assertEqual(results, [(True, 0.0), (True, 0.0)])
+        from_url.assert_called_once_with('redis://cache:6379/0')
+        from_url.return_value.register_script.assert_called_once_with(ratelimit.GCRA_SCRIPT)
+
+    def test_rate_limited_view_answers_429_with_retry_after(self):
+        view = rate_limited('test')(lambda request: HttpResponse('ok'))
+
+        responses = [view(self.factory.post('/', REMOTE_ADDR='203.0.113.9')) for _ in range(4)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200, 429])
+        self.assertEqual(responses[-1]['Retry-After'], '20')
+
+    def test_throttled_api_view_answers_429_with_retry_after(self):
+        class LimitedView(APIView):
+            authentication_classes = []
+            permission_classes = []
+            throttle_classes = [TokenBucketThrottle]
+            throttle_scopes = {'post': 'test'}
+
+            def post(self, request):
+                return Response({'ok': True})
+
+        view = LimitedView.as_view()
+        responses = [view(self.factory.post('/', REMOTE_ADDR='203.0.113.10')) for _ in range(4)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200, 429])
+        self.assertEqual(responses[-1]['Retry-After'], '20')
+
+    def test_client_ip_is_right_most_untrusted_hop(self):
+        def client_ip(remote_addr, forwarded_for=None):
+            extra = {'HTTP_X_FORWARDED_FOR': forwarded_for} if forwarded_for else {}
+            return get_client_ip(self.factory.get('/', REMOTE_ADDR=remote_addr, **extra))
+
+        # A spoofed left-most entry is ignored
+        self.assertEqual(client_ip('127.0.0.1', '1.2.3.4, 203.0.113.7'), '203.0.113.7')
+        self.assertEqual(client_ip('127.0.0.1', '1.2.3.4, 203.0.113.7, 10.0.0.5'), '203.0.113.7')
+        # Only trusted proxies are believed
+        self.assertEqual(client_ip('198.51.100.1', '1.2.3.4'), '198.51.100.1')
+        self.assertEqual(client_ip('127.0.0.1', 'unknown'), '127.0.0.1')
+        self.assertEqual(client_ip('203.0.113.7'), '203.0.113.7')
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Partitioning is PostgreSQL specific')
+class EventPartitionTests(TestCase):
+    """Event rows are routed to monthly partitions, which compact_events rolls up and drops."""
+
+    TABLE = 'resources_resourceview'
+
+    def setUp(self):
+        UserAgent.clear_cache()
+        resource_type = ResourceType.objects.create(name='Guide', slug='guide')
+        resource_category = ResourceCategory.objects.create(name='Backend', slug='backend')
+        self.resource = Resource.objects.create(
+            title='Resource', slug='resource', description='Resource', type=resource_type,
+            category=resource_category
+        )
+        self.current = month_start(date.today())
+        self.old = add_months(self.current, -14)
+        # DDL is transactional on PostgreSQL, so this is undone after each test; it
+        # cannot alter tables with deferred foreign key checks still pending
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        # Start from the plain table, whether or not migrations partitioned it
+        with connection.schema_editor() as editor:
+            unpartition_table(editor, self.TABLE, 'viewed_at')
+        # Rows must exist before partitioning for their month to get a partition
+        for ip in ('10.0.0.1', '10.0.0.1', '10.0.0.2'):
+            self.view(self.old, ip)
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        with connection.schema_editor() as editor:
+            partition_table(editor, self.TABLE, 'viewed_at', months_ahead=1)
+
+    def view(self, month, ip='10.0.0.1'):
+        view = ResourceView.objects.create(resource=self.resource, ip_address=ip)
+        at = datetime(month.year, month.month, 10, 12, tzinfo=dt_timezone.utc)
+        ResourceView.objects.filter(pk=view.pk).update(viewed_at=at)
+        return view
+
+    def locations(self):
+        """Return ``{view id: partition}``."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id, tableoid::regclass::text FROM {self.TABLE}')
+            return dict(cursor.fetchall())
+
+    def test_partitions_cover_oldest_row_through_months_ahead(self):
+        partitions = list_partitions(self.TABLE)
+
+        self.assertEqual(min(partitions), self.old)
+        self.assertEqual(max(partitions), add_months(self.current, 1))
+        self.assertEqual(len(partitions), 16)
+
+    def test_partitioning_is_idempotent_and_reversible(self):
+        partitions = list_partitions(self.TABLE)
+        with connection.schema_editor() as editor:
+            partition_table(editor, self.TABLE, 'viewed_at')
+        self.assertEqual(list_partitions(self.TABLE), partitions)
+
+        with connection.schema_editor() as editor:
+            unpartition_table(editor, self.TABLE, 'viewed_at')
+
+        self.assertFalse(is_partitioned(self.TABLE))
+        self.assertEqual(ResourceView.objects.count(), 3)
+        # The id sequence carries on past the copied rows
+        latest = ResourceView.objects.order_by('pk').last()
+        self.assertGreater(self.view(self.current).pk, latest.pk)
+
+    def test_rows_are_routed_by_month(self):
+        recent = self.view(self.current)
+        future = self.view(add_months(self.current, 6))
+
+        locations = self.locations()
+        self.assertEqual(locations[recent.pk], partition_name(self.TABLE, self.current))
+        self.assertEqual(locations[future.pk], f'{self.TABLE}_default')
+
+    def test_new_partition_takes_rows_from_default(self):
+        month = add_months(self.current, 6)
+        future = self.view(month)
+
+        self.assertTrue(create_partition(self.TABLE, 'viewed_at', month))
+        self.assertFalse(create_partition(self.TABLE, 'viewed_at', month))
+        self.assertEqual(self.locations()[future.pk], partition_name(self.TABLE, month))
+        self.assertEqual(
+            ensure_partitions(self.TABLE, 'viewed_at', months_ahead=2, today=self.current),
+            [partition_name(self.TABLE, add_months(self.current, 2))]
+        )
+
+    def test_compact_events_rolls_up_and_drops_old_partitions(self):
+        recent = self.view(self.current)
+
+        call_command('compact_events', '--dry-run', stdout=io.StringIO())
+        self.assertIn(self.old, list_partitions(self.TABLE))
+
+        output = io.StringIO()
+        call_command('compact_events', '--retain-months', '12', '--months-ahead', '1', stdout=output)
+
+        self.assertNotIn(self.old, list_partitions(self.TABLE))
+        self.assertIn(partition_name(self.TABLE, self.old), output.getvalue())
+        self.assertEqual(list(ResourceView.objects.values_list('pk', flat=True)), [recent.pk])
+        daily = DailyEventCount.objects.get(event='resources.view')
+        self.assertEqual(
+            (daily.object_id, daily.day, daily.count, daily.unique_visitors),
+            (str(self.resource.pk), self.old.replace(day=10), 3, 2)
+        )
+
+        # Re-running finds nothing left to compact
+        call_command('compact_events', '--retain-months', '12', stdout=io.StringIO())
+        self.assertEqual(DailyEventCount.objects.get(event='resources.view').count, 3)
@@ -0,0 +1,324 @@
+"""
+Resized derivatives of model images, cached on local disk.
+
+A derivative is keyed by the source file name, a named size from ``SPECS``
+and a format, and stored under ``THUMBNAIL_ROOT`` with a hash of its
+content in the file name. Its URL carries the same hash::
+
+    /thumbnails/avatar/3f1c2a9b8e7d/team/avatars/jane.jpg.webp
+
+so it can be served with a year-long ``immutable`` Cache-Control: a new
+source image gives a new hash and a new URL. Derivatives are made ahead of
+time when a model with images is saved (``core.signals``). Building a URL
+never renders: while a derivative is missing, ``thumbnail_url`` returns the
+original's URL and queues a ``thumbnails.generate`` job. The serving view redirects requests for any other hash
+to the current derivative and only renders one when the current
+derivative itself is missing (evicted, or never made), so made-up hashes
+cannot make it resize images over and over.
+
+The directory is an LRU cache: serving a file refreshes its modification
+time, and once the total size passes ``THUMBNAIL_CACHE_MAX_BYTES`` the least
+recently used files are deleted, checked at most every
+``THUMBNAIL_PRUNE_INTERVAL`` seconds (or with ``manage.py prune_thumbnails``).
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import namedtuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from jobs.queue import enqueue
+
+from .filedelivery import serve_file
+from .images import VARIANT_FORMATS, encode
+
+logger = logging.getLogger(__name__)
+
+Spec = namedtuple('Spec', ['width', 'height', 'crop'])
+
+# Named sizes; cropped specs fill the box exactly, others fit inside it
+SPECS = {
+    'avatar': Spec(256, 256, True),
+    'card': Spec(640, 400, True),
+    'hero': Spec(1600, 900, False),
+    'logo': Spec(240, 120, False),
+    'thumbnail': Spec(480, 320, True),
+}
+
+INDEX_KEY = 'thumbnail:{}'
+INDEX_TIMEOUT = 60 * 60 * 24
+# Set while a render job for a derivative is queued, so misses queue it once
+QUEUED_KEY = '{}:queued'
+QUEUED_TIMEOUT = 60 * 10
+PRUNE_KEY = 'thumbnail:prune'
+
+# Refresh a served file's modification time at most this often (seconds)
+TOUCH_INTERVAL = 60 * 60
+
+# Evict down to this share of the cap, so pruning does not run on every write
+PRUNE_TARGET = 0.9
+
+DIGEST_RE = re.compile(r'^[0-9a-f]{12}$')
+EXTENSIONS = {extension: name for name, (_, _, extension, _) in VARIANT_FORMATS.items()}
+
+
+def default_format():
+    """Format derivatives are encoded in: ``THUMBNAIL_FORMAT`` if Pillow supports it, else PNG."""
+    name = settings.THUMBNAIL_FORMAT
+    if name in VARIANT_FORMATS and (name in ('jpeg', 'png') or features.check(name)):
+        return name
+    return 'png'
+
+
+def _extension(variant_format):
+    return VARIANT_FORMATS[variant_format][2]
+
+
+def _index_key(name, spec, variant_format):
+    return INDEX_KEY.format(hashlib.blake2b(f'{spec}:{variant_format}:{name}'.encode(), digest_size=16).hexdigest())
+
+
+def _safe_name(name):
+    """Reject source names that would escape the derivative directory."""
+    parts = name.replace('\\', '/').split('/')
+    if not name or name.startswith('/') or '..' in parts or '' in parts:
+        raise SuspiciousFileOperation(f'Invalid image name: {name}')
+    return name
+
+
+def derivative_path(name, spec, variant_format, digest):
+    """Path on disk of a derivative."""
+    return os.path.join(
+        settings.THUMBNAIL_ROOT, spec, f'{_safe_name(name)}.{digest}.{_extension(variant_format)}'
+    )
+
+
+def _stored_digests(name, spec, variant_format):
+    """Digests of the derivatives for a key that are on disk, newest first."""
+    directory = os.path.join(settings.THUMBNAIL_ROOT, spec, os.path.dirname(_safe_name(name)))
+    prefix, suffix = f'{os.path.basename(name)}.', f'.{_extension(variant_format)}'
+    try:
+        entries = [
+            entry for entry in os.scandir(directory)
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+            and DIGEST_RE.match(entry.name[len(prefix):-len(suffix)])
+        ]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return [entry.name[len(prefix):-len(suffix)] for entry in entries]
+
+
+def render(storage, name, spec, variant_format):
+    """Return the encoded bytes of ``name`` resized to ``spec``."""
+    width, height, crop = SPECS[spec]
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        if crop:
+            image = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        else:
+            image.thumbnail((width, height), Image.LANCZOS)
+    return encode(image, variant_format)
+
+
+def generate(storage, name, spec, variant_format):
+    """Create the derivative of ``name`` for ``spec``, replacing older ones, and return its digest."""
+    content = render(storage, name, spec, variant_format)
+    digest = hashlib.blake2b(content, digest_size=6).hexdigest()
+    path = derivative_path(name, spec, variant_format, digest)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename, so readers never see a partial file
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(handle, 'wb') as output:
+        output.write(content)
+    os.replace(temporary, path)
+
+    for stale in _stored_digests(name, spec, variant_format):
+        if stale != digest:
+            try:
+                os.remove(derivative_path(name, spec, variant_format, stale))
+            except FileNotFoundError:
+                pass
+    cache.set(_index_key(name, spec, variant_format), digest, INDEX_TIMEOUT)
+
+    if cache.add(PRUNE_KEY, 1, settings.THUMBNAIL_PRUNE_INTERVAL):
+        prune()
+    return digest
+
+
+def current_digest(name, spec, variant_format):
+    """Return the digest of the current derivative without creating it, or None if there is none."""
+    key = _index_key(name, spec, variant_format)
+    digest = cache.get(key)
+    if digest:
+        return digest
+    stored = _stored_digests(name, spec, variant_format)
+    if stored:
+        cache.set(key, stored[0], INDEX_TIMEOUT)
+        return stored[0]
+    return None
+
+
+def get_digest(storage, name, spec, variant_format=None, refresh=False):
+    """Return the digest of the current derivative, creating it if there is none (or with ``refresh``)."""
+    variant_format = variant_format or default_format()
+    if not refresh:
+        digest = current_digest(name, spec, variant_format)
+        if digest:
+            return digest
+    return generate(storage, name, spec, variant_format)
+
+
+def url_for(name, spec, variant_format, digest):
+    """Public URL of a derivative."""
+    return f'{settings.THUMBNAIL_URL}{spec}/{digest}/{quote(name)}.{_extension(variant_format)}'
+
+
+def queue_render(name, spec, variant_format):
+    """Queue a job creating the derivative of ``name`` for ``spec``, unless one is already queued."""
+    key = QUEUED_KEY.format(_index_key(name, spec, variant_format))
+    if cache.add(key, 1, QUEUED_TIMEOUT):
+        try:
+            enqueue('thumbnails.generate', {'name': name, 'spec': spec, 'format': variant_format})
+        except Exception:
+            cache.delete(key)
+            raise
+
+
+def render_queued(name, spec, variant_format):
+    """Create a derivative queued by ``queue_render``."""
+    cache.delete(QUEUED_KEY.format(_index_key(name, spec, variant_format)))
+    storage = source_storage(name, spec)
+    if storage is None or not storage.exists(name):
+        return None
+    return get_digest(storage, name, spec, variant_format)
+
+
+def thumbnail_url(field_file, spec, variant_format=None):
+    """
+    URL of the ``spec`` derivative of an image field.
+
+    Never renders: while the derivative does not exist yet, or if it cannot
+    be looked up, this is the original's URL and a render job is queued.
+    """
+    if not field_file:
+        return None
+    variant_format = variant_format or default_format()
+    try:
+        digest = current_digest(field_file.name, spec, variant_format)
+        if digest is None:
+            queue_render(field_file.name, spec, variant_format)
+    except Exception:
+        logger.warning('Thumbnail lookup failed for %s', field_file.name, exc_info=True)
+        digest = None
+    if digest is None:
+        return field_file.url
+    return url_for(field_file.name, spec, variant_format, digest)
+
+
+def precompute(instance, fields, refresh=False):
+    """Create the derivatives ``{field: [spec, ...]}`` of ``instance`` that do not exist yet."""
+    for field, specs in fields.items():
+        field_file = getattr(instance, field)
+        if not field_file:
+            continue
+        for spec in specs:
+            try:
+                get_digest(field_file.storage, field_file.name, spec, refresh=refresh)
+            except Exception:
+                # Storage errors included; a later miss queues the render again
+                logger.warning('Could not create the %s thumbnail of %s', spec, field_file.name, exc_info=True)
+
+
+def prune(max_bytes=None):
+    """Delete least recently used derivatives until the cache is within its cap; return files deleted."""
+    max_bytes = settings.THUMBNAIL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    files = []
+    total = 0
+    for directory, _, names in os.walk(settings.THUMBNAIL_ROOT):
+        for file_name in names:
+            path = os.path.join(directory, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return 0
+
+    files.sort()
+    deleted = 0
+    for _, size, path in files:
+        if total <= max_bytes * PRUNE_TARGET:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def source_storage(name, spec):
+    """Storage of the image field whose uploads ``name`` belongs to, if that field exposes ``spec``."""
+    from .signals import THUMBNAIL_FIELDS
+
+    for model, fields in THUMBNAIL_FIELDS.items():
+        for field_name, specs in fields.items():
+            field = model._meta.get_field(field_name)
+            if spec in specs and isinstance(field.upload_to, str) and name.startswith(field.upload_to):
+                return field.storage
+    return None
+
+
+def serve_thumbnail(request, spec, digest, name, extension):
+    """Serve a derivative with immutable caching, re-creating the current one if it was evicted."""
+    variant_format = EXTENSIONS.get(extension)
+    storage = source_storage(name, spec) if spec in SPECS else None
+    if storage is None or variant_format is None:
+        raise Http404('Unknown thumbnail')
+    try:
+        path = derivative_path(name, spec, variant_format, digest)
+        if not os.path.exists(path):
+            current = current_digest(name, spec, variant_format)
+            if current is None or not os.path.exists(derivative_path(name, spec, variant_format, current)):
+                if not storage.exists(name):
+                    raise Http404('Image not found')
+                current = generate(storage, name, spec, variant_format)
+            if current != digest:
+                # Outdated or made-up hash
+                return HttpResponseRedirect(url_for(name, spec, variant_format, current))
+    except Http404:
+        raise
+    except (SuspiciousFileOperation, OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        raise Http404('Unknown thumbnail')
+    except Exception:
+        # Storage backend errors (e.g. S3 unreachable) surface as a missing thumbnail
+        logger.warning('Could not render thumbnail %s/%s', spec, name, exc_info=True)
+        raise Http404('Unknown thumbnail')
+
+    try:
+        if time.time() - os.stat(path).st_mtime > TOUCH_INTERVAL:
+            os.utime(path)
+    except FileNotFoundError:
+        raise Http404('Unknown thumbnail')
+
+    response = serve_file(request, path, as_attachment=False, content_type=VARIANT_FORMATS[variant_format][1])
+    if response.status_code in (200, 206, 304):
+        patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    return response
@@ -2,14 +2,23 @@
 URL configuration for KKEVO project.
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .sitemaps import sitemap_file, sitemap_index
+from .thumbnails import serve_thumbnail
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('api.urls')),
     path('api/v1/resources/', include('resources.urls')),
+    path('sitemap.xml', sitemap_index, name='sitemap-index'),
+    re_path(r'^sitemaps/(?P<name>[\w.-]+)$', sitemap_file, name='sitemap-file'),
+    re_path(
+        r'^thumbnails/(?P<spec>[a-z]+)/(?P<digest>[0-9a-f]{12})/(?P<name>.+)\.(?P<extension>[a-z]+)$',
+        serve_thumbnail, name='thumbnail'
+    ),
 ]
 
 # Serve static and media files in development
@@ -0,0 +1,48 @@
+"""
+Admin configuration for jobs app.
+"""
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin configuration for Job model."""
+
+    list_display = ['id', 'name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'locked_by', 'locked_at', 'last_error']
+
+    fieldsets = (
+        ('Job', {
+            'fields': ('name', 'payload', 'status')
+        }),
+        ('Retries', {
+            'fields': ('attempts', 'max_attempts', 'run_after', 'last_error')
+        }),
+        ('Worker', {
+            'fields': ('locked_by', 'locked_at'),
+            'classes': ('collapse',)
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'started_at', 'finished_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    actions = ['retry_jobs']
+
+    def retry_jobs(self, request, queryset):
+        """Requeue the selected jobs to run immediately."""
+        updated = queryset.exclude(status='running').update(
+            status='pending',
+            attempts=0,
+            run_after=timezone.now(),
+            finished_at=None,
+        )
+        self.message_user(request, f'{updated} job(s) requeued.')
+
+    retry_jobs.short_description = 'Retry selected jobs'
@@ -0,0 +1,15 @@
+"""
+Background jobs app configuration.
+"""
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = 'Background Jobs'
+
+    def ready(self):
+        """Register task handlers declared in each app's tasks module."""
+        autodiscover_modules('tasks')
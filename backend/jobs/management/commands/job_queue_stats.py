@@ -0,0 +1,34 @@
+"""
+Management command to report background job queue depth and latency.
+"""
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import purge_finished_jobs, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Show background job queue depth and processing latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=60,
+            help='Latency window in minutes (default: 60)'
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            help='Delete succeeded jobs that finished more than this many days ago'
+        )
+
+    def handle(self, *args, **options):
+        if options['purge_days'] is not None:
+            deleted = purge_finished_jobs(timedelta(days=options['purge_days']))
+            self.stdout.write(self.style.SUCCESS(f'Purged {deleted} finished job(s).'))
+
+        stats = queue_stats(window=timedelta(minutes=options['window']))
+        self.stdout.write(json.dumps(stats, indent=2))
@@ -0,0 +1,85 @@
+"""
+Management command to process background jobs with a pool of worker threads.
+"""
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from jobs.queue import claim_jobs, release_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Claim and run queued background jobs until interrupted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of worker threads (default: 4)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the queue is empty (default: 1.0)'
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help='Seconds after which a running job is considered abandoned (default: 600)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no due jobs remain instead of polling'
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        stale_after = timedelta(seconds=options['stale_after'])
+        worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        processed = failed = 0
+
+        self.stdout.write(f'Worker {worker_id} started with {workers} thread(s).')
+        released = release_stale_jobs(stale_after)
+        if released:
+            self.stdout.write(self.style.WARNING(f'Released {released} stale job(s).'))
+
+        last_release = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-worker') as pool:
+                while True:
+                    close_old_connections()
+                    jobs = claim_jobs(worker_id, limit=workers)
+                    if not jobs:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                    else:
+                        for succeeded in pool.map(self._run, jobs):
+                            processed += 1
+                            failed += not succeeded
+
+                    if time.monotonic() - last_release > stale_after.total_seconds():
+                        release_stale_jobs(stale_after)
+                        last_release = time.monotonic()
+        except KeyboardInterrupt:
+            self.stdout.write('Interrupted, shutting down.')
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s), {failed} failed.'))
+
+    @staticmethod
+    def _run(job):
+        """Run a job on a pool thread, which owns its own database connection."""
+        try:
+            return run_job(job)
+        finally:
+            connection.close()
@@ -0,0 +1,174 @@
+"""
+Database-backed job queue: enqueueing, claiming, execution and metrics.
+
+Jobs are written in the same transaction as the data they refer to, so a
+job exists if and only if its submission was committed. Workers claim
+batches with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of worker
+processes can share the table without handing out the same job twice.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max, Min
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+# Retry delay is RETRY_BASE_SECONDS * 2 ** (attempts - 1), capped at RETRY_MAX_SECONDS.
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 60 * 60
+
+# Running jobs whose lock is older than this are assumed to belong to a dead worker.
+DEFAULT_STALE_AFTER = timedelta(minutes=10)
+
+
+def enqueue(name, payload=None, delay=None, max_attempts=5):
+    """
+    Add a job to the queue.
+
+    Call inside the transaction that writes the job's data; the job only
+    becomes visible to workers once that transaction commits.
+    """
+    get_handler(name)
+    now = timezone.now()
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        run_after=now + delay if delay else now,
+        created_at=now,
+    )
+
+
+def retry_delay(attempts):
+    """Return the backoff before the next attempt."""
+    seconds = RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, RETRY_MAX_SECONDS))
+
+
+def claim_jobs(worker_id, limit=10):
+    """Lock and mark up to ``limit`` due jobs as running for ``worker_id``."""
+    now = timezone.now()
+    with transaction.atomic():
+        job_ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', run_after__lte=now)
+            .order_by('run_after')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not job_ids:
+            return []
+        Job.objects.filter(id__in=job_ids).update(
+            status='running',
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+    return list(Job.objects.filter(id__in=job_ids).order_by('run_after'))
+
+
+def run_job(job):
+    """
+    Execute a claimed job and record its outcome.
+
+    The handler's writes and the job's success commit together; if the
+    handler raises, they are rolled back and the failure is recorded on its own.
+    """
+    try:
+        with transaction.atomic():
+            get_handler(job.name)(job.payload)
+            job.status = 'succeeded'
+            job.finished_at = timezone.now()
+            job.locked_by = ''
+            job.locked_at = None
+            job.save(update_fields=['status', 'finished_at', 'locked_by', 'locked_at'])
+    except Exception as e:
+        now = timezone.now()
+        job.last_error = traceback.format_exc()
+        job.locked_by = ''
+        job.locked_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.finished_at = now
+            logger.error('Job %s (%s) failed permanently: %s', job.pk, job.name, e)
+        else:
+            job.status = 'pending'
+            job.finished_at = None
+            job.run_after = now + retry_delay(job.attempts)
+            logger.warning('Job %s (%s) failed, retrying at %s: %s', job.pk, job.name, job.run_after, e)
+        job.save(update_fields=['status', 'run_after', 'finished_at', 'last_error', 'locked_by', 'locked_at'])
+        return False
+    return True
+
+
+def release_stale_jobs(stale_after=DEFAULT_STALE_AFTER):
+    """Return jobs held by workers that stopped responding to the queue."""
+    return Job.objects.filter(
+        status='running',
+        locked_at__lt=timezone.now() - stale_after
+    ).update(status='pending', locked_by='', locked_at=None)
+
+
+def purge_finished_jobs(older_than):
+    """Delete succeeded jobs that finished before ``now - older_than``."""
+    deleted, _ = Job.objects.filter(
+        status='succeeded',
+        finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def _seconds(value):
+    """Convert an aggregated interval to seconds."""
+    return round(value.total_seconds(), 3) if value is not None else None
+
+
+def queue_stats(window=timedelta(hours=1)):
+    """
+    Return queue depth and processing latency.
+
+    Latency figures cover jobs that finished within ``window``: ``wait`` is
+    time spent queued before the last attempt started, ``run`` is handler
+    time and ``total`` is enqueue to completion.
+    """
+    now = timezone.now()
+
+    depth = {choice: 0 for choice, _ in Job.STATUS_CHOICES}
+    depth.update(dict(Job.objects.order_by().values_list('status').annotate(count=Count('id'))))
+
+    pending = Job.objects.filter(status='pending')
+    pending_by_task = dict(pending.order_by().values_list('name').annotate(count=Count('id')))
+    oldest_pending = pending.aggregate(oldest=Min('created_at'))['oldest']
+
+    duration = DurationField()
+    finished = Job.objects.filter(status='succeeded', finished_at__gte=now - window)
+    latency = finished.aggregate(
+        processed=Count('id'),
+        avg_wait=Avg(ExpressionWrapper(F('started_at') - F('created_at'), output_field=duration)),
+        avg_run=Avg(ExpressionWrapper(F('finished_at') - F('started_at'), output_field=duration)),
+        avg_total=Avg(ExpressionWrapper(F('finished_at') - F('created_at'), output_field=duration)),
+        max_total=Max(ExpressionWrapper(F('finished_at') - F('created_at'), output_field=duration)),
+    )
+
+    return {
+        'depth': depth,
+        'pending_by_task': pending_by_task,
+        'due': pending.filter(run_after__lte=now).count(),
+        'oldest_pending_age_seconds': _seconds(now - oldest_pending) if oldest_pending else None,
+        'failed_in_window': Job.objects.filter(status='failed', finished_at__gte=now - window).count(),
+        'window_seconds': int(window.total_seconds()),
+        'processed_in_window': latency['processed'],
+        'throughput_per_minute': round(latency['processed'] / (window.total_seconds() / 60), 2),
+        'latency_seconds': {
+            'avg_wait': _seconds(latency['avg_wait']),
+            'avg_run': _seconds(latency['avg_run']),
+            'avg_total': _seconds(latency['avg_total']),
+            'max_total': _seconds(latency['max_total']),
+        },
+    }
@@ -0,0 +1,28 @@
+"""
+Task registry for background jobs.
+"""
+
+_handlers = {}
+
+
+def task(name):
+    """Register the decorated function as the handler for ``name``."""
+    def decorator(func):
+        if name in _handlers and _handlers[name] is not func:
+            raise ValueError(f'Task "{name}" is already registered.')
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    """Return the handler registered for ``name``."""
+    try:
+        return _handlers[name]
+    except KeyError:
+        raise LookupError(f'No task registered as "{name}".') from None
+
+
+def registered_tasks():
+    """Return the names of all registered tasks."""
+    return sorted(_handlers)
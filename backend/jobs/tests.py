@@ -0,0 +1,111 @@
+"""
+Tests for the database job queue: enqueueing, claiming, running and retries.
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from contact.models import ContactSubmission
+from .models import Job
+from .queue import RETRY_MAX_SECONDS, claim_jobs, enqueue, retry_delay, run_job
+from .registry import task
+
+calls = []
+
+
+@task('tests.succeed')
+def succeed(payload):
+    calls.append(payload)
+
+
+@task('tests.fail')
+def fail(payload):
+    # Writes made before the error must not outlive it
+    enqueue('tests.succeed', {'from': 'failed handler'})
+    raise RuntimeError('boom')
+
+
+class JobQueueTests(TestCase):
+    """Jobs run once, retry with exponential backoff and roll back failed handlers."""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_checks_the_task_and_delay(self):
+        with self.assertRaises(LookupError):
+            enqueue('tests.unknown')
+
+        job = enqueue('tests.succeed', {'n': 1}, delay=timedelta(minutes=5))
+
+        self.assertEqual(job.status, 'pending')
+        self.assertGreater(job.run_after, timezone.now() + timedelta(minutes=4))
+        self.assertEqual(claim_jobs('worker'), [])
+
+    def test_claim_marks_due_jobs_running(self):
+        first = enqueue('tests.succeed', {'n': 1})
+        enqueue('tests.succeed', {'n': 2}, delay=timedelta(hours=1))
+
+        claimed = claim_jobs('worker-1')
+
+        self.assertEqual([job.pk for job in claimed], [first.pk])
+        self.assertEqual((claimed[0].status, claimed[0].locked_by, claimed[0].attempts), ('running', 'worker-1', 1))
+        self.assertEqual(claim_jobs('worker-2'), [])
+
+    def test_run_records_success(self):
+        enqueue('tests.succeed', {'n': 1})
+        job, = claim_jobs('worker')
+
+        self.assertTrue(run_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [{'n': 1}])
+        self.assertEqual((job.status, job.locked_by), ('succeeded', ''))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_rolls_back_handler_and_backs_off(self):
+        enqueue('tests.fail', max_attempts=2)
+        job, = claim_jobs('worker')
+        before = timezone.now()
+
+        self.assertFalse(run_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(job.status, 'pending')
+        self.assertIn('RuntimeError: boom', job.last_error)
+        self.assertGreaterEqual(job.run_after, before + retry_delay(1))
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        job, = claim_jobs('worker')
+        self.assertFalse(run_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        self.assertEqual(
+            [retry_delay(attempts).total_seconds() for attempts in (1, 2, 3)], [10, 20, 40]
+        )
+        self.assertEqual(retry_delay(30), timedelta(seconds=RETRY_MAX_SECONDS))
+
+
+@override_settings(RATE_LIMIT_ENABLED=False, LEAD_NOTIFICATION_EMAILS=[])
+class SubmissionJobTests(TestCase):
+    """Public submissions are stored raw with a processing job, then processed by a worker."""
+
+    def test_contact_submission_is_processed_by_its_job(self):
+        response = self.client.post('/api/v1/contact/', {
+            'name': ' jane doe ', 'email': 'Jane@Example.com', 'message': 'Hello',
+            'subject': ContactSubmission.SUBJECT_CHOICES[0][0],
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['data']['id'], response.json()['submission_id'])
+        self.assertIsNone(ContactSubmission.objects.get().processed_at)
+
+        for job in claim_jobs('worker'):
+            self.assertTrue(run_job(job))
+
+        self.assertIsNotNone(ContactSubmission.objects.get().processed_at)
@@ -0,0 +1,31 @@
+"""
+Views for jobs app.
+"""
+from datetime import timedelta
+
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .queue import queue_stats
+
+
+class JobQueueMetricsView(APIView):
+    """Queue depth and processing latency for staff monitoring."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            window = int(request.query_params.get('window', 60))
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': 'window must be an integer number of minutes'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'data': queue_stats(window=timedelta(minutes=max(window, 1)))
+        })
@@ -14,7 +14,7 @@ class LeadMagnetSubmissionAdmin(admin.ModelAdmin):
     
     list_display = [
         'name', 'email', 'lead_magnet_type', 'status', 'lead_score', 
-        'form_submitted_at', 'pdf_downloaded', 'source_display'
+        'form_submitted_at', 'pdf_downloaded', 'source_display', 'duplicate_count'
     ]
     list_filter = [
         'lead_magnet_type', 'status', 'source', 'is_subscribed_to_newsletter',
@@ -25,7 +25,8 @@ class LeadMagnetSubmissionAdmin(admin.ModelAdmin):
     readonly_fields = [
         'id', 'form_submitted_at', 'pdf_downloaded_at', 'email_sent_at', 
         'email_opened_at', 'created_at', 'updated_at', 'time_to_download_display',
-        'is_qualified_lead_display', 'needs_follow_up_display'
+        'is_qualified_lead_display', 'needs_follow_up_display', 'duplicate_count',
+        'last_duplicate_at'
     ]
     
     fieldsets = (
@@ -49,6 +50,10 @@ class LeadMagnetSubmissionAdmin(admin.ModelAdmin):
         ('Lead Management', {
             'fields': ('status', 'lead_score', 'notes')
         }),
+        ('Duplicates', {
+            'fields': ('duplicate_count', 'last_duplicate_at'),
+            'classes': ('collapse',)
+        }),
         ('System Information', {
             'fields': ('id', 'created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-19 05:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lead_magnets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="leadmagnetsubmission",
+            name="processed_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When background enrichment and scoring completed",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0 on 2026-10-19 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lead_magnets", "0002_leadmagnetsubmission_processed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="leadmagnetsubmission",
+            name="duplicate_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Repeat submissions folded into this record"
+            ),
+        ),
+        migrations.AddField(
+            model_name="leadmagnetsubmission",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="leadmagnetsubmission",
+            name="last_duplicate_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="leadmagnetsubmission",
+            index=models.Index(
+                fields=["fingerprint", "created_at"],
+                name="lead_magnet_fingerp_7622e4_idx",
+            ),
+        ),
+    ]
@@ -5,6 +5,9 @@ import uuid
 from django.db import models
 from django.utils import timezone
 
+from core.dedup import SubmissionDeduplicator
+from scoring.engine import score_submission
+
 
 class LeadMagnetSubmission(models.Model):
     """Lead magnet submission model for tracking downloads and conversions."""
@@ -50,6 +53,11 @@ class LeadMagnetSubmission(models.Model):
     pdf_downloaded_at = models.DateTimeField(null=True, blank=True)
     email_sent_at = models.DateTimeField(null=True, blank=True)
     email_opened_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When background enrichment and scoring completed"
+    )
     
     # Marketing & Follow-up
     is_subscribed_to_newsletter = models.BooleanField(default=True)
@@ -82,6 +90,14 @@ class LeadMagnetSubmission(models.Model):
         default='new'
     )
     
+    # Deduplication
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    duplicate_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Repeat submissions folded into this record"
+    )
+    last_duplicate_at = models.DateTimeField(null=True, blank=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -94,6 +110,7 @@ class LeadMagnetSubmission(models.Model):
             models.Index(fields=['email', 'lead_magnet_type']),
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['utm_source', 'utm_campaign']),
+            models.Index(fields=['fingerprint', 'created_at']),
         ]
     
     def __str__(self):
@@ -133,11 +150,33 @@ class LeadMagnetSubmission(models.Model):
         self.status = 'engaged'
         self.save(update_fields=['email_opened_at', 'status', 'updated_at'])
     
-    def update_lead_score(self, score):
-        """Update lead score."""
+    def calculate_lead_score(self):
+        """Calculate lead score with the active lead magnet scoring model."""
+        return score_submission(self, 'lead_magnet')
+    
+    def save(self, *args, score_lead=True, **kwargs):
+        """Override save to automatically score new submissions."""
+        if score_lead and self._state.adding and not self.lead_score:
+            self._apply_lead_score(self.calculate_lead_score())
+        super().save(*args, **kwargs)
+    
+    def _apply_lead_score(self, score):
+        """Set lead score and promote status for high scores."""
         self.lead_score = max(0, min(100, score))
         if self.lead_score >= 75:
             self.status = 'qualified'
         elif self.lead_score >= 50:
             self.status = 'engaged'
+    
+    def update_lead_score(self, score):
+        """Update lead score."""
+        self._apply_lead_score(score)
         self.save(update_fields=['lead_score', 'status', 'updated_at'])
+
+
+# Folds repeat requests for the same lead magnet into the first record
+submission_deduplicator = SubmissionDeduplicator(
+    LeadMagnetSubmission,
+    fields=['lead_magnet_type'],
+    timestamp_field='created_at'
+)
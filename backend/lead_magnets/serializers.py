@@ -2,7 +2,7 @@
 Serializers for lead magnets app.
 """
 from rest_framework import serializers
-from .models import LeadMagnetSubmission
+from .models import LeadMagnetSubmission, submission_deduplicator
 
 
 class LeadMagnetSubmissionSerializer(serializers.ModelSerializer):
@@ -16,11 +16,11 @@ class LeadMagnetSubmissionSerializer(serializers.ModelSerializer):
             'email_opened_at', 'is_subscribed_to_newsletter', 'follow_up_scheduled',
             'follow_up_completed', 'utm_source', 'utm_medium', 'utm_campaign',
             'utm_term', 'utm_content', 'notes', 'lead_score', 'status',
-            'created_at', 'updated_at'
+            'processed_at', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'form_submitted_at', 'pdf_downloaded_at', 'email_sent_at',
-            'email_opened_at', 'created_at', 'updated_at'
+            'email_opened_at', 'processed_at', 'created_at', 'updated_at'
         ]
 
 
@@ -36,35 +36,25 @@ class LeadMagnetSubmissionCreateSerializer(serializers.ModelSerializer):
         ]
     
     def create(self, validated_data):
-        """Create a new lead magnet submission."""
+        """Create a new lead magnet submission, or return the recent one it repeats."""
+        return self.save_or_fold(validated_data)[0]
+    
+    def save_or_fold(self, validated_data=None):
+        """
+        Store the raw submission, or fold it into a recent identical one.
+        
+        Returns ``(submission, created)``; enrichment and scoring run in the background.
+        """
+        validated_data = dict(self.validated_data if validated_data is None else validated_data)
         # Set default values
         validated_data.setdefault('lead_magnet_type', 'django-saas-checklist')
         validated_data.setdefault('source', 'website')
         
-        # Create the submission
-        submission = LeadMagnetSubmission.objects.create(**validated_data)
-        
-        # Calculate initial lead score based on provided information
-        lead_score = 0
-        
-        if submission.company:
-            lead_score += 10
-        
-        if submission.role in ['founder', 'ceo', 'cto']:
-            lead_score += 20
-        elif submission.role in ['developer', 'product-manager']:
-            lead_score += 15
-        
-        if submission.utm_source:
-            lead_score += 5
-        
-        if submission.utm_campaign:
-            lead_score += 5
-        
-        # Update lead score
-        submission.update_lead_score(lead_score)
-        
-        return submission
+        self.instance, created = submission_deduplicator.save(
+            LeadMagnetSubmission(**validated_data),
+            score_lead=False
+        )
+        return self.instance, created
 
 
 class LeadMagnetSubmissionUpdateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,40 @@
+"""
+Background tasks for lead magnets app.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.leads import enrich_submission, notification_recipients
+from jobs.queue import enqueue
+from jobs.registry import task
+
+from .models import LeadMagnetSubmission
+
+
+@task('lead_magnets.process_submission')
+def process_submission(payload):
+    """Enrich and score a new lead magnet submission, then queue notifications."""
+    with transaction.atomic():
+        submission = LeadMagnetSubmission.objects.select_for_update().filter(
+            pk=payload['submission_id']
+        ).first()
+        if submission is None or submission.processed_at:
+            return
+
+        enrich_submission(submission)
+        score = submission.calculate_lead_score()
+        if submission.status == 'new':
+            submission._apply_lead_score(score)
+        else:
+            # Keep progress made while the job was queued (e.g. the PDF was downloaded)
+            submission.lead_score = max(0, min(100, score))
+        submission.processed_at = timezone.now()
+        submission.save(update_fields=[
+            'name', 'email', 'company', 'source', 'lead_score', 'status', 'processed_at', 'updated_at'
+        ])
+
+        if notification_recipients():
+            enqueue('leads.notify', {
+                'model': 'lead_magnets.LeadMagnetSubmission',
+                'submission_id': str(submission.pk),
+            })
@@ -1,3 +1,101 @@
-from django.test import TestCase
+"""
+Tests for lead magnet submissions and folding repeats into the first record.
+"""
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from jobs.models import Job
+from .models import LeadMagnetSubmission, submission_deduplicator
+
+
+def build_submission(**fields):
+    fields = {'name': 'Jane', 'email': 'Jane@Example.com', 'lead_magnet_type': 'django-saas-checklist', **fields}
+    return LeadMagnetSubmission(**fields)
+
+
+class SubmissionDedupTests(TestCase):
+    """Repeats within the window fold into the first record, wherever they fall in time."""
+
+    def setUp(self):
+        submission_deduplicator.recent.clear()
+        self.addCleanup(submission_deduplicator.recent.clear)
+        self.window = submission_deduplicator.window_seconds
+
+    def age(self, submission, seconds):
+        LeadMagnetSubmission.objects.filter(pk=submission.pk).update(
+            created_at=timezone.now() - timedelta(seconds=seconds)
+        )
+
+    def test_repeat_is_folded_into_first_record(self):
+        first, created = submission_deduplicator.save(build_submission(), score_lead=False)
+        self.assertTrue(created)
+
+        repeat, created = submission_deduplicator.save(
+            build_submission(name='Jane D.', email=' jane@example.com'), score_lead=False
+        )
+
+        self.assertFalse(created)
+        self.assertEqual(repeat.pk, first.pk)
+        self.assertEqual(repeat.duplicate_count, 1)
+        self.assertEqual(LeadMagnetSubmission.objects.count(), 1)
+
+    def test_repeat_across_any_window_boundary_is_folded(self):
+        # Another process stored the first one a moment less than the window ago
+        first, _ = submission_deduplicator.save(build_submission(), score_lead=False)
+        self.age(first, self.window - 5)
+        submission_deduplicator.recent.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            repeat, created = submission_deduplicator.save(build_submission(), score_lead=False)
+
+        self.assertFalse(created)
+        self.assertEqual(repeat.pk, first.pk)
+        self.assertTrue(any('pg_advisory_xact_lock' in query['sql'] for query in queries))
+
+    def test_other_databases_fold_without_advisory_locks(self):
+        first, _ = submission_deduplicator.save(build_submission(), score_lead=False)
+        submission_deduplicator.recent.clear()
+
+        with mock.patch.object(connection, 'vendor', 'sqlite'), CaptureQueriesContext(connection) as queries:
+            repeat, created = submission_deduplicator.save(build_submission(), score_lead=False)
+
+        self.assertFalse(created)
+        self.assertEqual(repeat.pk, first.pk)
+        self.assertFalse(any('pg_advisory' in query['sql'] for query in queries))
+
+    def test_submission_after_the_window_is_new(self):
+        first, _ = submission_deduplicator.save(build_submission(), score_lead=False)
+        self.age(first, self.window + 5)
+        submission_deduplicator.recent.clear()
+
+        second, created = submission_deduplicator.save(build_submission(), score_lead=False)
+
+        self.assertTrue(created)
+        self.assertNotEqual(second.pk, first.pk)
+
+    def test_known_fingerprint_of_deleted_record_is_stored_again(self):
+        first, _ = submission_deduplicator.save(build_submission(), score_lead=False)
+        LeadMagnetSubmission.objects.filter(pk=first.pk).delete()
+
+        second, created = submission_deduplicator.save(build_submission(), score_lead=False)
+
+        self.assertTrue(created)
+        self.assertEqual(LeadMagnetSubmission.objects.get().pk, second.pk)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_api_queues_processing_once(self):
+        data = {'name': 'Jane', 'email': 'jane@example.com', 'company': 'Acme'}
+
+        response = self.client.post('/api/v1/lead-magnets/', data)
+        self.assertEqual(response.status_code, 201)
+        repeat = self.client.post('/api/v1/lead-magnets/', data)
+
+        self.assertEqual(repeat.status_code, 200)
+        self.assertTrue(repeat.json()['duplicate'])
+        self.assertEqual(repeat.json()['submission_id'], response.json()['submission_id'])
+        self.assertEqual(Job.objects.filter(name='lead_magnets.process_submission').count(), 1)
@@ -1,12 +1,22 @@
 """
 Views for lead magnets app.
 """
+import os
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.http import Http404
+from django.views.decorators.http import require_http_methods
+from core.filedelivery import serve_file
+from core.ratelimit import TokenBucketThrottle, rate_limited
+from jobs.queue import enqueue
 from .models import LeadMagnetSubmission
 from .serializers import (
     LeadMagnetSubmissionSerializer,
@@ -15,11 +25,19 @@ from .serializers import (
 )
 
 
+# Static file delivered for each lead magnet type
+LEAD_MAGNET_FILES = {
+    'django-saas-checklist': 'resources/django-saas-checklist.pdf',
+}
+
+
 class LeadMagnetSubmissionViewSet(viewsets.ModelViewSet):
     """ViewSet for LeadMagnetSubmission model."""
     
     queryset = LeadMagnetSubmission.objects.all()
     permission_classes = [AllowAny]  # Allow public submissions
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scopes = {'create': 'lead_magnet_submit'}
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -30,10 +48,25 @@ class LeadMagnetSubmissionViewSet(viewsets.ModelViewSet):
         return LeadMagnetSubmissionSerializer
     
     def create(self, request, *args, **kwargs):
-        """Create a new lead magnet submission."""
+        """Store a new lead magnet submission and queue it for processing."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        submission = serializer.save()
+        
+        # Persist the raw submission and its processing job atomically
+        with transaction.atomic():
+            submission, created = serializer.save_or_fold()
+            if created:
+                enqueue('lead_magnets.process_submission', {'submission_id': str(submission.id)})
+        
+        if not created:
+            return Response({
+                'success': True,
+                'message': 'This submission was already received',
+                'submission_id': submission.id,
+                'lead_score': submission.lead_score,
+                'status': submission.status,
+                'duplicate': True
+            }, status=status.HTTP_200_OK)
         
         # Return success response with submission ID
         return Response({
@@ -152,6 +185,11 @@ class LeadMagnetSubmissionViewSet(viewsets.ModelViewSet):
                 avg_score=Count('lead_score')
             )['avg_score'] or 0
             
+            # Repeat submissions folded into existing records
+            suppressed_duplicates = recent_submissions.aggregate(
+                total=Sum('duplicate_count')
+            )['total'] or 0
+            
             return Response({
                 'success': True,
                 'data': {
@@ -161,6 +199,7 @@ class LeadMagnetSubmissionViewSet(viewsets.ModelViewSet):
                     'qualified_leads': qualified_leads,
                     'conversion_rate': round(conversion_rate, 2),
                     'avg_lead_score': avg_lead_score,
+                    'suppressed_duplicates': suppressed_duplicates,
                     'type_breakdown': list(type_breakdown),
                     'source_breakdown': list(source_breakdown),
                     'status_breakdown': list(status_breakdown)
@@ -220,3 +259,21 @@ class LeadMagnetSubmissionViewSet(viewsets.ModelViewSet):
                 'success': False,
                 'message': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _lead_magnet_file_path(relative_path):
+    """Locate a lead magnet file in the static sources or the collected static root."""
+    path = finders.find(relative_path)
+    if path:
+        return path
+    return os.path.join(settings.STATIC_ROOT, relative_path)
+
+
+@require_http_methods(["GET", "HEAD"])
+@rate_limited('file_download')
+def lead_magnet_file_download(request, lead_magnet_type):
+    """Serve a lead magnet PDF with Range and conditional request support."""
+    relative_path = LEAD_MAGNET_FILES.get(lead_magnet_type)
+    if relative_path is None:
+        raise Http404('Unknown lead magnet')
+    return serve_file(request, _lead_magnet_file_path(relative_path))
@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-19 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0003_portfolio_results"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["order", "-created_at"],
+                name="portfolio_pub_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-created_at"],
+                name="portfolio_pub_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-year", "-created_at"],
+                name="portfolio_pub_year_idx",
+            ),
+        ),
+    ]
@@ -117,6 +117,18 @@ class Portfolio(models.Model):
         ordering = ['order', '-created_at']
         verbose_name = 'Portfolio Project'
         verbose_name_plural = 'Portfolio Projects'
+        # Back the public list orderings (see PortfolioViewSet.ordering_plans)
+        indexes = [
+            models.Index(
+                fields=['order', '-created_at'], name='portfolio_pub_order_idx',
+                condition=models.Q(status='published')
+            ),
+            models.Index(fields=['-created_at'], name='portfolio_pub_created_idx', condition=models.Q(status='published')),
+            models.Index(
+                fields=['-year', '-created_at'], name='portfolio_pub_year_idx',
+                condition=models.Q(status='published')
+            ),
+        ]
 
     def __str__(self):
         return self.title
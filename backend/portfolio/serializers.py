@@ -1,14 +1,17 @@
 from rest_framework import serializers
+
+from core.fields import ThumbnailURLField
 from .models import Portfolio
 
 
 class PortfolioSerializer(serializers.ModelSerializer):
+    hero_image_url = ThumbnailURLField('hero', source='hero_image')
     
     class Meta:
         model = Portfolio
         fields = [
             'id', 'title', 'slug', 'description', 'long_description',
-            'category', 'client', 'year', 'hero_image', 'gallery_images',
+            'category', 'client', 'year', 'hero_image', 'hero_image_url', 'gallery_images',
             'technologies', 'duration', 'team_size', 'results',
             'live_url', 'github_url', 'case_study_url', 'is_featured',
             'order', 'status', 'created_at', 'updated_at'
@@ -18,11 +21,12 @@ class PortfolioSerializer(serializers.ModelSerializer):
 
 class PortfolioListSerializer(serializers.ModelSerializer):
     """Simplified serializer for list views"""
+    hero_image_url = ThumbnailURLField('card', source='hero_image')
     
     class Meta:
         model = Portfolio
         fields = [
             'id', 'title', 'slug', 'description', 'category',
-            'client', 'year', 'hero_image', 'technologies',
+            'client', 'year', 'hero_image', 'hero_image_url', 'technologies',
             'is_featured', 'order'
         ]
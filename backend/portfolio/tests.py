@@ -1,3 +1,43 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from core.ordering import PLAN_HEADER, find_index
+
+from .models import Portfolio
+from .views import PortfolioViewSet
+
+
+class PortfolioOrderingTests(TestCase):
+    """The public list only sorts by index-backed orderings."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for order, year in ((2, '2021'), (1, '2023'), (3, '2022')):
+            Portfolio.objects.create(
+                title=f'Project {order}', description='Project', category='web', client='Client', year=year,
+                order=order
+            )
+
+    def titles(self, **params):
+        response = self.client.get('/api/v1/portfolio/', params)
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.json()['results']]
+
+    def test_default_and_requested_orderings(self):
+        self.assertEqual(self.titles(), ['Project 1', 'Project 2', 'Project 3'])
+        self.assertEqual(self.titles(ordering='-year'), ['Project 1', 'Project 3', 'Project 2'])
+        self.assertEqual(self.titles(ordering='-order'), ['Project 3', 'Project 2', 'Project 1'])
+
+    def test_unindexed_orderings_are_rejected(self):
+        for ordering in ('title', 'client__name', '-id,order'):
+            response = self.client.get('/api/v1/portfolio/', {'ordering': ordering})
+            self.assertEqual(response.status_code, 400, ordering)
+            self.assertIn('ordering', response.json())
+
+    def test_every_plan_has_an_index(self):
+        for fields in PortfolioViewSet.ordering_plans.values():
+            self.assertIsNotNone(find_index(Portfolio, fields), fields)
+
+    @override_settings(DEBUG=True)
+    def test_debug_header_reports_plan(self):
+        response = self.client.get('/api/v1/portfolio/', {'ordering': '-created_at'})
+        self.assertEqual(response[PLAN_HEADER], '-created_at; order_by=-created_at; index=portfolio_pub_created_idx')
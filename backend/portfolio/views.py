@@ -4,24 +4,33 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from core.ordering import IndexedOrderingFilter, OrderingPlanHeaderMixin
 from .models import Portfolio
 from .serializers import PortfolioSerializer, PortfolioListSerializer
 
 
 # Create your views here.
 
-class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
+class PortfolioViewSet(OrderingPlanHeaderMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for portfolio projects.
     Read-only for public access.
     """
     queryset = Portfolio.objects.filter(status='published')
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, IndexedOrderingFilter]
     filterset_fields = ['category', 'client', 'year', 'is_featured', 'status']
     search_fields = ['title', 'description', 'long_description', 'technologies']
-    ordering_fields = ['order', 'created_at', 'year']
-    ordering = ['order', '-created_at']
+    # ?ordering= value -> order_by, each backed by an index on Portfolio
+    ordering_plans = {
+        'order': ('order', '-created_at'),
+        '-order': ('-order', 'created_at'),
+        '-created_at': ('-created_at',),
+        'created_at': ('created_at',),
+        '-year': ('-year', '-created_at'),
+        'year': ('year', 'created_at'),
+    }
+    ordering = 'order'
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -42,14 +51,6 @@ class PortfolioViewSet(viewsets.ReadOnlyModelViewSet):
             featured_bool = featured.lower() == 'true'
             queryset = queryset.filter(is_featured=featured_bool)
         
-        # Apply ordering
-        ordering = self.request.query_params.get('ordering', None)
-        if ordering:
-            queryset = queryset.order_by(ordering)
-        else:
-            # Use default ordering
-            queryset = queryset.order_by('order', '-created_at')
-        
         return queryset
     
     def retrieve(self, request, slug=None):
@@ -74,8 +74,8 @@ class ResourceAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description', 'tags', 'author']
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = [
-        'download_count', 'view_count', 'rating', 'rating_count',
-        'created_at', 'updated_at'
+        'download_count', 'view_count', 'rating', 'rating_count', 'rating_sum',
+        'rating_histogram_display', 'created_at', 'updated_at'
     ]
     date_hierarchy = 'published_at'
     ordering = ['-is_featured', 'order', '-published_at']
@@ -97,7 +97,10 @@ class ResourceAdmin(admin.ModelAdmin):
             'fields': ('is_featured', 'is_premium', 'order', 'is_active')
         }),
         ('Statistics', {
-            'fields': ('download_count', 'view_count', 'rating', 'rating_count'),
+            'fields': (
+                'download_count', 'view_count', 'rating', 'rating_count', 'rating_sum',
+                'rating_histogram_display'
+            ),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -108,6 +111,10 @@ class ResourceAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('type', 'category')
+    
+    def rating_histogram_display(self, obj):
+        return ', '.join(f'{stars}★ {count}' for stars, count in obj.rating_histogram.items())
+    rating_histogram_display.short_description = 'Ratings by star'
 
 
 @admin.register(ResourceDownload)
@@ -115,7 +122,8 @@ class ResourceDownloadAdmin(admin.ModelAdmin):
     list_display = ['resource', 'user', 'ip_address', 'downloaded_at']
     list_filter = ['downloaded_at', 'resource__type', 'resource__category']
     search_fields = ['resource__title', 'user__username', 'ip_address']
-    readonly_fields = ['downloaded_at']
+    readonly_fields = ['user_agent', 'downloaded_at']
+    exclude = ['user_agent_ref']
     date_hierarchy = 'downloaded_at'
     ordering = ['-downloaded_at']
     
@@ -147,7 +155,8 @@ class ResourceViewAdmin(admin.ModelAdmin):
     list_display = ['resource', 'user', 'ip_address', 'viewed_at']
     list_filter = ['viewed_at', 'resource__type', 'resource__category']
     search_fields = ['resource__title', 'user__username', 'ip_address']
-    readonly_fields = ['viewed_at']
+    readonly_fields = ['user_agent', 'viewed_at']
+    exclude = ['user_agent_ref']
     date_hierarchy = 'viewed_at'
     ordering = ['-viewed_at']
     
@@ -0,0 +1,25 @@
+"""
+Event buffers for resource views and downloads.
+"""
+from django.conf import settings
+
+from core.events import EventBuffer
+from .models import ResourceDownload, ResourceView
+
+view_events = EventBuffer(
+    'resource_view',
+    ResourceView,
+    target_field='resource',
+    counter_field='view_count',
+    dedup_window=settings.EVENT_DEDUP_WINDOWS['resource_view'],
+    sketch_event='resources.view',
+)
+
+download_events = EventBuffer(
+    'resource_download',
+    ResourceDownload,
+    target_field='resource',
+    counter_field='download_count',
+    dedup_window=settings.EVENT_DEDUP_WINDOWS['resource_download'],
+    sketch_event='resources.download',
+)
@@ -0,0 +1,105 @@
+"""
+Management command to measure resource event ingestion throughput.
+"""
+import random
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.events import EventBuffer
+from resources.models import Resource, ResourceCategory, ResourceType, ResourceView
+from resources.serializers import ResourceViewSerializer
+
+BROWSER_UA = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
+BOT_UA = 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request event writes with batched ingestion (events/sec); all writes are rolled back'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=5000, help='Events per run (default: 5000)')
+        parser.add_argument('--resources', type=int, default=20, help='Resources to spread events over (default: 20)')
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows per bulk insert (default: 200)')
+        parser.add_argument('--bot-share', type=float, default=0.1, help='Share of bot traffic (default: 0.1)')
+        parser.add_argument('--repeat-share', type=float, default=0.2, help='Share of repeat views (default: 0.2)')
+
+    def make_events(self, resources, count, bot_share, repeat_share):
+        rng = random.Random(42)
+        events = []
+        for i in range(count):
+            if events and rng.random() < repeat_share:
+                events.append(rng.choice(events))
+                continue
+            resource = rng.choice(resources)
+            user_agent = BOT_UA if rng.random() < bot_share else BROWSER_UA
+            events.append((resource, f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}', user_agent))
+        return events
+
+    def run_legacy(self, events):
+        for resource, ip, user_agent in events:
+            serializer = ResourceViewSerializer(data={
+                'resource': resource.id, 'ip_address': ip, 'user_agent': user_agent, 'referrer': ''
+            })
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            resource.view_count += 1
+            resource.save()
+
+    def run_batched(self, events, batch_size):
+        buffer = EventBuffer(
+            'benchmark_view', ResourceView, target_field='resource', counter_field='view_count',
+            dedup_window=600, batch_size=batch_size, flush_interval=3600
+        )
+        for resource, ip, user_agent in events:
+            buffer.record(
+                ResourceView(resource_id=resource.id, ip_address=ip, user_agent=user_agent),
+                f'ip:{ip}|{user_agent}'
+            )
+        buffer.flush()
+        return buffer.stats()
+
+    def measure(self, label, func, count):
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with transaction.atomic(), connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        self.stdout.write(
+            f'{label:<10} {count / elapsed:>12,.0f} events/sec  {elapsed * 1000:>10.1f} ms  '
+            f'{len(queries):>7} queries'
+        )
+        return result
+
+    def handle(self, *args, **options):
+        count = options['events']
+        with transaction.atomic():
+            resource_type = ResourceType.objects.create(name='Benchmark', slug='benchmark-events')
+            category = ResourceCategory.objects.create(name='Benchmark', slug='benchmark-events')
+            resources = [
+                Resource.objects.create(
+                    title=f'Benchmark {i}', slug=f'benchmark-events-{i}', description='Benchmark',
+                    type=resource_type, category=category
+                )
+                for i in range(options['resources'])
+            ]
+            events = self.make_events(resources, count, options['bot_share'], options['repeat_share'])
+
+            self.measure('legacy', lambda: self.run_legacy(events), count)
+            cache.clear()
+            stats = self.measure('batched', lambda: self.run_batched(events, options['batch_size']), count)
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"batched: {stats.get('accepted', 0)} stored, {stats.get('bots', 0)} bots and "
+            f"{stats.get('duplicates', 0)} repeats filtered, {stats.get('flushes', 0)} flushes"
+        )
+        self.stdout.write(self.style.SUCCESS('Benchmark complete; all rows were rolled back.'))
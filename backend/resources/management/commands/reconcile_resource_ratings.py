@@ -0,0 +1,67 @@
+"""
+Management command to reconcile running rating aggregates with stored ratings.
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from resources.models import Resource, ResourceRating
+
+STARS = range(1, 6)
+
+
+class Command(BaseCommand):
+    help = 'Recompute resource rating sums, counts and histograms from ResourceRating rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted resources without fixing them'
+        )
+
+    def expected_aggregates(self):
+        """Return the true aggregate for every rated resource, keyed by resource id."""
+        rows = ResourceRating.objects.order_by().values('resource_id').annotate(
+            total=Sum('rating'),
+            count=Count('id'),
+            **{f'stars_{n}': Count('id', filter=Q(rating=n)) for n in STARS}
+        )
+        return {
+            row['resource_id']: {
+                'rating_sum': row['total'],
+                'rating_count': row['count'],
+                'rating': (Decimal(row['total']) / row['count']).quantize(Decimal('0.01')),
+                **{f'rating_{n}_count': row[f'stars_{n}'] for n in STARS},
+            }
+            for row in rows
+        }
+
+    def handle(self, *args, **options):
+        empty = {field: 0 for field in Resource.RATING_AGGREGATE_FIELDS}
+        empty['rating'] = Decimal('0.00')
+        expected = self.expected_aggregates()
+
+        drifted = []
+        current = Resource.objects.values('id', 'slug', *Resource.RATING_AGGREGATE_FIELDS)
+        for row in current.iterator():
+            target = expected.get(row['id'], empty)
+            changed = {field: value for field, value in target.items() if row[field] != value}
+            if changed:
+                drifted.append((row, changed))
+
+        for row, changed in drifted:
+            details = ', '.join(f'{field} {row[field]} -> {value}' for field, value in changed.items())
+            self.stdout.write(f"{row['slug']}: {details}")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} resource(s) out of sync (dry run).'))
+            return
+
+        with transaction.atomic():
+            for row, changed in drifted:
+                Resource.objects.filter(pk=row['id']).update(**changed)
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {len(drifted)} resource(s).'))
@@ -0,0 +1,67 @@
+# Generated by Django 5.0 on 2026-10-19 05:28
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_rating_aggregate(apps, schema_editor):
+    Resource = apps.get_model("resources", "Resource")
+    ResourceRating = apps.get_model("resources", "ResourceRating")
+
+    totals = (
+        ResourceRating.objects.order_by()
+        .values("resource_id")
+        .annotate(
+            total=Sum("rating"),
+            count=Count("id"),
+            **{f"stars_{n}": Count("id", filter=Q(rating=n)) for n in range(1, 6)},
+        )
+    )
+    for row in totals.iterator():
+        Resource.objects.filter(pk=row["resource_id"]).update(
+            rating_sum=row["total"],
+            rating_count=row["count"],
+            rating=round(row["total"] / row["count"], 2),
+            **{f"rating_{n}_count": row[f"stars_{n}"] for n in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_aggregate, migrations.RunPython.noop),
+    ]
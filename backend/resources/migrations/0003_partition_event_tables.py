@@ -0,0 +1,118 @@
+# Generated by Django 5.0 on 2026-10-19 05:35
+
+import hashlib
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from core.partitions import partition_table, unpartition_table
+
+
+def intern_user_agents(apps, schema_editor):
+    UserAgent = apps.get_model("core", "UserAgent")
+    for model_name in ["ResourceDownload", "ResourceView"]:
+        model = apps.get_model("resources", model_name)
+        values = (
+            model.objects.exclude(user_agent="")
+            .order_by()
+            .values_list("user_agent", flat=True)
+            .distinct()
+        )
+        for value in values.iterator():
+            user_agent, _ = UserAgent.objects.get_or_create(
+                value_hash=hashlib.sha256(value.encode("utf-8")).hexdigest(),
+                defaults={"value": value},
+            )
+            model.objects.filter(user_agent=value).update(user_agent_ref=user_agent)
+    if schema_editor.connection.vendor == "postgresql":
+        # Fire deferred FK checks now so the following ALTER TABLEs are allowed
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+EVENT_TABLES = [
+    ("resources_resourcedownload", "downloaded_at"),
+    ("resources_resourceview", "viewed_at"),
+]
+
+
+def partition_tables(apps, schema_editor):
+    for table, column in EVENT_TABLES:
+        partition_table(schema_editor, table, column)
+
+
+def unpartition_tables(apps, schema_editor):
+    for table, column in EVENT_TABLES:
+        unpartition_table(schema_editor, table, column)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_user_agent_daily_event_count"),
+        ("resources", "0002_resource_rating_aggregate"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourcedownload",
+            name="user_agent_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.useragent",
+                verbose_name="user agent",
+            ),
+        ),
+        migrations.AddField(
+            model_name="resourceview",
+            name="user_agent_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.useragent",
+                verbose_name="user agent",
+            ),
+        ),
+        migrations.RunPython(intern_user_agents, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="resourcedownload",
+            name="user_agent",
+        ),
+        migrations.RemoveField(
+            model_name="resourceview",
+            name="user_agent",
+        ),
+        migrations.RunPython(partition_tables, unpartition_tables),
+        migrations.AddIndex(
+            model_name="resourcedownload",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["downloaded_at"], name="resource_download_at_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resourcedownload",
+            index=models.Index(
+                fields=["resource", "-downloaded_at"],
+                name="resource_download_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resourceview",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["viewed_at"], name="resource_view_viewed_at_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resourceview",
+            index=models.Index(
+                fields=["resource", "-viewed_at"], name="resource_view_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-19 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0003_partition_event_tables"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resource",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-is_featured", "order", "-published_at"],
+                name="resource_active_list_idx",
+            ),
+        ),
+    ]
@@ -1,5 +1,12 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, F, FloatField, Value, When
+from django.db.models.functions import Cast
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import BrinIndex
+
+from core.models import UserAgentMixin
 
 User = get_user_model()
 from django.utils import timezone
@@ -77,6 +84,12 @@ class Resource(models.Model):
         validators=[MinValueValidator(0.00), MaxValueValidator(5.00)]
     )
     rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -86,6 +99,13 @@ class Resource(models.Model):
     class Meta:
         ordering = ['-is_featured', 'order', '-published_at']
         verbose_name_plural = 'Resources'
+        # Backs the default ordering of the public list
+        indexes = [
+            models.Index(
+                fields=['-is_featured', 'order', '-published_at'], name='resource_active_list_idx',
+                condition=models.Q(is_active=True)
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -93,38 +113,80 @@ class Resource(models.Model):
     def get_absolute_url(self):
         return f'/resources/{self.slug}/'
     
-    def update_rating(self, new_rating):
-        """Update the average rating when a new rating is added"""
-        if self.rating_count == 0:
-            self.rating = new_rating
-        else:
-            total_rating = (self.rating * self.rating_count) + new_rating
-            self.rating_count += 1
-            self.rating = total_rating / self.rating_count
-        self.save()
+    RATING_AGGREGATE_FIELDS = [
+        'rating', 'rating_count', 'rating_sum',
+        'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count', 'rating_5_count',
+    ]
+    
+    @property
+    def rating_histogram(self):
+        """Number of ratings per star, highest first"""
+        return {stars: getattr(self, f'rating_{stars}_count') for stars in range(5, 0, -1)}
+    
+    def update_rating(self, new_rating=None, previous_rating=None):
+        """
+        Fold a rating change into the running aggregate with a single UPDATE.
+        
+        Pass ``new_rating`` alone for a new rating, both values when a rating
+        is changed and ``previous_rating`` alone when one is removed.
+        """
+        count_delta = (new_rating is not None) - (previous_rating is not None)
+        sum_delta = (new_rating or 0) - (previous_rating or 0)
+        
+        updates = {}
+        if new_rating != previous_rating:
+            if new_rating is not None:
+                updates[f'rating_{new_rating}_count'] = F(f'rating_{new_rating}_count') + 1
+            if previous_rating is not None:
+                updates[f'rating_{previous_rating}_count'] = F(f'rating_{previous_rating}_count') - 1
+        if not updates:
+            return
+        
+        # Every right-hand side sees the pre-update row, so the new average
+        # is computed from the old totals plus the deltas.
+        new_sum = F('rating_sum') + sum_delta
+        new_count = F('rating_count') + count_delta
+        updates.update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count__gt=-count_delta, then=Cast(
+                    Cast(new_sum, FloatField()) / new_count,
+                    DecimalField(max_digits=3, decimal_places=2)
+                )),
+                default=Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=3, decimal_places=2)
+            ),
+        )
+        Resource.objects.filter(pk=self.pk).update(**updates)
+        self.refresh_from_db(fields=self.RATING_AGGREGATE_FIELDS)
     
     def increment_download(self):
         """Increment download count"""
-        self.download_count += 1
-        self.save()
+        Resource.objects.filter(pk=self.pk).update(download_count=F('download_count') + 1)
+        self.refresh_from_db(fields=['download_count'])
     
     def increment_view(self):
         """Increment view count"""
-        self.view_count += 1
-        self.save()
+        Resource.objects.filter(pk=self.pk).update(view_count=F('view_count') + 1)
+        self.refresh_from_db(fields=['view_count'])
 
 
-class ResourceDownload(models.Model):
+class ResourceDownload(UserAgentMixin, models.Model):
     resource = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='downloads')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resource_downloads', null=True, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.TextField(blank=True)
     referrer = models.URLField(blank=True)
     downloaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
+        # Stored in monthly partitions on PostgreSQL, see core.partitions
         ordering = ['-downloaded_at']
         verbose_name_plural = 'Resource Downloads'
+        indexes = [
+            BrinIndex(fields=['downloaded_at'], name='resource_download_at_brin'),
+            models.Index(fields=['resource', '-downloaded_at'], name='resource_download_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.resource.title} - {self.downloaded_at}"
@@ -150,25 +212,44 @@ class ResourceRating(models.Model):
         return f"{self.resource.title} - {self.rating} stars"
     
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            # Update the resource's average rating
-            self.resource.update_rating(self.rating)
+        with transaction.atomic():
+            previous_rating = None
+            if self.pk is not None:
+                previous_rating = ResourceRating.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('rating', flat=True).first()
+            is_new = self.pk is None or previous_rating is None
+            super().save(*args, **kwargs)
+            
+            # Keep the resource's running rating aggregate in step
+            self.resource.update_rating(self.rating, None if is_new else previous_rating)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous_rating = ResourceRating.objects.select_for_update().filter(
+                pk=self.pk
+            ).values_list('rating', flat=True).first()
+            result = super().delete(*args, **kwargs)
+            if previous_rating is not None:
+                self.resource.update_rating(previous_rating=previous_rating)
+        return result
 
 
-class ResourceView(models.Model):
+class ResourceView(UserAgentMixin, models.Model):
     resource = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='views')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resource_views', null=True, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.TextField(blank=True)
     referrer = models.URLField(blank=True)
     viewed_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
+        # Stored in monthly partitions on PostgreSQL, see core.partitions
         ordering = ['-viewed_at']
         verbose_name_plural = 'Resource Views'
+        indexes = [
+            BrinIndex(fields=['viewed_at'], name='resource_view_viewed_at_brin'),
+            models.Index(fields=['resource', '-viewed_at'], name='resource_view_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.resource.title} - {self.viewed_at}"
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from core.fields import DownloadFileField, ThumbnailURLField
 from .models import Resource, ResourceCategory, ResourceType, ResourceDownload, ResourceRating, ResourceView
 
 
@@ -17,12 +19,13 @@ class ResourceTypeSerializer(serializers.ModelSerializer):
 class ResourceListSerializer(serializers.ModelSerializer):
     type = ResourceTypeSerializer(read_only=True)
     category = ResourceCategorySerializer(read_only=True)
+    thumbnail_url = ThumbnailURLField('thumbnail', source='thumbnail')
     
     class Meta:
         model = Resource
         fields = [
             'id', 'title', 'slug', 'description', 'type', 'category', 'tags',
-            'file_size', 'format', 'estimated_time', 'thumbnail', 'external_url',
+            'file_size', 'format', 'estimated_time', 'thumbnail', 'thumbnail_url', 'external_url',
             'author', 'is_featured', 'is_premium', 'order', 'is_active',
             'download_count', 'view_count', 'rating', 'rating_count',
             'created_at', 'updated_at', 'published_at'
@@ -32,19 +35,24 @@ class ResourceListSerializer(serializers.ModelSerializer):
 class ResourceDetailSerializer(serializers.ModelSerializer):
     type = ResourceTypeSerializer(read_only=True)
     category = ResourceCategorySerializer(read_only=True)
+    file = DownloadFileField(read_only=True)
+    thumbnail_url = ThumbnailURLField('thumbnail', source='thumbnail')
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
     
     class Meta:
         model = Resource
         fields = [
             'id', 'title', 'slug', 'description', 'long_description', 'type', 'category', 'tags',
-            'file_size', 'format', 'estimated_time', 'thumbnail', 'file', 'external_url',
+            'file_size', 'format', 'estimated_time', 'thumbnail', 'thumbnail_url', 'file', 'external_url',
             'author', 'is_featured', 'is_premium', 'order', 'is_active',
-            'download_count', 'view_count', 'rating', 'rating_count',
+            'download_count', 'view_count', 'rating', 'rating_count', 'rating_histogram',
             'created_at', 'updated_at', 'published_at'
         ]
 
 
 class ResourceDownloadSerializer(serializers.ModelSerializer):
+    user_agent = serializers.CharField(required=False, allow_blank=True)
+    
     class Meta:
         model = ResourceDownload
         fields = ['id', 'resource', 'user', 'ip_address', 'user_agent', 'referrer', 'downloaded_at']
@@ -59,6 +67,8 @@ class ResourceRatingSerializer(serializers.ModelSerializer):
 
 
 class ResourceViewSerializer(serializers.ModelSerializer):
+    user_agent = serializers.CharField(required=False, allow_blank=True)
+    
     class Meta:
         model = ResourceView
         fields = ['id', 'resource', 'user', 'ip_address', 'user_agent', 'referrer', 'viewed_at']
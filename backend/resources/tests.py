@@ -0,0 +1,362 @@
+"""
+Tests for resource downloads served from S3 and local storage, for
+batched view/download events and for running rating aggregates.
+
+Presigning is computed locally by botocore, so these tests run against a
+stand-in endpoint (MinIO-style) with dummy credentials and need no network.
+"""
+import io
+import json
+import os
+import tempfile
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.core.management import call_command
+from django.db.models.fields.files import FieldFile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from storages.backends.s3 import S3Storage
+
+from core import s3
+from core.events import EventBuffer, clean_ip
+from core.models import UserAgent
+from core.fields import DownloadFileField
+from core.filedelivery import serve_field_file, serve_file
+from .models import Resource, ResourceCategory, ResourceRating, ResourceType, ResourceView
+from .views import CHECKLIST_PDF_KEY, DjangoSaasChecklistDownloadView
+
+
+@override_settings(
+    AWS_ACCESS_KEY_ID='test-access-key',
+    AWS_SECRET_ACCESS_KEY='test-secret-key',
+    AWS_STORAGE_BUCKET_NAME='kkevo-test',
+    AWS_S3_REGION_NAME='us-east-1',
+    AWS_S3_ENDPOINT_URL='http://localhost:9000',
+    RATE_LIMIT_ENABLED=False,
+)
+class PresignedUrlTests(SimpleTestCase):
+    """Shared S3 client and presigned URL cache."""
+
+    def setUp(self):
+        s3.reset_s3_clients()
+        cache.clear()
+
+    def tearDown(self):
+        s3.reset_s3_clients()
+        cache.clear()
+
+    def test_client_is_shared_across_threads(self):
+        clients = []
+        threads = [threading.Thread(target=lambda: clients.append(s3.get_s3_client())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(client) for client in clients}), 1)
+        self.assertEqual(clients[0].meta.endpoint_url, 'http://localhost:9000')
+
+    def test_presigned_url_is_reused(self):
+        client = s3.get_s3_client()
+        with mock.patch.object(client, 'generate_presigned_url', wraps=client.generate_presigned_url) as sign:
+            first = s3.presigned_url('resources/files/guide.pdf', expires_in=600)
+            second = s3.presigned_url('resources/files/guide.pdf', expires_in=600)
+
+        self.assertEqual(first, second)
+        self.assertEqual(sign.call_count, 1)
+        self.assertIn('/kkevo-test/resources/files/guide.pdf', first)
+        self.assertIn('X-Amz-Expires=600', first)
+
+    def test_presigned_url_is_renewed_near_expiry(self):
+        client = s3.get_s3_client()
+        with mock.patch.object(client, 'generate_presigned_url', return_value='signed') as sign:
+            with mock.patch('core.s3.time.time', return_value=1000.0):
+                s3.presigned_url('resources/files/guide.pdf', expires_in=600)
+            # 85% of the lifetime used: still cached but too close to expiry to hand out
+            with mock.patch('core.s3.time.time', return_value=1510.0):
+                s3.presigned_url('resources/files/guide.pdf', expires_in=600)
+
+        self.assertEqual(sign.call_count, 2)
+
+    def test_s3_file_field_uses_storage_key(self):
+        storage = S3Storage(bucket_name='kkevo-test', location='media')
+        field_file = FieldFile(Resource(), Resource._meta.get_field('file'), 'resources/files/guide.pdf')
+        field_file.storage = storage
+
+        url = DownloadFileField().to_representation(field_file)
+
+        self.assertIn('/kkevo-test/media/resources/files/guide.pdf', url)
+        self.assertEqual(url, s3.file_download_url(field_file))
+
+    def test_checklist_download_reuses_url(self):
+        view = DjangoSaasChecklistDownloadView.as_view()
+        factory = RequestFactory()
+        body = json.dumps({'email': 'reader@example.com', 'firstName': 'Reader'})
+
+        urls = [
+            json.loads(view(factory.post('/', data=body, content_type='application/json')).content)['downloadUrl']
+            for _ in range(2)
+        ]
+
+        self.assertEqual(urls[0], urls[1])
+        self.assertIn(CHECKLIST_PDF_KEY, urls[0])
+        self.assertIn('X-Amz-Signature', urls[0])
+
+
+class RemoteStorage(Storage):
+    """Storage without local paths, like most remote backends."""
+
+    def __init__(self):
+        self.files = {}
+
+    def _save(self, name, content):
+        self.files[name] = content.read()
+        return name
+
+    def _open(self, name, mode='rb'):
+        if name not in self.files:
+            raise FileNotFoundError(name)
+        return ContentFile(self.files[name], name=name)
+
+    def exists(self, name):
+        return name in self.files
+
+    def delete(self, name):
+        self.files.pop(name, None)
+
+
+@override_settings(FILE_DELIVERY_ACCEL_REDIRECT=False)
+class FileDeliveryTests(SimpleTestCase):
+    """Conditional and ranged responses for locally stored files."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'guide.pdf')
+        with open(self.path, 'wb') as handle:
+            handle.write(bytes(range(256)) * 4)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def serve(self, **headers):
+        response = serve_file(self.factory.get('/', **headers), self.path)
+        self.addCleanup(response.close)
+        return response
+
+    def test_full_download_streams_file(self):
+        response = self.serve()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(len(b''.join(response.streaming_content)), 1024)
+
+    def test_range_returns_partial_content(self):
+        response = self.serve(HTTP_RANGE='bytes=-16')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 1008-1023/1024')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(240, 256)))
+
+    def test_range_past_end_is_not_satisfiable(self):
+        response = self.serve(HTTP_RANGE='bytes=4096-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_stale_if_range_returns_whole_file(self):
+        etag = self.serve()['ETag']
+
+        fresh = self.serve(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        stale = self.serve(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"0-0"')
+
+        self.assertEqual(fresh.status_code, 206)
+        self.assertEqual(stale.status_code, 200)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.serve()['ETag']
+
+        response = self.serve(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_storage_without_local_paths_streams_the_file(self):
+        storage = RemoteStorage()
+        name = storage.save('resources/files/guide.pdf', ContentFile(b'%PDF-1.4 guide'))
+        field_file = FieldFile(Resource(), Resource._meta.get_field('file'), name)
+        field_file.storage = storage
+
+        response = serve_field_file(self.factory.get('/'), field_file)
+        self.addCleanup(response.close)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 guide')
+        self.assertIn('attachment; filename="guide.pdf"', response['Content-Disposition'])
+
+        storage.delete(name)
+        with self.assertRaises(Http404):
+            serve_field_file(self.factory.get('/'), field_file)
+
+    @override_settings(FILE_DELIVERY_ACCEL_REDIRECT=True)
+    def test_accel_redirect_hands_off_to_proxy(self):
+        with override_settings(FILE_DELIVERY_ACCEL_LOCATIONS={self.directory.name: '/protected/media/'}):
+            response = self.serve()
+
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/media/guide.pdf')
+        self.assertEqual(response.content, b'')
+
+
+BROWSER_UA = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class EventBufferTests(TestCase):
+    """Filtering, batching and error handling of buffered view events."""
+
+    def setUp(self):
+        cache.clear()
+        # Interned ids of rolled back rows must not leak between tests
+        UserAgent.clear_cache()
+        resource_type = ResourceType.objects.create(name='Guide', slug='guide')
+        resource_category = ResourceCategory.objects.create(name='Backend', slug='backend')
+        self.resource = Resource.objects.create(
+            title='Resource', slug='resource', description='Resource', type=resource_type,
+            category=resource_category
+        )
+        self.buffer = EventBuffer(
+            'test_view', ResourceView, target_field='resource', counter_field='view_count',
+            dedup_window=600, batch_size=100, flush_interval=0
+        )
+
+    def record(self, ip, user_agent=BROWSER_UA):
+        return self.buffer.record(
+            ResourceView(resource_id=self.resource.id, ip_address=ip, user_agent=user_agent),
+            f'ip:{ip}|{user_agent}'
+        )
+
+    def test_bots_and_repeats_are_dropped(self):
+        self.buffer._flush_interval = 3600
+        self.addCleanup(self.buffer.flush)
+
+        self.assertTrue(self.record('10.0.0.1'))
+        self.assertFalse(self.record('10.0.0.1'))
+        self.assertFalse(self.record('10.0.0.2', 'Googlebot/2.1'))
+
+        self.assertEqual(self.buffer.pending_count(self.resource.id), 1)
+        self.assertEqual(self.buffer.stats()['duplicates'], 1)
+        self.assertEqual(self.buffer.stats()['bots'], 1)
+
+    def test_flush_writes_rows_and_counter(self):
+        self.buffer._flush_interval = 3600
+        self.addCleanup(self.buffer.flush)
+        for i in range(3):
+            self.record(f'10.0.0.{i}')
+
+        self.assertEqual(ResourceView.objects.count(), 0)
+        self.assertEqual(self.buffer.flush(), 3)
+
+        self.resource.refresh_from_db()
+        self.assertEqual(ResourceView.objects.count(), 3)
+        self.assertEqual(self.resource.view_count, 3)
+        self.assertEqual(self.buffer.pending_count(self.resource.id), 0)
+
+    def test_rejected_row_drops_only_itself(self):
+        self.buffer._flush_interval = 3600
+        self.addCleanup(self.buffer.flush)
+        self.record('10.0.0.1')
+        self.record('unknown')
+        self.record('10.0.0.2')
+
+        with self.assertLogs('core.events', 'WARNING'):
+            self.assertEqual(self.buffer.flush(), 2)
+
+        self.resource.refresh_from_db()
+        self.assertEqual(
+            sorted(ResourceView.objects.values_list('ip_address', flat=True)), ['10.0.0.1', '10.0.0.2']
+        )
+        self.assertEqual(self.resource.view_count, 2)
+        self.assertEqual(self.buffer.stats()['dropped'], 1)
+
+    def test_clean_ip(self):
+        self.assertEqual(clean_ip(' 203.0.113.7 '), '203.0.113.7')
+        self.assertEqual(clean_ip('2001:db8::1'), '2001:db8::1')
+        self.assertIsNone(clean_ip('unknown'))
+        self.assertIsNone(clean_ip(None))
+
+    @override_settings(EVENT_FLUSH_INTERVAL=0)
+    def test_view_without_client_address_is_stored_without_ip(self):
+        self.client.force_login(get_user_model().objects.create_user('reader', 'reader@example.com', 'password'))
+        # e.g. behind a proxy on a unix socket
+        response = self.client.post(
+            f'/api/v1/resources/resources/{self.resource.slug}/view/', REMOTE_ADDR='', HTTP_USER_AGENT=BROWSER_UA
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['view_count'], 1)
+        self.assertIsNone(ResourceView.objects.get().ip_address)
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class RatingAggregateTests(TestCase):
+    """Ratings are folded into a running sum, count and histogram on the resource."""
+
+    def setUp(self):
+        resource_type = ResourceType.objects.create(name='Guide', slug='guide')
+        resource_category = ResourceCategory.objects.create(name='Backend', slug='backend')
+        self.resource = Resource.objects.create(
+            title='Resource', slug='resource', description='Resource', type=resource_type,
+            category=resource_category
+        )
+        User = get_user_model()
+        self.users = [User.objects.create_user(f'rater{i}', f'rater{i}@example.com', 'password') for i in range(3)]
+
+    def aggregate(self):
+        self.resource.refresh_from_db(fields=Resource.RATING_AGGREGATE_FIELDS)
+        return self.resource.rating, self.resource.rating_count, self.resource.rating_histogram
+
+    def rate(self, user, stars):
+        return ResourceRating.objects.create(resource=self.resource, user=user, rating=stars)
+
+    def test_new_changed_and_removed_ratings(self):
+        first = self.rate(self.users[0], 5)
+        self.rate(self.users[1], 4)
+        self.assertEqual(self.aggregate(), (Decimal('4.50'), 2, {5: 1, 4: 1, 3: 0, 2: 0, 1: 0}))
+
+        first.rating = 2
+        first.save()
+        self.assertEqual(self.aggregate(), (Decimal('3.00'), 2, {5: 0, 4: 1, 3: 0, 2: 1, 1: 0}))
+
+        first.delete()
+        self.assertEqual(self.aggregate(), (Decimal('4.00'), 1, {5: 0, 4: 1, 3: 0, 2: 0, 1: 0}))
+
+    def test_rate_action_updates_the_users_rating(self):
+        self.client.force_login(self.users[0])
+        url = f'/api/v1/resources/resources/{self.resource.slug}/rate/'
+
+        self.client.post(url, {'rating': 3}, content_type='application/json')
+        response = self.client.post(url, {'rating': 5}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rating_count'], 1)
+        self.assertEqual(response.json()['rating_histogram']['5'], 1)
+        self.assertEqual(ResourceRating.objects.get().user, self.users[0])
+
+    def test_reconcile_fixes_drift(self):
+        self.rate(self.users[0], 5)
+        self.rate(self.users[1], 3)
+        # A bulk update that bypasses ResourceRating.save
+        ResourceRating.objects.filter(user=self.users[1]).update(rating=1)
+
+        call_command('reconcile_resource_ratings', '--dry-run', stdout=io.StringIO())
+        self.assertEqual(self.aggregate()[:2], (Decimal('4.00'), 2))
+
+        call_command('reconcile_resource_ratings', stdout=io.StringIO())
+        self.assertEqual(self.aggregate(), (Decimal('3.00'), 2, {5: 1, 4: 0, 3: 0, 2: 0, 1: 1}))
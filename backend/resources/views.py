@@ -1,7 +1,5 @@
-import boto3
 import logging
-from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponseRedirect, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
@@ -17,7 +15,14 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, F
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 
+from core.ratelimit import TokenBucketThrottle, get_client_ip, rate_limited
+from core.events import clean_ip
+from core.filedelivery import serve_field_file
+from core.s3 import file_download_url, presigned_url
+from core.sketches import visitor_key
+from .events import download_events, view_events
 from .models import Resource, ResourceCategory, ResourceType, ResourceDownload, ResourceRating, ResourceView
 from .serializers import (
     ResourceListSerializer, ResourceDetailSerializer, ResourceCreateSerializer, ResourceUpdateSerializer,
@@ -28,8 +33,11 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
+CHECKLIST_PDF_KEY = 'resources/django-saas-checklist.pdf'
+
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(rate_limited('checklist_download'), name='post')
 class DjangoSaasChecklistDownloadView(View):
     """
     Generate presigned S3 URL for Django SaaS Checklist PDF download
@@ -66,30 +74,13 @@ class DjangoSaasChecklistDownloadView(View):
         Generate a presigned S3 URL for the Django SaaS Checklist PDF
         """
         try:
-            # Initialize S3 client
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME
-            )
-            
-            # Generate presigned URL (expires in 1 hour)
-            presigned_url = s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
-                    'Key': 'resources/django-saas-checklist.pdf'
-                },
-                ExpiresIn=3600  # 1 hour
-            )
-            
-            return presigned_url
+            # Shared client; the signed URL is reused until close to expiry
+            return presigned_url(CHECKLIST_PDF_KEY, expires_in=3600)
             
         except Exception as e:
             logger.error(f"Error generating S3 presigned URL: {str(e)}")
             # Fallback: return a direct download link if S3 is not configured
-            return f"/static/resources/django-saas-checklist.pdf?email={email}&name={firstName}"
+            return reverse('api:lead-magnet-file', args=['django-saas-checklist'])
 
 
 # Fallback view for direct downloads (when S3 is not configured)
@@ -111,7 +102,7 @@ def django_saas_checklist_download_fallback(request):
         logger.info(f"Fallback PDF download for email: {email}, name: {firstName}")
         
         # Return a direct link to the static file
-        download_url = f"/static/resources/django-saas-checklist.pdf"
+        download_url = reverse('api:lead-magnet-file', args=['django-saas-checklist'])
         
         return JsonResponse({
             'downloadUrl': download_url,
@@ -123,6 +114,18 @@ def django_saas_checklist_download_fallback(request):
         return JsonResponse({'error': 'Internal server error'}, status=500)
 
 
+@require_http_methods(["GET", "HEAD"])
+@rate_limited('file_download')
+def resource_file_download(request, slug):
+    """
+    Serve a resource's file with Range and conditional request support
+    """
+    resource = get_object_or_404(Resource, slug=slug, is_active=True)
+    if not resource.file and resource.external_url:
+        return HttpResponseRedirect(resource.external_url)
+    return serve_field_file(request, resource.file)
+
+
 class ResourceCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = ResourceCategory.objects.filter(is_active=True)
     serializer_class = ResourceCategorySerializer
@@ -146,6 +149,12 @@ class ResourceTypeViewSet(viewsets.ReadOnlyModelViewSet):
 class ResourceViewSet(viewsets.ModelViewSet):
     queryset = Resource.objects.filter(is_active=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scopes = {
+        'download': 'resource_download',
+        'view': 'resource_view',
+        'rate': 'resource_rate',
+    }
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['type', 'category', 'is_featured', 'is_premium']
     search_fields = ['title', 'description', 'tags', 'author']
@@ -183,39 +192,36 @@ class ResourceViewSet(viewsets.ModelViewSet):
         
         return queryset
 
+    def _build_event(self, model, resource, request):
+        """Build an unsaved view/download row and the visitor key used to dedupe it"""
+        referrer = request.META.get('HTTP_REFERER') or ''
+        if not referrer.startswith(('http://', 'https://')):
+            referrer = ''
+        event = model(
+            resource_id=resource.id,
+            user=request.user if request.user.is_authenticated else None,
+            ip_address=clean_ip(self._get_client_ip(request)),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            referrer=referrer[:200]
+        )
+        return event, visitor_key(event.user_id, event.ip_address, event.user_agent)
+
     @action(detail=True, methods=['post'])
     def download(self, request, slug=None):
         """Record a resource download"""
         resource = self.get_object()
         
-        # Create download record
-        referrer = request.META.get('HTTP_REFERER', '')
-        if referrer is None:
-            referrer = ''
-            
-        download_data = {
-            'resource': resource.id,
-            'ip_address': self._get_client_ip(request),
-            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-            'referrer': referrer
-        }
-        
-        if request.user.is_authenticated:
-            download_data['user'] = request.user.id
-        
-        serializer = ResourceDownloadSerializer(data=download_data)
-        if serializer.is_valid():
-            serializer.save()
-            
-            # Increment download count
-            resource.increment_download()
-            
-            return Response({
-                'message': 'Download recorded successfully',
-                'download_count': resource.download_count
-            }, status=status.HTTP_200_OK)
+        # Counts include events still buffered in this process
+        download_count = resource.download_count + download_events.pending_count(resource.id)
+        event, visitor = self._build_event(ResourceDownload, resource, request)
+        if download_events.record(event, visitor):
+            download_count += 1
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'message': 'Download recorded successfully',
+            'download_count': download_count,
+            'download_url': file_download_url(resource.file) or resource.external_url
+        }, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
     def rate(self, request, slug=None):
@@ -239,22 +245,17 @@ class ResourceViewSet(viewsets.ModelViewSet):
             ).first()
         
         if existing_rating:
-            # Update existing rating
+            # Update existing rating; the model folds the change into the aggregate
             existing_rating.rating = rating_value
             existing_rating.comment = comment
             existing_rating.save()
             
-            # Recalculate average rating
-            ratings = ResourceRating.objects.filter(resource=resource)
-            total_rating = sum(r.rating for r in ratings)
-            resource.rating = total_rating / ratings.count()
-            resource.rating_count = ratings.count()
-            resource.save()
-            
+            resource.refresh_from_db(fields=Resource.RATING_AGGREGATE_FIELDS)
             return Response({
                 'message': 'Rating updated successfully',
                 'rating': resource.rating,
-                'rating_count': resource.rating_count
+                'rating_count': resource.rating_count,
+                'rating_histogram': resource.rating_histogram
             }, status=status.HTTP_200_OK)
         else:
             # Create new rating
@@ -265,17 +266,17 @@ class ResourceViewSet(viewsets.ModelViewSet):
                 'ip_address': self._get_client_ip(request)
             }
             
-            if request.user.is_authenticated:
-                rating_data['user'] = request.user.id
-            
             serializer = ResourceRatingSerializer(data=rating_data)
             if serializer.is_valid():
-                serializer.save()
+                # user is read-only on the serializer, so it has to be passed to save()
+                serializer.save(user=request.user if request.user.is_authenticated else None)
                 
+                resource.refresh_from_db(fields=Resource.RATING_AGGREGATE_FIELDS)
                 return Response({
                     'message': 'Rating submitted successfully',
                     'rating': resource.rating,
-                    'rating_count': resource.rating_count
+                    'rating_count': resource.rating_count,
+                    'rating_histogram': resource.rating_histogram
                 }, status=status.HTTP_201_CREATED)
             
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -285,34 +286,15 @@ class ResourceViewSet(viewsets.ModelViewSet):
         """Record a resource view"""
         resource = self.get_object()
         
-        # Create view record
-        referrer = request.META.get('HTTP_REFERER', '')
-        if referrer is None:
-            referrer = ''
-            
-        view_data = {
-            'resource': resource.id,
-            'ip_address': self._get_client_ip(request),
-            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-            'referrer': referrer
-        }
-        
-        if request.user.is_authenticated:
-            view_data['user'] = request.user.id
-        
-        serializer = ResourceViewSerializer(data=view_data)
-        if serializer.is_valid():
-            serializer.save()
-            
-            # Increment view count
-            resource.increment_view()
-            
-            return Response({
-                'message': 'View recorded successfully',
-                'view_count': resource.view_count
-            }, status=status.HTTP_200_OK)
+        view_count = resource.view_count + view_events.pending_count(resource.id)
+        event, visitor = self._build_event(ResourceView, resource, request)
+        if view_events.record(event, visitor):
+            view_count += 1
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'message': 'View recorded successfully',
+            'view_count': view_count
+        }, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
     def featured(self, request):
@@ -352,16 +334,11 @@ class ResourceViewSet(viewsets.ModelViewSet):
 
     def _get_client_ip(self, request):
         """Get client IP address from request"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return get_client_ip(request)
 
 
 class ResourceDownloadViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = ResourceDownload.objects.all()
+    queryset = ResourceDownload.objects.select_related('user_agent_ref')
     serializer_class = ResourceDownloadSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -381,7 +358,7 @@ class ResourceRatingViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class ResourceViewViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = ResourceView.objects.all()
+    queryset = ResourceView.objects.select_related('user_agent_ref')
     serializer_class = ResourceViewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
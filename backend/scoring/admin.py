@@ -0,0 +1,39 @@
+"""
+Admin configuration for lead scoring app.
+"""
+from django.contrib import admin
+
+from .models import LeadScoringModel
+
+
+@admin.register(LeadScoringModel)
+class LeadScoringModelAdmin(admin.ModelAdmin):
+    """Admin configuration for LeadScoringModel model."""
+
+    list_display = ['name', 'submission_type', 'version', 'is_active', 'max_score', 'updated_at']
+    list_filter = ['submission_type', 'is_active']
+    search_fields = ['name', 'notes']
+    readonly_fields = ['version', 'created_at', 'updated_at']
+
+    fieldsets = (
+        ('Model', {
+            'fields': ('name', 'submission_type', 'version', 'is_active', 'notes')
+        }),
+        ('Weights', {
+            'fields': ('weights', 'max_score')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    actions = ['clone_as_new_version']
+
+    def clone_as_new_version(self, request, queryset):
+        """Copy the selected models into new, inactive versions."""
+        for scoring_model in queryset:
+            scoring_model.clone()
+        self.message_user(request, f'{queryset.count()} scoring model(s) cloned as new versions.')
+
+    clone_as_new_version.short_description = 'Clone as new version'
@@ -0,0 +1,14 @@
+"""
+Lead scoring app configuration.
+"""
+from django.apps import AppConfig
+
+
+class ScoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'scoring'
+    verbose_name = 'Lead Scoring'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import scoring.signals  # noqa: F401
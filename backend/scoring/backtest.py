@@ -0,0 +1,84 @@
+"""
+Bulk backtesting of lead scoring models against historical outcomes.
+"""
+import time
+
+from django.apps import apps
+
+from .engine import DEFAULT_WEIGHTS, CompiledScoringModel
+
+
+# Submission model, outcome field and the values that count as a conversion.
+OUTCOMES = {
+    'contact': ('contact.ContactSubmission', 'status', {'won'}),
+    'lead_magnet': ('lead_magnets.LeadMagnetSubmission', 'status', {'converted'}),
+}
+
+
+def get_submission_queryset(submission_type):
+    """Return all historical submissions for a submission type."""
+    model_label = OUTCOMES[submission_type][0]
+    return apps.get_model(model_label).objects.all()
+
+
+def backtest(compiled, submission_type, queryset=None, threshold=50, chunk_size=2000):
+    """
+    Score historical submissions with a compiled model and measure lift.
+
+    Lift is the conversion rate of submissions scoring at or above
+    ``threshold`` divided by the overall conversion rate.
+    """
+    _, outcome_field, positive_values = OUTCOMES[submission_type]
+    if queryset is None:
+        queryset = get_submission_queryset(submission_type)
+
+    rows = queryset.order_by().values_list(*compiled.fields, outcome_field)
+    outcome_index = len(compiled.fields)
+
+    total = converted = flagged = flagged_converted = score_sum = 0
+    started = time.perf_counter()
+    for row in rows.iterator(chunk_size=chunk_size):
+        score = compiled.score_values(row)
+        is_converted = row[outcome_index] in positive_values
+        total += 1
+        score_sum += score
+        if is_converted:
+            converted += 1
+        if score >= threshold:
+            flagged += 1
+            if is_converted:
+                flagged_converted += 1
+    elapsed = time.perf_counter() - started
+
+    base_rate = converted / total if total else 0
+    flagged_rate = flagged_converted / flagged if flagged else 0
+
+    return {
+        'version': compiled.version,
+        'submissions': total,
+        'elapsed_seconds': round(elapsed, 4),
+        'throughput_per_second': round(total / elapsed, 1) if elapsed > 0 else 0,
+        'average_score': round(score_sum / total, 2) if total else 0,
+        'converted': converted,
+        'base_conversion_rate': round(base_rate * 100, 2),
+        'flagged': flagged,
+        'flagged_conversion_rate': round(flagged_rate * 100, 2),
+        'recall': round(flagged_converted / converted * 100, 2) if converted else 0,
+        'lift': round(flagged_rate / base_rate, 2) if base_rate else 0,
+    }
+
+
+def backtest_versions(submission_type, scoring_models, include_default=True, **kwargs):
+    """Backtest several scoring models against the same submissions."""
+    compiled_models = []
+    if include_default:
+        compiled_models.append(('Built-in defaults', CompiledScoringModel(DEFAULT_WEIGHTS[submission_type])))
+    for scoring_model in scoring_models:
+        compiled_models.append((scoring_model.name, scoring_model.compile()))
+
+    results = []
+    for name, compiled in compiled_models:
+        result = backtest(compiled, submission_type, **kwargs)
+        result['name'] = name
+        results.append(result)
+    return results
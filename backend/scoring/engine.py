@@ -0,0 +1,177 @@
+"""
+Lead scoring engine shared by contact and lead magnet submissions.
+
+Weight tables are stored as versioned LeadScoringModel rows. The active table
+for each submission type is compiled once per process into an immutable lookup
+and reused until a save or delete bumps the shared version key in the cache.
+"""
+import threading
+from types import MappingProxyType
+
+from core.cache import bump_cache_version, cache_version
+
+
+VERSION_CACHE_KEY = 'lead_scoring:version'
+
+# Weight table key matching any non-empty field value.
+ANY_VALUE = '*'
+
+# Built-in weight tables, used when no active LeadScoringModel exists.
+DEFAULT_WEIGHTS = {
+    'contact': {
+        # Basic information (0-20 points)
+        'name': {ANY_VALUE: 5},
+        'email': {ANY_VALUE: 5},
+        'phone': {ANY_VALUE: 5},
+        'company': {ANY_VALUE: 5},
+        # Project details (0-40 points)
+        'project_budget': {
+            'under-10k': 5,
+            '10k-25k': 10,
+            '25k-50k': 15,
+            '50k-100k': 20,
+            '100k-250k': 25,
+            '250k+': 30,
+            'not-sure': 10,
+        },
+        'timeline': {
+            'asap': 20,
+            '1-3-months': 15,
+            '3-6-months': 10,
+            '6-12-months': 5,
+            '12-months+': 0,
+            'flexible': 10,
+        },
+        'team_size': {
+            'solo': 10,
+            '2-5': 15,
+            '6-10': 20,
+            '11-25': 25,
+            '26-50': 30,
+            '50+': 35,
+        },
+        'industry': {
+            'fintech': 20,
+            'healthcare': 20,
+            'ecommerce': 15,
+            'saas': 25,
+            'education': 15,
+            'real-estate': 10,
+            'manufacturing': 15,
+            'consulting': 10,
+            'other': 10,
+        },
+        'urgency': {
+            'low': 5,
+            'medium': 10,
+            'high': 20,
+            'critical': 25,
+        },
+        # Subject priority (0-20 points)
+        'subject': {
+            'project': 20,
+            'consultation': 15,
+            'quote': 15,
+            'partnership': 10,
+            'general': 5,
+            'support': 10,
+            'career': 5,
+            'other': 5,
+        },
+    },
+    'lead_magnet': {
+        'company': {ANY_VALUE: 10},
+        'role': {
+            'founder': 20,
+            'ceo': 20,
+            'cto': 20,
+            'developer': 15,
+            'product-manager': 15,
+        },
+        'utm_source': {ANY_VALUE: 5},
+        'utm_campaign': {ANY_VALUE: 5},
+    },
+}
+
+
+class CompiledScoringModel:
+    """Immutable, pre-indexed form of a weight table."""
+
+    __slots__ = ('version', 'max_score', 'fields', '_rules')
+
+    def __init__(self, weights, version=0, max_score=100):
+        rules = []
+        for field, table in weights.items():
+            table = dict(table)
+            presence_points = table.pop(ANY_VALUE, 0)
+            rules.append((MappingProxyType(table), presence_points))
+        self.version = version
+        self.max_score = max_score
+        self.fields = tuple(weights)
+        self._rules = tuple(rules)
+
+    def score_values(self, values):
+        """Score a sequence of field values ordered like ``self.fields``."""
+        total = 0
+        for value, (table, presence_points) in zip(values, self._rules):
+            if value:
+                total += table.get(value, presence_points)
+        return max(0, min(total, self.max_score))
+
+    def score(self, submission):
+        """Score a submission instance."""
+        return self.score_values([getattr(submission, field, None) for field in self.fields])
+
+
+class ScoringRegistry:
+    """Process-level cache of compiled scoring models, one per submission type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._compiled = {}
+        self._token = None
+
+    def get(self, submission_type):
+        """Return the compiled active model for a submission type."""
+        token = cache_version(VERSION_CACHE_KEY)
+        if token == self._token:
+            compiled = self._compiled.get(submission_type)
+            if compiled is not None:
+                return compiled
+
+        with self._lock:
+            if token != self._token:
+                self._compiled = {}
+                self._token = token
+            compiled = self._compiled.get(submission_type)
+            if compiled is None:
+                compiled = self._compile(submission_type)
+                self._compiled[submission_type] = compiled
+            return compiled
+
+    def invalidate(self):
+        """Drop compiled models in every process sharing the cache."""
+        with self._lock:
+            self._compiled = {}
+            self._token = None
+        bump_cache_version(VERSION_CACHE_KEY)
+
+    def _compile(self, submission_type):
+        from .models import LeadScoringModel
+
+        scoring_model = LeadScoringModel.objects.filter(
+            submission_type=submission_type,
+            is_active=True
+        ).order_by('-version').first()
+
+        if scoring_model:
+            return scoring_model.compile()
+        return CompiledScoringModel(DEFAULT_WEIGHTS[submission_type])
+
+
+registry = ScoringRegistry()
+
+
+def score_submission(submission, submission_type):
+    """Score a submission with the active model for its type."""
+    return registry.get(submission_type).score(submission)
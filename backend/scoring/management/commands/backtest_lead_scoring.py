@@ -0,0 +1,67 @@
+"""
+Management command to backtest lead scoring models against historical submissions.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from scoring.backtest import OUTCOMES, backtest_versions
+from scoring.models import LeadScoringModel
+
+
+class Command(BaseCommand):
+    help = 'Score historical submissions with each scoring model version and report throughput and lift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            dest='submission_type',
+            choices=sorted(OUTCOMES),
+            default='contact',
+            help='Submission type to backtest (default: contact)'
+        )
+        parser.add_argument(
+            '--model-version',
+            dest='versions',
+            type=int,
+            action='append',
+            help='Only backtest these versions (repeatable). Defaults to all versions.'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            default=50,
+            help='Score at or above which a submission counts as qualified (default: 50)'
+        )
+        parser.add_argument(
+            '--no-default',
+            action='store_true',
+            help='Skip the built-in default weights'
+        )
+
+    def handle(self, *args, **options):
+        submission_type = options['submission_type']
+        scoring_models = LeadScoringModel.objects.filter(submission_type=submission_type).order_by('version')
+        if options['versions']:
+            scoring_models = scoring_models.filter(version__in=options['versions'])
+            if not scoring_models.exists():
+                raise CommandError('No scoring models match the requested versions.')
+
+        results = backtest_versions(
+            submission_type,
+            scoring_models,
+            include_default=not options['no_default'],
+            threshold=options['threshold']
+        )
+
+        self.stdout.write(
+            f"{'Version':>7}  {'Name':<30} {'Rows':>8} {'Rows/s':>10} {'Avg':>6} "
+            f"{'Base %':>7} {'Flagged':>8} {'Flag %':>7} {'Recall %':>8} {'Lift':>6}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['version']:>7}  {result['name'][:30]:<30} {result['submissions']:>8} "
+                f"{result['throughput_per_second']:>10} {result['average_score']:>6} "
+                f"{result['base_conversion_rate']:>7} {result['flagged']:>8} "
+                f"{result['flagged_conversion_rate']:>7} {result['recall']:>8} {result['lift']:>6}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Backtested {len(results)} scoring model(s).'))
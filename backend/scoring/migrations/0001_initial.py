@@ -0,0 +1,68 @@
+# Generated by Django 5.0 on 2026-10-19 05:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadScoringModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "submission_type",
+                    models.CharField(
+                        choices=[
+                            ("contact", "Contact Submission"),
+                            ("lead_magnet", "Lead Magnet Submission"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(editable=False)),
+                (
+                    "weights",
+                    models.JSONField(
+                        default=dict,
+                        help_text='Points per field value as JSON. Use "*" to match any non-empty value. Example: {"company": {"*": 10}, "timeline": {"asap": 20, "1-3-months": 15}}',
+                    ),
+                ),
+                (
+                    "max_score",
+                    models.PositiveIntegerField(
+                        default=100, help_text="Scores are capped at this value"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Only one model per submission type can be active",
+                    ),
+                ),
+                ("notes", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Lead Scoring Model",
+                "verbose_name_plural": "Lead Scoring Models",
+                "ordering": ["submission_type", "-version"],
+                "unique_together": {("submission_type", "version")},
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+"""
+Lead scoring models for KKEVO.
+"""
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models, transaction
+
+from .backtest import OUTCOMES, get_submission_queryset
+from .engine import CompiledScoringModel
+
+
+class LeadScoringModel(models.Model):
+    """Versioned weight table used to score inbound submissions."""
+
+    SUBMISSION_TYPE_CHOICES = [
+        ('contact', 'Contact Submission'),
+        ('lead_magnet', 'Lead Magnet Submission'),
+    ]
+
+    name = models.CharField(max_length=100)
+    submission_type = models.CharField(max_length=20, choices=SUBMISSION_TYPE_CHOICES)
+    version = models.PositiveIntegerField(editable=False)
+    weights = models.JSONField(
+        default=dict,
+        help_text=(
+            'Points per field value as JSON. Use "*" to match any non-empty value. '
+            'Example: {"company": {"*": 10}, "timeline": {"asap": 20, "1-3-months": 15}}'
+        )
+    )
+    max_score = models.PositiveIntegerField(default=100, help_text="Scores are capped at this value")
+    is_active = models.BooleanField(
+        default=False,
+        help_text="Only one model per submission type can be active"
+    )
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['submission_type', '-version']
+        verbose_name = 'Lead Scoring Model'
+        verbose_name_plural = 'Lead Scoring Models'
+        unique_together = [['submission_type', 'version']]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_submission_type_display()} v{self.version})"
+
+    def clean(self):
+        """Validate the weight table shape and that it only names fields of the submission model."""
+        if not isinstance(self.weights, dict):
+            raise ValidationError({'weights': 'Weights must be a JSON object keyed by field name.'})
+        submission_meta = None
+        if self.submission_type in OUTCOMES:
+            submission_meta = get_submission_queryset(self.submission_type).model._meta
+        for field, table in self.weights.items():
+            if submission_meta is not None:
+                try:
+                    concrete = submission_meta.get_field(field).concrete
+                except FieldDoesNotExist:
+                    concrete = False
+                if not concrete:
+                    raise ValidationError(
+                        {'weights': f'"{field}" is not a field of {submission_meta.verbose_name}.'}
+                    )
+            if not isinstance(table, dict):
+                raise ValidationError({'weights': f'Weights for "{field}" must be a JSON object.'})
+            for value, points in table.items():
+                # bool is an int subclass, but true/false are not points
+                if isinstance(points, bool) or not isinstance(points, int):
+                    raise ValidationError({'weights': f'Points for "{field}"="{value}" must be an integer.'})
+
+    def save(self, *args, **kwargs):
+        """Assign the next version number and keep a single active model per type."""
+        with transaction.atomic():
+            if self.version is None:
+                latest = LeadScoringModel.objects.filter(
+                    submission_type=self.submission_type
+                ).aggregate(latest=models.Max('version'))['latest']
+                self.version = (latest or 0) + 1
+
+            if self.is_active:
+                LeadScoringModel.objects.filter(
+                    submission_type=self.submission_type,
+                    is_active=True
+                ).exclude(pk=self.pk).update(is_active=False)
+
+            super().save(*args, **kwargs)
+
+    def compile(self):
+        """Return the immutable lookup used by the scoring engine."""
+        return CompiledScoringModel(self.weights, version=self.version, max_score=self.max_score)
+
+    def clone(self, **overrides):
+        """Create an inactive copy of this model as the next version."""
+        values = {
+            'name': self.name,
+            'submission_type': self.submission_type,
+            'weights': self.weights,
+            'max_score': self.max_score,
+            'notes': self.notes,
+            'is_active': False,
+        }
+        values.update(overrides)
+        return LeadScoringModel.objects.create(**values)
@@ -0,0 +1,16 @@
+"""
+Signal handlers for lead scoring.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .engine import registry
+from .models import LeadScoringModel
+
+
+@receiver(post_save, sender=LeadScoringModel)
+@receiver(post_delete, sender=LeadScoringModel)
+def invalidate_compiled_models(sender, **kwargs):
+    """Recompile weight tables after any scoring model change."""
+    transaction.on_commit(registry.invalidate)
@@ -0,0 +1,112 @@
+"""
+Tests for the lead scoring engine and its per-process registry of compiled models.
+"""
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from .engine import DEFAULT_WEIGHTS, CompiledScoringModel, registry, score_submission
+from .models import LeadScoringModel
+
+
+def build_lead(**fields):
+    fields = {'company': '', 'role': '', 'utm_source': '', 'utm_campaign': '', **fields}
+    return SimpleNamespace(**fields)
+
+
+class CompiledScoringModelTests(TestCase):
+    """Weight tables score exact values, fall back to presence points and are capped."""
+
+    def test_exact_values_presence_and_cap(self):
+        compiled = CompiledScoringModel({'role': {'cto': 20, '*': 1}, 'company': {'*': 10}}, max_score=25)
+
+        self.assertEqual(compiled.score(build_lead(role='cto')), 20)
+        self.assertEqual(compiled.score(build_lead(role='intern')), 1)
+        self.assertEqual(compiled.score(build_lead(role='cto', company='Acme')), 25)
+        self.assertEqual(compiled.score(build_lead()), 0)
+
+
+class ScoringRegistryTests(TestCase):
+    """The active model is compiled once per process until a committed change bumps the version."""
+
+    def setUp(self):
+        cache.clear()
+        registry.invalidate()
+        self.addCleanup(registry.invalidate)
+
+    def test_built_in_weights_without_an_active_model(self):
+        LeadScoringModel.objects.create(
+            name='Draft', submission_type='lead_magnet', weights={'company': {'*': 50}}
+        )
+
+        compiled = registry.get('lead_magnet')
+
+        self.assertEqual(compiled.fields, tuple(DEFAULT_WEIGHTS['lead_magnet']))
+        self.assertEqual(score_submission(build_lead(company='Acme', role='cto'), 'lead_magnet'), 30)
+
+    def test_steady_state_scoring_makes_no_queries(self):
+        score_submission(build_lead(company='Acme'), 'lead_magnet')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 10)
+
+    def test_activating_a_model_recompiles_after_commit(self):
+        self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 10)
+
+        # Saved, but the transaction has not committed
+        model = LeadScoringModel.objects.create(
+            name='Company heavy', submission_type='lead_magnet', weights={'company': {'*': 50}}, is_active=True
+        )
+        self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 10)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model.save()
+
+        self.assertEqual(registry.get('lead_magnet').version, model.version)
+        self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 50)
+
+    def test_new_active_version_replaces_the_old_one(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = LeadScoringModel.objects.create(
+                name='v1', submission_type='lead_magnet', weights={'company': {'*': 50}}, is_active=True
+            )
+        self.assertEqual(registry.get('lead_magnet').version, first.version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second = first.clone(weights={'company': {'*': 40}}, is_active=True)
+
+        first.refresh_from_db()
+        self.assertFalse(first.is_active)
+        self.assertEqual(second.version, first.version + 1)
+        self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 40)
+
+    def test_deleting_the_active_model_restores_built_in_weights(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            model = LeadScoringModel.objects.create(
+                name='Company heavy', submission_type='lead_magnet', weights={'company': {'*': 50}}, is_active=True
+            )
+        self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 50)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model.delete()
+
+        self.assertEqual(score_submission(build_lead(company='Acme'), 'lead_magnet'), 10)
+
+
+class LeadScoringModelValidationTests(TestCase):
+    """Weight tables may only name fields of the submission model and award integer points."""
+
+    def build(self, weights, submission_type='lead_magnet'):
+        return LeadScoringModel(name='Draft', submission_type=submission_type, weights=weights)
+
+    def test_accepts_submission_fields(self):
+        self.build({'company': {'*': 10}, 'role': {'cto': 20}}).full_clean()
+        for submission_type, weights in DEFAULT_WEIGHTS.items():
+            self.build(weights, submission_type).full_clean()
+
+    def test_rejects_unknown_fields_and_non_integer_points(self):
+        for weights in ({'budget': {'*': 10}}, {'company': {'*': True}}, {'company': {'*': 1.5}}, {'company': 10}):
+            with self.subTest(weights=weights), self.assertRaises(ValidationError):
+                self.build(weights).full_clean()
@@ -5,3 +5,7 @@ class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
     verbose_name = 'Services'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import services.signals  # noqa: F401
@@ -0,0 +1,65 @@
+"""
+Process-level snapshot of the active company configuration.
+
+The configuration changes a few times a year but is read on every page
+load, so each worker process keeps the active ``CompanyConfig`` and its
+serialized, frozen payload in memory. A version number in the shared cache
+says when the snapshot is stale: saving or deleting a configuration bumps
+it (see ``services.signals``) and every process reloads on its next read.
+In steady state a read costs one cache lookup and no database queries.
+"""
+import threading
+from collections import namedtuple
+
+from core.cache import bump_cache_version, cache_version
+
+from .defaults import DEFAULT_COMPANY_CONFIG, freeze
+
+VERSION_KEY = 'services:company-config-version'
+
+ConfigSnapshot = namedtuple('ConfigSnapshot', ['version', 'config', 'payload'])
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def config_version():
+    """Return the current configuration version, starting one if none is set."""
+    return cache_version(VERSION_KEY)
+
+
+def bump_config_version():
+    """Make every process reload the configuration on its next read."""
+    bump_cache_version(VERSION_KEY)
+
+
+def get_snapshot():
+    """
+    Return the current ``ConfigSnapshot``.
+
+    ``config`` is None when no configuration is active, in which case
+    ``payload`` is the default configuration. The version is read before
+    the database, so a change committed during a reload is picked up on
+    the following read rather than lost.
+    """
+    global _snapshot
+    version = config_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    from .models import CompanyConfig
+    from .serializers import CompanyConfigSerializer
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is None or snapshot.version != version:
+            config = CompanyConfig.objects.filter(is_active=True).first()
+            payload = freeze(CompanyConfigSerializer(config).data) if config else DEFAULT_COMPANY_CONFIG
+            snapshot = _snapshot = ConfigSnapshot(version, config, payload)
+    return snapshot
+
+
+def get_config_payload():
+    """Return the serialized active configuration (or the default) as read-only data."""
+    return get_snapshot().payload
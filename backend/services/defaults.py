@@ -0,0 +1,127 @@
+"""
+Fallback payloads for the public company endpoints.
+
+They are frozen once at import (read-only mappings and tuples) so every
+request can share them without copying and none can alter them.
+"""
+from types import MappingProxyType
+
+
+def freeze(value):
+    """Return a read-only copy of nested dicts and lists."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# Served while the database has no active stats
+DEFAULT_COMPANY_STATS = freeze([
+    {
+        'id': 'fallback-1',
+        'name': 'projects',
+        'value': 150,
+        'suffix': '+',
+        'label': 'Projects Delivered',
+        'description': 'Successfully completed projects across various industries',
+        'icon_name': 'rocket',
+        'color_scheme': 'from-blue-500 to-cyan-500',
+        'order': 1,
+        'is_active': True
+    },
+    {
+        'id': 'fallback-2',
+        'name': 'clients',
+        'value': 50,
+        'suffix': '+',
+        'label': 'Happy Clients',
+        'description': 'Satisfied clients who trust us with their digital transformation',
+        'icon_name': 'users',
+        'color_scheme': 'from-green-500 to-emerald-500',
+        'order': 2,
+        'is_active': True
+    },
+    {
+        'id': 'fallback-3',
+        'name': 'experience',
+        'value': 8,
+        'suffix': '+',
+        'label': 'Years Experience',
+        'description': 'Deep expertise in modern software development technologies',
+        'icon_name': 'clock',
+        'color_scheme': 'from-purple-500 to-pink-500',
+        'order': 3,
+        'is_active': True
+    },
+    {
+        'id': 'fallback-4',
+        'name': 'satisfaction',
+        'value': 99,
+        'suffix': '%',
+        'label': 'Client Satisfaction',
+        'description': 'Consistently high satisfaction ratings from our clients',
+        'icon_name': 'award',
+        'color_scheme': 'from-yellow-500 to-orange-500',
+        'order': 4,
+        'is_active': True
+    }
+])
+
+# Served when reading the stats fails
+ERROR_COMPANY_STATS = freeze([
+    {
+        'id': 'error-fallback-1',
+        'name': 'projects',
+        'value': 150,
+        'suffix': '+',
+        'label': 'Projects Delivered',
+        'description': 'Successfully completed projects across various industries',
+        'icon_name': 'rocket',
+        'color_scheme': 'from-blue-500 to-cyan-500',
+        'order': 1,
+        'is_active': True
+    },
+    {
+        'id': 'error-fallback-2',
+        'name': 'clients',
+        'value': 50,
+        'suffix': '+',
+        'label': 'Happy Clients',
+        'description': 'Satisfied clients who trust us with their digital transformation',
+        'icon_name': 'users',
+        'color_scheme': 'from-green-500 to-emerald-500',
+        'order': 2,
+        'is_active': True
+    }
+])
+
+# Served while no active configuration exists
+DEFAULT_COMPANY_CONFIG = freeze({
+    'hero_headline': 'We Build Software That Moves Markets',
+    'hero_subtitle': 'Transform your business with cutting-edge software solutions. From web applications to AI-powered systems, we deliver results that drive growth.',
+    'hero_features': [
+        'Custom Software Development',
+        'Web & Mobile Applications',
+        'Cloud Infrastructure',
+        'AI & Machine Learning',
+    ],
+    'cta_headline': 'Ready to Transform Your Business?',
+    'cta_subtitle': "Let's discuss how our innovative software solutions can drive growth, streamline operations, and create competitive advantages for your business.",
+    'cta_benefits': [
+        'Free initial consultation and project assessment',
+        'Transparent pricing with no hidden fees',
+        'Dedicated project manager and development team',
+        'Regular progress updates and milestone reviews',
+        'Post-launch support and maintenance',
+        'Scalable solutions that grow with your business',
+    ],
+    'company_phone': '+1 (555) 123-4567',
+    'company_email': 'hello@kkevo.com',
+    'company_address': '',
+    'live_chat_enabled': True,
+    'trust_companies': ['TechCorp', 'FinanceBank', 'DataFlow', 'InsightMetrics'],
+    'linkedin_url': '',
+    'twitter_url': '',
+    'github_url': '',
+})
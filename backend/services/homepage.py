@@ -0,0 +1,101 @@
+"""
+Precomputed landing page snapshot.
+
+The homepage shows company stats, site configuration, services, team and
+testimonials. Each of these sections is serialized once and cached together
+with an ETag of its JSON, so serving the homepage reads only the cache.
+Saving or deleting a model behind a section rebuilds that section alone
+(see ``services.signals``); the cache timeout only catches bulk updates that
+send no signals. ETags are content hashes, so a rebuild that changes
+nothing keeps the same tag and clients keep their copy.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
+
+from team.models import TeamMember
+from team.serializers import TeamMemberListSerializer
+from testimonials.models import Testimonial
+from testimonials.serializers import TestimonialListSerializer
+
+from .company_config import get_config_payload
+from .defaults import DEFAULT_COMPANY_STATS
+from .models import CompanyConfig, CompanyStats, Service
+from .serializers import CompanyStatsSerializer, ServiceListSerializer
+
+CACHE_KEY = 'homepage:section:{}'
+
+
+def _stats():
+    stats = CompanyStats.objects.filter(is_active=True).order_by('order', 'name')
+    return CompanyStatsSerializer(stats, many=True).data or DEFAULT_COMPANY_STATS
+
+
+def _config():
+    return get_config_payload()
+
+
+def _services():
+    services = Service.objects.filter(is_active=True).order_by('order', 'title')
+    return ServiceListSerializer(services, many=True).data
+
+
+def _team():
+    members = TeamMember.objects.filter(is_active=True).order_by('order', 'name')
+    return TeamMemberListSerializer(members, many=True).data
+
+
+def _testimonials():
+    testimonials = Testimonial.objects.filter(is_active=True).order_by('order', '-rating')
+    return TestimonialListSerializer(testimonials, many=True).data
+
+
+# Section name -> builder, in the order sections are returned. Each builder
+# mirrors the unpaginated list of the matching standalone endpoint.
+SECTIONS = {
+    'stats': _stats,
+    'config': _config,
+    'services': _services,
+    'team': _team,
+    'testimonials': _testimonials,
+}
+
+# Models whose changes invalidate each section
+SECTION_MODELS = {
+    CompanyStats: 'stats',
+    CompanyConfig: 'config',
+    Service: 'services',
+    TeamMember: 'team',
+    Testimonial: 'testimonials',
+}
+
+
+def make_etag(payload):
+    """Return a strong ETag for serialized JSON."""
+    return f'"{hashlib.blake2b(payload, digest_size=12).hexdigest()}"'
+
+
+def rebuild_section(name):
+    """Serialize section ``name``, cache it and return ``{'etag', 'data'}``."""
+    payload = json.dumps(SECTIONS[name](), cls=JSONEncoder, ensure_ascii=False).encode('utf-8')
+    entry = {'etag': make_etag(payload), 'data': json.loads(payload)}
+    cache.set(CACHE_KEY.format(name), entry, settings.HOMEPAGE_CACHE_TTL)
+    return entry
+
+
+def get_sections(names=None):
+    """Return ``{name: {'etag', 'data'}}`` for ``names`` (default: all), rebuilding any missing."""
+    names = list(names or SECTIONS)
+    cached = cache.get_many([CACHE_KEY.format(name) for name in names])
+    return {
+        name: cached.get(CACHE_KEY.format(name)) or rebuild_section(name)
+        for name in names
+    }
+
+
+def combined_etag(sections):
+    """ETag for a set of sections, changing whenever any of them does."""
+    return make_etag(','.join(f"{name}={entry['etag']}" for name, entry in sections.items()).encode('utf-8'))
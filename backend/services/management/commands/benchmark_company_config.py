@@ -0,0 +1,52 @@
+"""
+Management command to measure company configuration reads.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from services.company_config import bump_config_version, get_config_payload
+from services.models import CompanyConfig
+from services.serializers import CompanyConfigSerializer
+from services.views import CompanyConfigViewSet
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request configuration queries with the process-level snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reads', type=int, default=1000, help='Reads per measurement (default: 1000)')
+
+    def measure(self, label, func, reads):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(reads):
+                func()
+            elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label:<18} {elapsed / reads * 1e6:>9.1f} us/read  {len(queries) / reads:>5.2f} queries/read'
+        )
+        return len(queries)
+
+    def handle(self, *args, **options):
+        reads = options['reads']
+        view = CompanyConfigViewSet.as_view({'get': 'list'})
+        request = RequestFactory().get('/api/v1/config/')
+
+        def uncached():
+            config = CompanyConfig.objects.filter(is_active=True).first()
+            return CompanyConfigSerializer(config).data if config else None
+
+        self.measure('query + serialize', uncached, reads)
+        bump_config_version()
+        get_config_payload()
+        steady = self.measure('snapshot', get_config_payload, reads)
+        self.measure('GET /config/', lambda: view(request).render(), reads)
+
+        if steady:
+            self.stdout.write(self.style.WARNING(f'Snapshot reads ran {steady} queries; is the cache shared?'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Steady-state configuration reads ran no database queries.'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-19 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0007_service_image_service_image_alt"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="companystats",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order", "name"],
+                name="stats_active_order_idx",
+            ),
+        ),
+    ]
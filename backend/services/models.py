@@ -93,6 +93,10 @@ class Service(models.Model):
         ordering = ['order', 'title']
         verbose_name = 'Service'
         verbose_name_plural = 'Services'
+        # Backs the default ordering of the public list
+        indexes = [
+            models.Index(fields=['order', 'title'], name='service_active_order_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return self.title
@@ -160,6 +164,10 @@ class CompanyStats(models.Model):
         ordering = ['order', 'name']
         verbose_name = 'Company Statistic'
         verbose_name_plural = 'Company Statistics'
+        # Back the public list orderings (see CompanyStatsViewSet.ordering_plans)
+        indexes = [
+            models.Index(fields=['order', 'name'], name='stats_active_order_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.name}: {self.value}{self.suffix}"
@@ -245,8 +253,14 @@ class CompanyConfig(models.Model):
     
     @classmethod
     def get_active_config(cls):
-        """Get the active company configuration."""
-        return cls.objects.filter(is_active=True).first()
+        """
+        Get the active company configuration.
+        
+        Served from the process-level snapshot in ``services.company_config``;
+        the instance is shared, so treat it as read-only.
+        """
+        from .company_config import get_snapshot
+        return get_snapshot().config
     
     def get_hero_features_display(self):
         """Return hero features as a list, with fallback to defaults."""
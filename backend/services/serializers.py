@@ -2,6 +2,8 @@
 Serializers for services app.
 """
 from rest_framework import serializers
+
+from core.fields import ThumbnailURLField
 from .models import Service, CompanyStats, CompanyConfig
 
 
@@ -22,7 +24,7 @@ class ServiceSerializer(serializers.ModelSerializer):
     """Serializer for Service model."""
     
     icon_url = serializers.ReadOnlyField()
-    image_url = serializers.ReadOnlyField()
+    image_url = ThumbnailURLField('card', source='image')
     display_budget_range = serializers.ReadOnlyField()
     display_timeline = serializers.ReadOnlyField()
     
@@ -40,7 +42,7 @@ class ServiceDetailSerializer(serializers.ModelSerializer):
     """Comprehensive serializer for Service detail view."""
     
     icon_url = serializers.ReadOnlyField()
-    image_url = serializers.ReadOnlyField()
+    image_url = ThumbnailURLField('card', source='image')
     display_budget_range = serializers.ReadOnlyField()
     display_timeline = serializers.ReadOnlyField()
     
@@ -62,7 +64,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
     """Simplified serializer for Service list view."""
     
     icon_url = serializers.ReadOnlyField()
-    image_url = serializers.ReadOnlyField()
+    image_url = ThumbnailURLField('card', source='image')
     
     class Meta:
         model = Service
@@ -0,0 +1,36 @@
+"""
+Signal handlers for the services app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from team.models import TeamMember
+from testimonials.models import Testimonial
+
+from .company_config import bump_config_version
+from .homepage import SECTION_MODELS, rebuild_section
+from .models import CompanyConfig, CompanyStats, Service
+
+
+@receiver(post_save, sender=CompanyConfig)
+@receiver(post_delete, sender=CompanyConfig)
+def invalidate_company_config(sender, **kwargs):
+    """Retire every process's configuration snapshot once the change is committed."""
+    transaction.on_commit(bump_config_version)
+
+
+@receiver(post_save, sender=CompanyStats)
+@receiver(post_delete, sender=CompanyStats)
+@receiver(post_save, sender=CompanyConfig)
+@receiver(post_delete, sender=CompanyConfig)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Testimonial)
+def rebuild_homepage_section(sender, **kwargs):
+    """Rebuild the homepage section backed by ``sender`` once the change is committed."""
+    section = SECTION_MODELS[sender]
+    transaction.on_commit(lambda: rebuild_section(section))
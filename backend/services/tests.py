@@ -0,0 +1,99 @@
+"""
+Tests for the cached homepage and company configuration snapshots and their invalidation.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+
+from . import company_config
+from .defaults import DEFAULT_COMPANY_CONFIG
+from .models import CompanyConfig, CompanyStats, Service
+
+
+class HomepageSnapshotTests(TestCase):
+    """The homepage is served from per-section snapshots rebuilt when their models change."""
+
+    def setUp(self):
+        cache.clear()
+        self.stats = CompanyStats.objects.create(name='projects', value=10, label='Projects')
+        Service.objects.create(
+            title='Web', slug='web', short_desc='Web', long_desc='Web', category=Service.CATEGORY_CHOICES[0][0]
+        )
+
+    def get(self, query='', **headers):
+        return self.client.get(f'/api/v1/homepage/{query}', **headers)
+
+    def test_unchanged_homepage_answers_304_from_cache(self):
+        response = self.get()
+        self.assertEqual(list(response.json()['sections']), ['stats', 'config', 'services', 'team', 'testimonials'])
+
+        with self.assertNumQueries(0):
+            repeat = self.get(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+
+    def test_saving_a_model_rebuilds_only_its_section(self):
+        before = self.get().json()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stats.value = 20
+            self.stats.save()
+
+        after = self.get().json()
+        self.assertNotEqual(after['etag'], before['etag'])
+        self.assertNotEqual(after['sections']['stats']['etag'], before['sections']['stats']['etag'])
+        self.assertEqual(after['sections']['stats']['data'][0]['value'], 20)
+        self.assertEqual(after['sections']['services'], before['sections']['services'])
+
+    def test_sections_and_known_etags(self):
+        sections = self.get('?sections=stats,services').json()['sections']
+        self.assertEqual(list(sections), ['stats', 'services'])
+
+        response = self.get(f"?sections=stats,services&etags=stats:{sections['stats']['etag']}")
+        self.assertEqual(response.json()['sections']['stats'], {'etag': sections['stats']['etag'], 'not_modified': True})
+        self.assertIn('data', response.json()['sections']['services'])
+
+        self.assertEqual(self.get('?sections=blog').status_code, 400)
+
+
+class CompanyConfigSnapshotTests(TestCase):
+    """Each process keeps the configuration until a change bumps the shared version."""
+
+    def setUp(self):
+        cache.clear()
+        company_config._snapshot = None
+        self.addCleanup(setattr, company_config, '_snapshot', None)
+
+    def test_default_configuration_without_an_active_one(self):
+        snapshot = company_config.get_snapshot()
+
+        self.assertIsNone(snapshot.config)
+        self.assertEqual(snapshot.payload, DEFAULT_COMPANY_CONFIG)
+
+    def test_steady_state_reads_make_no_queries(self):
+        CompanyConfig.objects.create(hero_headline='First')
+        company_config.get_config_payload()
+
+        with self.assertNumQueries(0):
+            payload = company_config.get_config_payload()
+        self.assertEqual(payload['hero_headline'], 'First')
+
+    def test_saving_bumps_the_version_and_reloads(self):
+        config = CompanyConfig.objects.create(hero_headline='First')
+        version = company_config.get_snapshot().version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.hero_headline = 'Second'
+            config.save()
+
+        snapshot = company_config.get_snapshot()
+        self.assertGreater(snapshot.version, version)
+        self.assertEqual(snapshot.payload['hero_headline'], 'Second')
+
+    def test_uncommitted_changes_keep_the_snapshot(self):
+        config = CompanyConfig.objects.create(hero_headline='First')
+        company_config.get_snapshot()
+
+        # Saved, but the transaction has not committed
+        config.hero_headline = 'Second'
+        config.save()
+
+        self.assertEqual(company_config.get_config_payload()['hero_headline'], 'First')
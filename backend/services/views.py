@@ -5,7 +5,15 @@ from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from core.ordering import IndexedOrderingFilter, OrderingPlanHeaderMixin
+from . import homepage
+from .company_config import get_config_payload
+from .defaults import DEFAULT_COMPANY_STATS, ERROR_COMPANY_STATS
 from .models import Service, CompanyStats, CompanyConfig
 from .serializers import ServiceSerializer, ServiceListSerializer, ServiceDetailSerializer, CompanyStatsSerializer, CompanyConfigSerializer
 
@@ -44,131 +52,45 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class CompanyStatsViewSet(viewsets.ReadOnlyModelViewSet):
+class CompanyStatsViewSet(OrderingPlanHeaderMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for CompanyStats model."""
     
     queryset = CompanyStats.objects.filter(is_active=True)
     serializer_class = CompanyStatsSerializer
-    ordering = ['order', 'name']
-    
-    def get_queryset(self):
-        """Return filtered queryset."""
-        try:
-            queryset = super().get_queryset()
-            
-            # Apply ordering BEFORE any slicing
-            ordering = self.request.query_params.get('ordering', None)
-            if ordering:
-                queryset = queryset.order_by(ordering)
-            else:
-                # Use default ordering
-                queryset = queryset.order_by('order', 'name')
-            
-            # Limit results if specified (apply AFTER ordering)
-            limit = self.request.query_params.get('limit', None)
-            if limit:
-                try:
-                    limit = int(limit)
-                    queryset = queryset[:limit]
-                except ValueError:
-                    pass
-            
-            return queryset
-        except Exception as e:
-            # Log the error and return empty queryset
-            print(f"Error in CompanyStatsViewSet: {e}")
-            return CompanyStats.objects.none()
+    filter_backends = [IndexedOrderingFilter]
+    # ?ordering= value -> order_by, each backed by an index on CompanyStats
+    ordering_plans = {
+        'order': ('order', 'name'),
+        '-order': ('-order', '-name'),
+        'name': ('name',),
+        '-name': ('-name',),
+    }
+    ordering = 'order'
     
     def list(self, request, *args, **kwargs):
         """Override list method to provide fallback data if database is empty."""
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        # Limit results if specified (after ordering, in the same query)
+        limit = request.query_params.get('limit', None)
+        if limit:
+            try:
+                queryset = queryset[:max(int(limit), 0)]
+            except ValueError:
+                pass
+        
         try:
-            queryset = self.get_queryset()
-            if queryset.exists():
-                serializer = self.get_serializer(queryset, many=True)
-                return Response(serializer.data)
-            else:
-                # Return fallback stats if database is empty
-                fallback_stats = [
-                    {
-                        'id': 'fallback-1',
-                        'name': 'projects',
-                        'value': 150,
-                        'suffix': '+',
-                        'label': 'Projects Delivered',
-                        'description': 'Successfully completed projects across various industries',
-                        'icon_name': 'rocket',
-                        'color_scheme': 'from-blue-500 to-cyan-500',
-                        'order': 1,
-                        'is_active': True
-                    },
-                    {
-                        'id': 'fallback-2',
-                        'name': 'clients',
-                        'value': 50,
-                        'suffix': '+',
-                        'label': 'Happy Clients',
-                        'description': 'Satisfied clients who trust us with their digital transformation',
-                        'icon_name': 'users',
-                        'color_scheme': 'from-green-500 to-emerald-500',
-                        'order': 2,
-                        'is_active': True
-                    },
-                    {
-                        'id': 'fallback-3',
-                        'name': 'experience',
-                        'value': 8,
-                        'suffix': '+',
-                        'label': 'Years Experience',
-                        'description': 'Deep expertise in modern software development technologies',
-                        'icon_name': 'clock',
-                        'color_scheme': 'from-purple-500 to-pink-500',
-                        'order': 3,
-                        'is_active': True
-                    },
-                    {
-                        'id': 'fallback-4',
-                        'name': 'satisfaction',
-                        'value': 99,
-                        'suffix': '%',
-                        'label': 'Client Satisfaction',
-                        'description': 'Consistently high satisfaction ratings from our clients',
-                        'icon_name': 'award',
-                        'color_scheme': 'from-yellow-500 to-orange-500',
-                        'order': 4,
-                        'is_active': True
-                    }
-                ]
-                return Response(fallback_stats)
+            stats = list(queryset)
         except Exception as e:
             print(f"Error in CompanyStatsViewSet.list: {e}")
             # Return fallback data on any error
-            fallback_stats = [
-                {
-                    'id': 'error-fallback-1',
-                    'name': 'projects',
-                    'value': 150,
-                    'suffix': '+',
-                    'label': 'Projects Delivered',
-                    'description': 'Successfully completed projects across various industries',
-                    'icon_name': 'rocket',
-                    'color_scheme': 'from-blue-500 to-cyan-500',
-                    'order': 1,
-                    'is_active': True
-                },
-                {
-                    'id': 'error-fallback-2',
-                    'name': 'clients',
-                    'value': 50,
-                    'suffix': '+',
-                    'label': 'Happy Clients',
-                    'description': 'Satisfied clients who trust us with their digital transformation',
-                    'icon_name': 'users',
-                    'color_scheme': 'from-green-500 to-emerald-500',
-                    'order': 2,
-                    'is_active': True
-                }
-            ]
-            return Response(fallback_stats, status=200)
+            return Response(ERROR_COMPANY_STATS, status=200)
+        
+        if stats:
+            serializer = self.get_serializer(stats, many=True)
+            return Response(serializer.data)
+        # Return fallback stats if database is empty
+        return Response(DEFAULT_COMPANY_STATS)
 
 
 class CompanyConfigViewSet(viewsets.ReadOnlyModelViewSet):
@@ -178,39 +100,51 @@ class CompanyConfigViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = CompanyConfigSerializer
     
     def list(self, request, *args, **kwargs):
-        """Return the active company configuration."""
-        config = CompanyConfig.get_active_config()
-        if config:
-            serializer = self.get_serializer(config)
-            return Response(serializer.data)
+        """Return the active company configuration, or the default if none exists."""
+        return Response(get_config_payload())
+
+
+class HomepageView(APIView):
+    """
+    Everything the landing page needs in one request, from a cached snapshot.
+
+    ``?sections=stats,team`` limits the response to some sections. Each
+    section carries its own ETag; a client sending back the ones it holds
+    as ``?etags=stats:<etag>,team:<etag>`` gets ``not_modified`` instead of
+    the data for unchanged sections. The response ETag covers the sections
+    returned, so ``If-None-Match`` answers 304 when none of them changed.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        names = [name for name in request.query_params.get('sections', '').split(',') if name]
+        unknown = [name for name in names if name not in homepage.SECTIONS]
+        if unknown:
+            return Response({
+                'success': False,
+                'message': f"Unknown sections: {', '.join(unknown)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        sections = homepage.get_sections(names)
+        etag = homepage.combined_etag(sections)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            # Return default configuration if none exists
-            default_config = {
-                'hero_headline': 'We Build Software That Moves Markets',
-                'hero_subtitle': 'Transform your business with cutting-edge software solutions. From web applications to AI-powered systems, we deliver results that drive growth.',
-                'hero_features': [
-                    'Custom Software Development',
-                    'Web & Mobile Applications',
-                    'Cloud Infrastructure',
-                    'AI & Machine Learning',
-                ],
-                'cta_headline': 'Ready to Transform Your Business?',
-                'cta_subtitle': "Let's discuss how our innovative software solutions can drive growth, streamline operations, and create competitive advantages for your business.",
-                'cta_benefits': [
-                    'Free initial consultation and project assessment',
-                    'Transparent pricing with no hidden fees',
-                    'Dedicated project manager and development team',
-                    'Regular progress updates and milestone reviews',
-                    'Post-launch support and maintenance',
-                    'Scalable solutions that grow with your business',
-                ],
-                'company_phone': '+1 (555) 123-4567',
-                'company_email': 'hello@kkevo.com',
-                'company_address': '',
-                'live_chat_enabled': True,
-                'trust_companies': ['TechCorp', 'FinanceBank', 'DataFlow', 'InsightMetrics'],
-                'linkedin_url': '',
-                'twitter_url': '',
-                'github_url': '',
-            }
-            return Response(default_config)
+            known = {}
+            for item in request.query_params.get('etags', '').split(','):
+                name, _, value = item.partition(':')
+                known[name] = value.strip('"')
+            response = Response({
+                'etag': etag,
+                'sections': {
+                    name: (
+                        {'etag': entry['etag'], 'not_modified': True}
+                        if known.get(name) == entry['etag'].strip('"')
+                        else entry
+                    )
+                    for name, entry in sections.items()
+                }
+            })
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-19 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0002_teammember_availability_teammember_certifications_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="teammember",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order", "name"],
+                name="team_active_order_idx",
+            ),
+        ),
+    ]
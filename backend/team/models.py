@@ -100,6 +100,10 @@ class TeamMember(models.Model):
         ordering = ['order', 'name']
         verbose_name = 'Team Member'
         verbose_name_plural = 'Team Members'
+        # Backs the default ordering of the public list
+        indexes = [
+            models.Index(fields=['order', 'name'], name='team_active_order_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.get_role_display()}"
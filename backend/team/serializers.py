@@ -2,13 +2,15 @@
 Serializers for team app.
 """
 from rest_framework import serializers
+
+from core.fields import ThumbnailURLField
 from .models import TeamMember
 
 
 class TeamMemberSerializer(serializers.ModelSerializer):
     """Serializer for TeamMember model."""
     
-    avatar_url = serializers.ReadOnlyField()
+    avatar_url = ThumbnailURLField('avatar', source='avatar')
     role_display = serializers.ReadOnlyField(source='get_role_display')
     
     class Meta:
@@ -24,7 +26,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
 class TeamMemberListSerializer(serializers.ModelSerializer):
     """Simplified serializer for TeamMember list view."""
     
-    avatar_url = serializers.ReadOnlyField()
+    avatar_url = ThumbnailURLField('avatar', source='avatar')
     role_display = serializers.ReadOnlyField(source='get_role_display')
     
     class Meta:
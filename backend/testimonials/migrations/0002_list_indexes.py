@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-19 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testimonials", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="testimonial",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order", "-rating"],
+                name="testimonial_active_order_idx",
+            ),
+        ),
+    ]
@@ -31,6 +31,12 @@ class Testimonial(models.Model):
         ordering = ['order', '-created_at']
         verbose_name = 'Testimonial'
         verbose_name_plural = 'Testimonials'
+        # Backs the default ordering of the public list (TestimonialViewSet.ordering)
+        indexes = [
+            models.Index(
+                fields=['order', '-rating'], name='testimonial_active_order_idx', condition=models.Q(is_active=True)
+            ),
+        ]
     
     def __str__(self):
         company_text = f" from {self.company}" if self.company else ""
@@ -2,13 +2,15 @@
 Serializers for testimonials app.
 """
 from rest_framework import serializers
+
+from core.fields import ThumbnailURLField
 from .models import Testimonial
 
 
 class TestimonialSerializer(serializers.ModelSerializer):
     """Serializer for Testimonial model."""
     
-    logo_url = serializers.ReadOnlyField()
+    logo_url = ThumbnailURLField('logo', source='logo')
     rating_stars = serializers.ReadOnlyField()
     
     class Meta:
@@ -24,7 +26,7 @@ class TestimonialSerializer(serializers.ModelSerializer):
 class TestimonialListSerializer(serializers.ModelSerializer):
     """Simplified serializer for Testimonial list view."""
     
-    logo_url = serializers.ReadOnlyField()
+    logo_url = ThumbnailURLField('logo', source='logo')
     rating_stars = serializers.ReadOnlyField()
     
     class Meta:
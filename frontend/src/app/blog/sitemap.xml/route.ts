@@ -3,7 +3,9 @@ import { blogApi } from '@/lib/api';
 
 export async function GET(request: NextRequest) {
   try {
-    // Fetch all published blog posts
+    // Posts themselves are listed once, in the backend's /sitemap.xml index;
+    // this sitemap only covers the blog's landing, search and category pages.
+    // Fetch published posts for their categories
     const response = await blogApi.getPublished({ page_size: 1000 });
     const posts = response.data.results || response.data || [];
 
@@ -22,13 +24,6 @@ export async function GET(request: NextRequest) {
     <changefreq>weekly</changefreq>
     <priority>0.7</priority>
   </url>
-  ${posts.map((post: any) => `
-  <url>
-    <loc>${process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000'}/blog/${post.slug}</loc>
-    <lastmod>${new Date(post.updated_at || post.published_at).toISOString()}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.8</priority>
-  </url>`).join('')}
   ${Array.from(new Set(posts.map((post: any) => post.category))).map((category: any) => `
   <url>
     <loc>${process.env.NEXT_PUBLIC_SITE_URL || 'http://localhost:3000'}/blog/category/${category}</loc>